@@ -0,0 +1,138 @@
+"""
+Batch hook generation for many campaigns in one process pool
+
+Manifest (JSON):
+    {
+      "date": "20250904",            # optional, defaults to today
+      "seed": 42,                    # optional base seed for per-campaign RNGs
+      "campaigns": [
+        {"name": "icecream_wine",
+         "keywords": "data/icecream_wine_keywords.csv",
+         "hashtags": "data/icecream_wine_hashtags.csv",
+         "count": 20, "mode": "template",      # template | creative | ai | combined
+         "broad": 7, "mid": 7, "niche": 6, "local": 5,
+         "out_dir": "outputs/icecream_wine",   # optional
+         "ai_budget": 8,                       # optional seconds per AI stage, hedged by local generation
+         "namespace": "icecream_wine"}         # optional rotation namespace, defaults to the name
+      ]
+    }
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .context import RunContext
+from .fetchers.trends_fetchers import load_internal_keywords, merge_keywords
+from .hook_generator import generate_hooks, save_outputs
+from .managers.hashtags_manager import DATA_PATH, STATE_PATH, flatten_hashtags, get_hashtag_set
+
+MODES = ("template", "creative", "ai", "combined")
+# Modes that generate hooks with the AI generator ("combined": one structured call for hooks and hashtags)
+AI_MODES = ("ai", "combined")
+
+
+def load_manifest(path: str) -> Tuple[List[dict], dict]:
+    """Read a campaign manifest, filling per-campaign defaults; returns (campaigns, run options)"""
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    campaigns = []
+    for i, c in enumerate(raw.get("campaigns", [])):
+        name = c.get("name") or f"campaign{i + 1}"
+        mode = c.get("mode", "template")
+        if mode not in MODES:
+            raise ValueError(f"campaign {name!r}: unknown mode {mode!r} (expected one of {MODES})")
+        campaigns.append({
+            "name": name,
+            "keywords": c.get("keywords", "data/internal_keywords.csv"),
+            "hashtags": c.get("hashtags", str(DATA_PATH)),
+            "count": int(c.get("count", 20)),
+            "mode": mode,
+            "broad": int(c.get("broad", 7)),
+            "mid": int(c.get("mid", 7)),
+            "niche": int(c.get("niche", 6)),
+            "local": int(c.get("local", 5)),
+            "out_dir": c.get("out_dir", f"outputs/{name}"),
+            "namespace": c.get("namespace", name),
+            "state": c.get("state", str(STATE_PATH)),
+            "ai_budget": float(c["ai_budget"]) if c.get("ai_budget") is not None else None,
+        })
+    options = {"date": raw.get("date"), "seed": raw.get("seed")}
+    return campaigns, options
+
+
+def _run_campaign(campaign: dict, externals: list, web_trends: list, date_str: str, seed,
+                  history: list | None = None) -> Dict:
+    """Worker: generate hooks + hashtags for one campaign and write its outputs"""
+    # Per-campaign seed keeps runs reproducible regardless of which worker picks the job up
+    random.seed(f"{seed}:{campaign['name']}" if seed is not None else None)
+
+    keywords = merge_keywords(load_internal_keywords(campaign["keywords"]), externals, history=history)
+    ctx = RunContext(externals=externals, keywords=keywords, ai_combined=campaign["mode"] == "combined",
+                     ai_budget=campaign.get("ai_budget"))
+    hooks = generate_hooks(
+        keywords,
+        target_n=campaign["count"],
+        use_templates=campaign["mode"] != "creative",
+        use_ai=campaign["mode"] in AI_MODES,
+        web_trends=web_trends,
+        ctx=ctx,
+    )
+    picked = get_hashtag_set(
+        campaign["broad"], campaign["mid"], campaign["niche"], campaign["local"],
+        keywords=keywords, hooks=hooks,
+        data_path=Path(campaign["hashtags"]), state_path=Path(campaign["state"]),
+        ctx=ctx, namespace=campaign["namespace"],
+    )
+    hashtags = flatten_hashtags(picked)
+    save_outputs(hooks, hashtags, date_str, out_dir=campaign["out_dir"],
+                 hook_tags=ctx.ai_content["hook_hashtags"] if ctx.ai_content else None)
+    return {"name": campaign["name"], "hooks": len(hooks), "hashtags": len(hashtags),
+            "out_dir": campaign["out_dir"]}
+
+
+def run_batch(campaigns: List[dict], date_str: str, seed=None, workers: int | None = None) -> List[Dict]:
+    """Fetch shared trends once, then fan campaigns out over a process pool"""
+    ctx = RunContext()
+    externals = ctx.external_keywords
+    history = ctx.keyword_history
+    web_trends = ctx.web_trends if any(c["mode"] in AI_MODES for c in campaigns) else []
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_campaign, c, externals, web_trends, date_str, seed, history): c["name"]
+                   for c in campaigns}
+        for fut in as_completed(futures):
+            name = futures[fut]
+            try:
+                results.append(fut.result())
+            except Exception as e:
+                print(f"⚠️  Campaign {name} failed: {e}")
+                results.append({"name": name, "error": str(e)})
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate hooks and hashtags for every campaign in a manifest")
+    ap.add_argument("manifest", help="JSON manifest of campaigns")
+    ap.add_argument("--date", default=None)
+    ap.add_argument("--seed", default=None, help="Base seed for per-campaign RNGs")
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+
+    campaigns, options = load_manifest(args.manifest)
+    date_str = args.date or options["date"] or datetime.now().strftime("%Y%m%d")
+    seed = args.seed if args.seed is not None else options["seed"]
+
+    for r in run_batch(campaigns, date_str, seed=seed, workers=args.workers):
+        if "error" in r:
+            continue
+        print(f"{r['name']}: {r['hooks']} hooks and {r['hashtags']} hashtags → {r['out_dir']}/{date_str}_hooks.*")
+
+
+if __name__ == "__main__":
+    main()
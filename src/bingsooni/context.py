@@ -0,0 +1,93 @@
+"""
+Run-scoped context: expensive resources fetched or opened once per run and shared by every stage
+"""
+from __future__ import annotations
+
+import os
+import time
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .generators.hedge import DEFAULT_BUDGET
+from .fetchers.trends_fetchers import (
+    SourceStatus,
+    fetch_external_keywords_with_status,
+    load_internal_keywords,
+    load_keyword_history,
+    merge_keywords,
+    print_fetch_status,
+)
+from .managers.hashtag_catalog import get_catalog, invalidate_catalog
+from .managers.hashtags_manager import DATA_PATH
+
+
+class RunContext:
+    """Keywords, web trends, the AI client and hashtag catalogs for one CLI run.
+
+    Every attribute is computed lazily on first use and then reused, so stages that need the same
+    resource (e.g. hook generation and web trend integration both needing the merged keywords)
+    never trigger a second fetch.
+    """
+
+    def __init__(self, internal_path: str = "data/internal_keywords.csv",
+                 externals: Optional[List[Tuple[str, float]]] = None,
+                 keywords: Optional[List[str]] = None, ai_combined: Optional[bool] = None,
+                 ai_stream: Optional[bool] = None, ai_budget: Optional[float] = None):
+        self.internal_path = internal_path
+        # Snapshots recorded from here on belong to this run, not to the keyword history
+        self.started = time.time()
+        self.fetch_status: Dict[str, SourceStatus] = {}
+        # Combined AI generation: one structured call whose result (AIGenerator.generate_ai_content)
+        # is stored in ai_content by the hook stage and reused by the hashtag and output stages
+        self.ai_combined = (os.getenv("BINGSOONI_AI_COMBINED", "") == "1") if ai_combined is None else ai_combined
+        self.ai_content: Optional[Dict] = None
+        # Streaming AI hooks (ignored when combined generation is on: its JSON is not line-oriented)
+        self.ai_stream = (os.getenv("BINGSOONI_AI_STREAM", "") == "1") if ai_stream is None else ai_stream
+        # Latency budget (seconds) per AI stage; when set, local generation runs alongside as a hedge
+        self.ai_budget = DEFAULT_BUDGET if ai_budget is None else ai_budget
+        self.ai_outcomes: List[Dict] = []
+        # Values the caller already has take the place of the lazy fetch
+        if externals is not None:
+            self.external_keywords = externals
+        if keywords is not None:
+            self.keywords = keywords
+
+    @cached_property
+    def external_keywords(self) -> List[Tuple[str, float]]:
+        externals, self.fetch_status = fetch_external_keywords_with_status()
+        print_fetch_status(self.fetch_status)
+        return externals
+
+    @cached_property
+    def keywords(self) -> List[str]:
+        return merge_keywords(load_internal_keywords(self.internal_path), self.external_keywords,
+                              history=self.keyword_history)
+
+    @cached_property
+    def keyword_history(self) -> List[Tuple[str, float]]:
+        return load_keyword_history(before=self.started)
+
+    @cached_property
+    def web_trends(self) -> List[Tuple[str, float, str]]:
+        try:
+            from .fetchers.web_trends_scraper import integrate_web_trends_to_system
+        except ImportError:
+            return []
+        return integrate_web_trends_to_system(self.keywords)
+
+    @cached_property
+    def ai(self):
+        """Shared AIGenerator, or None when the AI dependencies are not installed"""
+        try:
+            from .generators.ai_generator import AIGenerator
+        except ImportError:
+            return None
+        return AIGenerator()
+
+    def hashtag_tiers(self, data_path: Path = DATA_PATH) -> Dict[str, List[str]]:
+        """Tiers of a hashtag catalog; callers get their own copy since they extend the lists"""
+        return get_catalog(data_path).tier_lists()
+
+    def invalidate_hashtags(self, data_path: Path = DATA_PATH):
+        invalidate_catalog(data_path)
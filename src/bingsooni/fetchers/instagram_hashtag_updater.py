@@ -7,12 +7,19 @@ import requests
 import json
 import csv
 import os
+import shutil
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Tuple
 import time
 import random
 
+try:
+    from ..managers.hashtag_catalog import HashtagEntry, get_catalog
+except ImportError:  # run as a script from this directory
+    from bingsooni.managers.hashtag_catalog import HashtagEntry, get_catalog
+
 class InstagramHashtagUpdater:
     def __init__(self, access_token: str = None):
         self.access_token = access_token or os.getenv('INSTAGRAM_ACCESS_TOKEN')
@@ -73,20 +80,15 @@ class InstagramHashtagUpdater:
         
         return competitor_hashtags
     
-    def update_hashtag_database(self, new_hashtags: List[Tuple[str, float]]):
+    def update_hashtag_database(self, new_hashtags: List[Tuple[str, float]], data_path: str = "data/hashtags.csv"):
         """Update the hashtags.csv with new trending data"""
-        existing_hashtags = {}
-        
-        # Load existing hashtags
-        if Path("data/hashtags.csv").exists():
-            with open("data/hashtags.csv", 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    existing_hashtags[row['tag']] = row['tier']
+        data_path = Path(data_path)
+        # Load existing hashtags (shared catalog, parsed once per file version)
+        catalog = get_catalog(data_path) if data_path.exists() else None
+        updated_hashtags = {e.tag: e for e in catalog.entries} if catalog else {}
+        with_metadata = bool(catalog and catalog.has_metadata)
         
         # Add new trending hashtags to appropriate tiers
-        updated_hashtags = existing_hashtags.copy()
-        
         for hashtag, score in new_hashtags:
             if hashtag not in updated_hashtags:
                 # Assign tier based on trending score
@@ -99,18 +101,32 @@ class InstagramHashtagUpdater:
                 else:
                     tier = 'local'
                     
-                updated_hashtags[hashtag] = tier
-        
-        # Save updated hashtags
-        backup_path = f"data/hashtags_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        if Path("data/hashtags.csv").exists():
-            Path("data/hashtags.csv").rename(backup_path)
-        
-        with open("data/hashtags.csv", 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['tag', 'tier'])
-            for tag, tier in updated_hashtags.items():
-                writer.writerow([tag, tier])
+                updated_hashtags[hashtag] = HashtagEntry(hashtag, tier, 'trend', round(score, 3))
+        
+        # Save updated hashtags: back up the current file, then swap the new one in atomically so
+        # readers only ever see the old or the new catalog
+        backup_path = data_path.with_name(f"{data_path.stem}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+        if data_path.exists():
+            shutil.copy2(data_path, backup_path)
+        
+        fd, tmp = tempfile.mkstemp(dir=data_path.parent, prefix=f".{data_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                if with_metadata:
+                    writer.writerow(['tag', 'tier', 'category', 'relevance_score'])
+                    for e in updated_hashtags.values():
+                        writer.writerow([e.tag, e.tier, e.category or '',
+                                         '' if e.relevance_score is None else e.relevance_score])
+                else:
+                    writer.writerow(['tag', 'tier'])
+                    for e in updated_hashtags.values():
+                        writer.writerow([e.tag, e.tier])
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, data_path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
         
         print(f"✅ Updated {len(updated_hashtags)} hashtags")
         print(f"📂 Backup saved to {backup_path}")
@@ -148,7 +164,7 @@ class InstagramHashtagUpdater:
                 ("#딸기디저트", 0.81), ("#봄감성", 0.84), ("#야외카페", 0.82)
             ]
     
-    def run_daily_update(self):
+    def run_daily_update(self, data_path: str = "data/hashtags.csv"):
         """Run daily hashtag trend update"""
         print("🔄 Starting daily hashtag trend update...")
         
@@ -173,20 +189,25 @@ class InstagramHashtagUpdater:
         
         sorted_trends = sorted(unique_trends.items(), key=lambda x: x[1], reverse=True)
         
+        # Not recorded in the trend history: the sources above are simulated until the Graph API is wired in
+        
         # Update database with top trending hashtags
-        self.update_hashtag_database(sorted_trends[:30])
+        self.update_hashtag_database(sorted_trends[:30], data_path)
         
         # Save trend report
         report_path = f"outputs/hashtag_trends_{datetime.now().strftime('%Y%m%d')}.json"
         Path("outputs").mkdir(exist_ok=True)
         
-        with open(report_path, 'w', encoding='utf-8') as f:
+        fd, tmp = tempfile.mkstemp(dir="outputs", prefix=".hashtag_trends.", suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
             json.dump({
                 'date': datetime.now().isoformat(),
                 'trending_hashtags': sorted_trends[:50],
                 'total_analyzed': len(all_trends),
                 'unique_hashtags': len(unique_trends)
             }, f, ensure_ascii=False, indent=2)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, report_path)
         
         print(f"📊 Trend report saved to {report_path}")
         print(f"🏆 Top 5 trending: {[tag for tag, _ in sorted_trends[:5]]}")
@@ -200,7 +221,7 @@ def schedule_hashtag_updates():
     
     # In production, you'd set up a cron job or scheduler
     print("💡 Set up cron job for daily updates:")
-    print("0 9 * * * cd /path/to/project && python instagram_hashtag_updater.py")
+    print("0 9 * * * cd /path/to/project && python -m bingsooni.managers.catalog_refresh")
 
 if __name__ == "__main__":
     schedule_hashtag_updates()
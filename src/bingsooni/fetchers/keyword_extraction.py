@@ -0,0 +1,115 @@
+"""
+Keyword extraction for blog posts: single-pass HTML stripping and dictionary matching with one automaton
+"""
+from __future__ import annotations
+
+import csv
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from ..matching import TermMatcher
+except ImportError:  # run as a script from this directory
+    from bingsooni.matching import TermMatcher
+
+TERMS_PATH = Path("data/trend_terms.csv")
+
+# kind → (keyword template, score bonus); a post contributes at most one keyword per kind
+KIND_RULES: Dict[str, Tuple[str, float]] = {
+    "location": ("{term}맛집", 0.1),
+    "food": ("{term}추천", 0.0),
+}
+
+# Used when data/trend_terms.csv is missing
+DEFAULT_TERMS: List[Tuple[str, str]] = [
+    ("연남", "location"), ("성수", "location"), ("홍대", "location"), ("강남", "location"),
+    ("빙수", "food"), ("카페", "food"), ("디저트", "food"),
+]
+
+# Positional score: newest item on a page scores BASE_SCORE + POSITION_WEIGHT, the last ~BASE_SCORE
+BASE_SCORE = 0.7
+POSITION_WEIGHT = 0.2
+
+_TAG_RE = re.compile(r"<[^<]+?>")
+
+
+def load_trend_terms(path: Path = TERMS_PATH) -> List[Tuple[str, str]]:
+    """(term, kind) pairs in priority order; rows with an unknown kind are skipped"""
+    path = Path(path)
+    if not path.exists():
+        return list(DEFAULT_TERMS)
+    out = []
+    with path.open(encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            term, kind = (row.get("term") or "").strip(), (row.get("kind") or "").strip().lower()
+            if term and kind in KIND_RULES:
+                out.append((term, kind))
+    return out
+
+
+class KeywordExtractor:
+    """Turns blog items (title/description) into scored trend keywords.
+
+    All dictionary terms of every kind are compiled into one automaton, so each post is scanned
+    once no matter how large the dictionaries grow. When a post mentions several terms of the same
+    kind, the one listed first in the dictionary wins.
+    """
+
+    def __init__(self, terms: Optional[Iterable[Tuple[str, str]]] = None):
+        terms = list(terms if terms is not None else load_trend_terms())
+        self._kind_of: Dict[str, Tuple[str, int]] = {}
+        for priority, (term, kind) in enumerate(terms):
+            key = term.casefold()
+            if key not in self._kind_of:
+                self._kind_of[key] = (kind, priority)
+        self.matcher = TermMatcher(self._kind_of, ignore_case=True)
+
+    @staticmethod
+    def clean_text(title: str, description: str) -> str:
+        """Strip HTML tags from title and description in one pass"""
+        return _TAG_RE.sub("", f"{title} {description}")
+
+    def extract(self, text: str) -> List[Tuple[str, float]]:
+        """(keyword, bonus) for the highest-priority term of each kind present in text"""
+        best: Dict[str, Tuple[int, str]] = {}
+        for _, _, term in self.matcher.iter_matches(text):
+            kind, priority = self._kind_of[term]
+            if kind not in best or priority < best[kind][0]:
+                best[kind] = (priority, term)
+        out = []
+        for kind, (_, term) in best.items():
+            template, bonus = KIND_RULES[kind]
+            out.append((template.format(term=term), bonus))
+        return out
+
+    def extract_item(self, item: dict) -> List[Tuple[str, float]]:
+        return self.extract(self.clean_text(item.get("title", ""), item.get("description", "")))
+
+    def score_items(self, items: List[dict]) -> List[Tuple[str, float]]:
+        """Scored keywords for one result page; earlier (newer) items weigh more"""
+        n = len(items)
+        out = []
+        for idx, item in enumerate(items):
+            score = BASE_SCORE + (n - idx) / n * POSITION_WEIGHT
+            for keyword, bonus in self.extract_item(item):
+                out.append((keyword, min(score + bonus, 1.0)))
+        return out
+
+    def count_items(self, items: Iterable[dict], counts: Optional[Counter] = None) -> Counter:
+        """Keyword mention counts over any number of items (constant memory per item)"""
+        counts = counts if counts is not None else Counter()
+        for item in items:
+            for keyword, _ in self.extract_item(item):
+                counts[keyword] += 1
+        return counts
+
+
+def top_keywords(counts: Counter, n: int = 20) -> List[Tuple[str, float]]:
+    """Most-mentioned keywords scored 0.7–1.0 relative to the leader (merge_keywords format)"""
+    top = counts.most_common(n)
+    if not top:
+        return []
+    peak = top[0][1]
+    return [(kw, round(0.7 + 0.3 * c / peak, 3)) for kw, c in top]
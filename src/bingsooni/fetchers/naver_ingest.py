@@ -0,0 +1,217 @@
+"""
+Incremental Naver blog ingestion: only posts newer than each search term's cursor are fetched and counted
+
+State (under state/naver_ingest/):
+    cursors.json   term → {"postdate", "link"} of the newest post already ingested
+    seen.bin       64-bit digests of ingested post links (dedups posts shared by several terms)
+    counts.json    keyword → mention count, updated in place on every run
+    detector.bin   TrendDetector state (a JSON line, then the sketch tables); every run is one detection window
+
+Usage:
+    python -m bingsooni.fetchers.naver_ingest [--max-pages 10] [--top 20] [--reset]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .keyword_extraction import KeywordExtractor, top_keywords
+    from .trend_detector import TrendDetector
+    from .trend_store import TREND_STORE
+    from .web_trends_scraper import NAVER_MAX_DISPLAY, NAVER_MAX_START, TrendsScraper
+except ImportError:  # run as a script from this directory
+    from keyword_extraction import KeywordExtractor, top_keywords
+    from trend_detector import TrendDetector
+    from trend_store import TREND_STORE
+    from web_trends_scraper import NAVER_MAX_DISPLAY, NAVER_MAX_START, TrendsScraper
+
+STATE_DIR = Path("state/naver_ingest")
+
+# Seen-link digests kept on disk (8 bytes each); the oldest are dropped beyond this
+MAX_SEEN = 200_000
+
+# Pages fetched for a term that has no cursor yet (its first run)
+FIRST_RUN_PAGES = 1
+
+
+def _link_digest(link: str) -> int:
+    return int.from_bytes(hashlib.blake2b(link.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _atomic_write(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class NaverIngestor:
+    """Fetches each search term's newest posts page by page until it reaches the term's cursor.
+
+    Work per run is proportional to the number of posts published since the previous run: paging
+    stops at the first page that reaches already-ingested posts (or after max_pages), and only
+    unseen posts are passed to the keyword extractor and added to the persistent counts.
+    """
+
+    def __init__(self, scraper: Optional[TrendsScraper] = None, state_dir: Path = STATE_DIR,
+                 extractor: Optional[KeywordExtractor] = None, max_pages: int = 10):
+        self.scraper = scraper or TrendsScraper(display=NAVER_MAX_DISPLAY)
+        self.state_dir = Path(state_dir)
+        self.extractor = extractor or KeywordExtractor()
+        self.max_pages = max(1, max_pages)
+        self.cursors: Dict[str, Dict[str, str]] = self._read_json("cursors.json")
+        self.counts: Counter = Counter(self._read_json("counts.json"))
+        self._seen_order = array("Q")
+        seen_path = self.state_dir / "seen.bin"
+        if seen_path.exists():
+            with seen_path.open("rb") as f:
+                self._seen_order.frombytes(f.read())
+        self._seen = set(self._seen_order)
+        self.detector = self._load_detector()
+
+    def _load_detector(self) -> TrendDetector:
+        try:
+            meta, _, tables = (self.state_dir / "detector.bin").read_bytes().partition(b"\n")
+            return TrendDetector.from_state(json.loads(meta), tables, extractor=self.extractor)
+        except (OSError, ValueError, KeyError, TypeError):
+            return TrendDetector(extractor=self.extractor)
+
+    def _read_json(self, name: str) -> dict:
+        try:
+            return json.loads((self.state_dir / name).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _is_past_cursor(self, item: dict, cursor: Optional[Dict[str, str]]) -> bool:
+        """True once paging reaches posts the previous run already covered"""
+        if not cursor:
+            return False
+        return item.get("link") == cursor.get("link") or item.get("postdate", "") < cursor.get("postdate", "")
+
+    def _fetch_new(self, headers: Dict[str, str], term: str) -> Tuple[List[dict], bool]:
+        """Newest-first posts for term that are newer than its cursor, and whether paging caught up.
+
+        Caught up means paging reached the cursor, the last post the API serves or the page budget;
+        posts in a backlog deeper than the budget are skipped so a run never costs more than
+        max_pages requests. Only a failed page leaves a gap the cursor must wait for.
+        """
+        cursor = self.cursors.get(term)
+        pages = self.max_pages if cursor else min(self.max_pages, FIRST_RUN_PAGES)
+        display = self.scraper.display
+        new_items: List[dict] = []
+        for page in range(pages):
+            start = 1 + page * display
+            try:
+                data = self.scraper.fetch_naver_page(headers, term, start)
+            except Exception as e:
+                print(f"⚠️  Naver search for {term!r} (start={start}) failed: {e}")
+                data = None
+            if not data:
+                return new_items, False
+            items = data.get("items", [])
+            for item in items:
+                if self._is_past_cursor(item, cursor):
+                    return new_items, True
+                new_items.append(item)
+            last_start = min(int(data.get("total", 0)), NAVER_MAX_START)
+            if len(items) < display or start + display > last_start:
+                return new_items, True
+        return new_items, True
+
+    def run(self) -> Optional[Dict[str, int]]:
+        """Ingest new posts for every search term; returns term → new post count (None without credentials)"""
+        headers = self.scraper.naver_headers()
+        if headers is None:
+            print("⚠️  Naver API credentials not configured")
+            return None
+
+        terms = self.scraper.search_terms
+        with ThreadPoolExecutor(max_workers=self.scraper.max_workers) as pool:
+            fetched = dict(zip(terms, pool.map(lambda t: self._fetch_new(headers, t), terms)))
+
+        added: Dict[str, int] = {}
+        for term, (items, caught_up) in fetched.items():
+            if items and caught_up:
+                # Seen digests keep the overlap from being counted twice when a gap is re-fetched later
+                self.cursors[term] = {"postdate": items[0].get("postdate", ""), "link": items[0].get("link", "")}
+            fresh = []
+            for item in items:
+                digest = _link_digest(item.get("link", ""))
+                if digest in self._seen:
+                    continue
+                self._seen.add(digest)
+                self._seen_order.append(digest)
+                fresh.append(item)
+            self.extractor.count_items(fresh, self.counts)
+            for item in fresh:
+                self.detector.observe_item(item)
+            added[term] = len(fresh)
+        # Each window's rising terms enter the trend history once, when the window closes
+        TREND_STORE.record("naver", self.detector.close_window())
+        self.save()
+        return added
+
+    def save(self):
+        if len(self._seen_order) > MAX_SEEN:
+            self._seen_order = self._seen_order[-MAX_SEEN:]
+            self._seen = set(self._seen_order)
+        _atomic_write(self.state_dir / "cursors.json",
+                      json.dumps(self.cursors, ensure_ascii=False, indent=2).encode("utf-8"))
+        _atomic_write(self.state_dir / "counts.json",
+                      json.dumps(dict(self.counts), ensure_ascii=False).encode("utf-8"))
+        _atomic_write(self.state_dir / "seen.bin", self._seen_order.tobytes())
+        meta, tables = self.detector.state()
+        _atomic_write(self.state_dir / "detector.bin",
+                      json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n" + tables)
+
+    def top_keywords(self, n: int = 20) -> List[Tuple[str, float]]:
+        """Most-mentioned keywords so far, scored 0.7–1.0 relative to the leader (merge_keywords format)"""
+        return top_keywords(self.counts, n)
+
+    def rising_keywords(self, n: int = 20) -> List[Tuple[str, float]]:
+        """Terms bursting in the latest run relative to earlier runs (merge_keywords format)"""
+        return self.detector.trending(n)
+
+    def reset(self):
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+        self.cursors, self.counts = {}, Counter()
+        self._seen, self._seen_order = set(), array("Q")
+        self.detector = TrendDetector(extractor=self.extractor)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Ingest new Naver blog posts and update keyword counts")
+    ap.add_argument("--max-pages", type=int, default=10, help="Page limit per term when catching up")
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--reset", action="store_true", help="Forget cursors, seen links and counts first")
+    args = ap.parse_args()
+
+    ingestor = NaverIngestor(max_pages=args.max_pages)
+    if args.reset:
+        ingestor.reset()
+    added = ingestor.run()
+    if added is None:
+        return
+    print(f"📥 Ingested {sum(added.values())} new posts ({', '.join(f'{t}: {n}' for t, n in added.items())})")
+    for kw, score in ingestor.top_keywords(args.top):
+        print(f"  {kw:<16} {ingestor.counts[kw]:>6}  ({score:.2f})")
+    rising = ingestor.rising_keywords(args.top)
+    if rising:
+        print("🔥 Rising since the previous run:")
+        for kw, score in rising:
+            print(f"  {kw:<16} ({score:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Token-bucket rate limiting shared by the API clients (thread and asyncio friendly)
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Allows `rate` units per second on average with bursts of up to `capacity` units.
+
+    acquire() blocks the calling thread; acquire_async() awaits without blocking the event loop.
+    Units can be requests (cost 1) or e.g. LLM tokens (cost = tokens in the request).
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, per_minute: float, burst: float | None = None) -> "TokenBucket":
+        return cls(per_minute / 60.0, burst if burst is not None else per_minute)
+
+    def _reserve(self, cost: float) -> float:
+        """Take cost units now (possibly going negative); returns how long the caller must wait"""
+        cost = min(cost, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= cost
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, cost: float = 1.0):
+        wait = self._reserve(cost)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, cost: float = 1.0):
+        wait = self._reserve(cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,149 @@
+"""
+Offline replay of archived API responses: re-score JSONL dumps without any network
+
+Each line is one archived response (a Naver search page with "items", an Instagram page with
+"data") or a single post. Every page is scored with the live scrape's KeywordExtractor.score_items
+(newer posts weigh more), and each keyword's scores are summed the way merge_keywords accumulates the
+live results. Files are memory-mapped and split into newline-aligned byte ranges that a process pool
+scores independently; the partial sums are then merged.
+
+Usage:
+    python -m bingsooni.fetchers.replay dumps/naver_2025*.jsonl [--workers 8] [--top 30] [--json out.json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .keyword_extraction import KeywordExtractor, top_keywords
+except ImportError:  # run as a script from this directory
+    from keyword_extraction import KeywordExtractor, top_keywords
+
+# Shards per worker, so one slow shard does not leave the rest of the pool idle
+SHARDS_PER_WORKER = 4
+# Ranges smaller than this are not split further
+MIN_SHARD_BYTES = 1 << 20
+
+_EXTRACTOR: Optional[KeywordExtractor] = None
+
+
+def _extractor() -> KeywordExtractor:
+    global _EXTRACTOR
+    if _EXTRACTOR is None:
+        _EXTRACTOR = KeywordExtractor()
+    return _EXTRACTOR
+
+
+def shard_ranges(path: Path, n_shards: int) -> List[Tuple[int, int]]:
+    """Split a file into at most n_shards byte ranges, each ending just after a newline"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    n_shards = max(1, min(n_shards, size // MIN_SHARD_BYTES or 1))
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        bounds = [0]
+        for i in range(1, n_shards):
+            nl = mm.find(b"\n", max(size * i // n_shards, bounds[-1]))
+            if nl == -1:
+                break
+            if nl + 1 > bounds[-1]:
+                bounds.append(nl + 1)
+        if bounds[-1] < size:
+            bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _posts(record) -> Iterator[dict]:
+    """Posts in one archived response, normalised to title/description"""
+    if not isinstance(record, dict):
+        return
+    if isinstance(record.get("items"), list):  # Naver search page
+        yield from (i for i in record["items"] if isinstance(i, dict))
+    elif isinstance(record.get("data"), list):  # Instagram Graph API page
+        for post in record["data"]:
+            if isinstance(post, dict):
+                yield {"title": "", "description": post.get("caption", "")}
+    elif "caption" in record:
+        yield {"title": "", "description": record.get("caption", "")}
+    else:
+        yield record
+
+
+def score_range(path: str, start: int, end: int) -> Tuple[Counter, Dict[str, int]]:
+    """Worker: summed keyword scores and line/post/error totals for one byte range of a dump"""
+    extractor = _extractor()
+    scores: Counter = Counter()
+    stats = {"lines": 0, "posts": 0, "bad_lines": 0}
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            nl = mm.find(b"\n", pos, end)
+            line = mm[pos:end if nl == -1 else nl]
+            pos = end if nl == -1 else nl + 1
+            if not line.strip():
+                continue
+            stats["lines"] += 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                stats["bad_lines"] += 1
+                continue
+            posts = list(_posts(record))
+            stats["posts"] += len(posts)
+            for keyword, score in extractor.score_items(posts):
+                scores[keyword] += score
+    return scores, stats
+
+
+def replay(paths: List[Path], workers: Optional[int] = None) -> Tuple[Counter, Dict[str, int]]:
+    """Summed keyword scores over every dump, computed shard by shard in a process pool"""
+    workers = workers or os.cpu_count() or 1
+    jobs = []
+    for path in paths:
+        n = max(1, workers * SHARDS_PER_WORKER // len(paths))
+        jobs.extend((str(path), start, end) for start, end in shard_ranges(path, n))
+
+    scores: Counter = Counter()
+    stats: Dict[str, int] = Counter({"files": len(paths), "shards": len(jobs)})
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part_scores, part_stats in pool.map(score_range, *zip(*jobs)) if jobs else []:
+            scores.update(part_scores)
+            stats.update(part_stats)
+    return scores, dict(stats)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Re-score archived API responses (JSONL) without network access")
+    ap.add_argument("dumps", nargs="+", type=Path, help="JSONL files, one archived response per line")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--top", type=int, default=20)
+    ap.add_argument("--json", type=Path, default=None, help="Also write all scores and stats to this file")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    scores, stats = replay(args.dumps, args.workers)
+    elapsed = time.perf_counter() - t0
+
+    print(f"🔁 Replayed {stats.get('posts', 0):,} posts from {stats.get('lines', 0):,} lines "
+          f"({stats['files']} files, {stats['shards']} shards) in {elapsed:.2f}s "
+          f"— {stats.get('posts', 0) / max(elapsed, 1e-9):,.0f} posts/s")
+    if stats.get("bad_lines"):
+        print(f"⚠️  Skipped {stats['bad_lines']} unparsable lines")
+    for kw, score in top_keywords(scores, args.top):
+        print(f"  {kw:<16} {scores[kw]:>12,.2f}  ({score:.2f})")
+    if args.json:
+        ranked = {kw: round(total, 4) for kw, total in scores.most_common()}
+        args.json.write_text(json.dumps({"stats": stats, "scores": ranked}, ensure_ascii=False, indent=2),
+                             encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Persistent TTL cache for external trend sources, with stale-while-revalidate refreshes
+
+Usage:
+    python -m bingsooni.fetchers.trend_cache list
+    python -m bingsooni.fetchers.trend_cache clear [--source pytrends]
+"""
+from __future__ import annotations
+
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CACHE_DIR = Path("state/trend_cache")
+
+# Seconds before an entry is considered stale (sources change at most hourly)
+SOURCE_TTLS = {
+    "pytrends": 3600,
+    "naver": 3600,
+    "naver_blog_trends": 3600,
+}
+DEFAULT_TTL = 3600
+# Entries older than this are too old to serve while refreshing; they are re-fetched synchronously
+MAX_STALE = 86400
+
+# How long process exit waits for in-flight background refreshes
+REFRESH_GRACE = 5.0
+
+
+class TrendCache:
+    """JSON-file cache keyed by (source, params).
+
+    Fresh entries are returned as-is. Stale entries are returned immediately while a single
+    background refresh per key updates the file; missing and expired (older than max_stale)
+    entries are fetched synchronously. A fetch returning None (source unavailable) is never
+    cached; an expired value is still returned then, as the best data available.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, ttls: Dict[str, float] | None = None,
+                 enabled: bool = True, max_stale: float = MAX_STALE):
+        self.cache_dir = Path(cache_dir)
+        self.ttls = {**SOURCE_TTLS, **(ttls or {})}
+        self.enabled = enabled
+        self.max_stale = max_stale
+        self._lock = threading.Lock()
+        self._refreshing: Dict[Path, threading.Thread] = {}
+
+    def ttl(self, source: str) -> float:
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    def _path(self, source: str, params: Dict[str, Any]) -> Path:
+        key = json.dumps(params, ensure_ascii=False, sort_keys=True)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{source}-{digest}.json"
+
+    def _read(self, path: Path) -> Optional[dict]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, source: str, params: Dict[str, Any], value: Any):
+        path = self._path(source, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {"source": source, "params": params, "stored_at": time.time(), "value": value}
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def peek(self, source: str, params: Dict[str, Any]) -> Optional[Tuple[Any, float]]:
+        """(value, age in seconds) of the cached entry regardless of freshness, or None"""
+        if not self.enabled:
+            return None
+        entry = self._read(self._path(source, params))
+        if entry is None:
+            return None
+        return entry["value"], time.time() - entry["stored_at"]
+
+    def _refresh_async(self, source: str, params: Dict[str, Any], fetch: Callable[[], Any]):
+        path = self._path(source, params)
+        with self._lock:
+            running = self._refreshing.get(path)
+            if running is not None and running.is_alive():
+                return  # single flight per key
+
+            def refresh():
+                try:
+                    value = fetch()
+                    if value is not None:
+                        self.put(source, params, value)
+                except Exception as e:
+                    print(f"⚠️  Background refresh of {source} failed: {e}")
+                finally:
+                    with self._lock:
+                        self._refreshing.pop(path, None)
+
+            t = threading.Thread(target=refresh, name=f"refresh-{source}", daemon=True)
+            self._refreshing[path] = t
+            t.start()
+
+    def get_or_fetch(self, source: str, params: Dict[str, Any], fetch: Callable[[], Any]) -> Any:
+        """Cached value for (source, params); stale values trigger a background refresh"""
+        if not self.enabled:
+            return fetch()
+        cached = self.peek(source, params)
+        if cached is not None:
+            value, age = cached
+            if age < self.max_stale:
+                if age >= self.ttl(source):
+                    self._refresh_async(source, params, fetch)
+                return value
+        fresh = fetch()
+        if fresh is None:
+            return cached[0] if cached is not None else None
+        self.put(source, params, fresh)
+        return fresh
+
+    def wait_for_refreshes(self, timeout: float = REFRESH_GRACE):
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for t in threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+
+    def entries(self) -> List[dict]:
+        """Summary of every cached entry (source, params, age, ttl, fresh)"""
+        out = []
+        for path in sorted(self.cache_dir.glob("*.json")):
+            entry = self._read(path)
+            if entry is None:
+                continue
+            age = time.time() - entry["stored_at"]
+            ttl = self.ttl(entry["source"])
+            out.append({"source": entry["source"], "params": entry["params"], "age": age,
+                        "ttl": ttl, "fresh": age < ttl, "path": str(path)})
+        return out
+
+    def clear(self, source: str | None = None) -> int:
+        removed = 0
+        pattern = f"{source}-*.json" if source else "*.json"
+        for path in self.cache_dir.glob(pattern):
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+TREND_CACHE = TrendCache(enabled=os.getenv("BINGSOONI_NO_CACHE", "") == "")
+atexit.register(TREND_CACHE.wait_for_refreshes)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspect or clear the trend source cache")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="Show cached entries and their age")
+    clear = sub.add_parser("clear", help="Delete cached entries")
+    clear.add_argument("--source", default=None, help="Only clear this source")
+    args = ap.parse_args()
+
+    if args.cmd == "list":
+        entries = TREND_CACHE.entries()
+        if not entries:
+            print(f"Cache is empty ({TREND_CACHE.cache_dir})")
+        for e in entries:
+            state = "fresh" if e["fresh"] else "stale"
+            print(f"{e['source']:<20} {state:<6} age {e['age'] / 60:6.1f}m / ttl {e['ttl'] / 60:.0f}m  "
+                  f"{json.dumps(e['params'], ensure_ascii=False)}")
+    else:
+        n = TREND_CACHE.clear(args.source)
+        print(f"🧹 Removed {n} cached entr{'y' if n == 1 else 'ies'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Streaming trend detection in fixed memory: Count-Min counts per window, Space-Saving candidates,
+and burst scores against an exponentially decayed baseline
+"""
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .keyword_extraction import KeywordExtractor
+except ImportError:  # run as a script from this directory
+    from keyword_extraction import KeywordExtractor
+
+# Tokens: runs of Hangul/Latin/digits, at least two characters long
+_TOKEN_RE = re.compile(r"[0-9A-Za-z가-힣]{2,}")
+
+# Baseline update: baseline ← (1 - DECAY) · baseline + DECAY · window count
+DECAY = 0.3
+# Terms seen fewer times than this in a window are never reported as bursting
+MIN_SUPPORT = 3
+# Burst z-score that maps to a detector score of 0.5
+HALF_SCORE_Z = 3.0
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def _hash_pair(key: str) -> Tuple[int, int]:
+    # Stable across processes (unlike hash()), so saved sketches stay valid
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class CountMinSketch:
+    """Approximate counts in width × depth floats; estimates never undercount"""
+
+    def __init__(self, width: int = 4096, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = array("d", bytes(8 * width * depth))
+
+    def _cells(self, key: str):
+        h1, h2 = _hash_pair(key)
+        w = self.width
+        return [row * w + (h1 + row * h2) % w for row in range(self.depth)]
+
+    def add(self, key: str, count: float = 1.0):
+        table = self.table
+        for cell in self._cells(key):
+            table[cell] += count
+
+    def estimate(self, key: str) -> float:
+        table = self.table
+        return min(table[cell] for cell in self._cells(key))
+
+    def blend(self, other: "CountMinSketch", weight: float):
+        """self ← (1 - weight) · self + weight · other, cell by cell"""
+        keep = 1.0 - weight
+        mine, theirs = self.table, other.table
+        for i in range(len(mine)):
+            mine[i] = keep * mine[i] + weight * theirs[i]
+
+    def clear(self):
+        self.table = array("d", bytes(8 * self.width * self.depth))
+
+
+class SpaceSaving:
+    """Top-k heavy hitters in k counters; an evicted key's count is inherited by its replacement"""
+
+    def __init__(self, k: int = 256):
+        self.k = k
+        self.counts: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []  # lazy min-heap; stale entries are skipped on pop
+
+    def add(self, key: str, count: int = 1):
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+        elif len(counts) < self.k:
+            counts[key] = count
+        else:
+            while True:
+                c, victim = heapq.heappop(self._heap)
+                if counts.get(victim) == c:
+                    break
+            del counts[victim]
+            counts[key] = c + count
+        heapq.heappush(self._heap, (counts[key], key))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(c, k) for k, c in counts.items()]
+            heapq.heapify(self._heap)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        ranked = sorted(self.counts.items(), key=lambda x: (-x[1], x[0]))
+        return ranked if n is None else ranked[:n]
+
+    def clear(self):
+        self.counts, self._heap = {}, []
+
+
+class TrendDetector:
+    """Scores how far each term's count in the current window rises above its decayed history.
+
+    Feed posts with observe_item()/observe() and call close_window() at each window boundary (e.g.
+    once per ingestion run). Memory is fixed by the sketch sizes and k, whatever the corpus size.
+    """
+
+    def __init__(self, width: int = 4096, depth: int = 4, k: int = 256, decay: float = DECAY,
+                 min_support: int = MIN_SUPPORT, extractor: Optional[KeywordExtractor] = None):
+        self.window = CountMinSketch(width, depth)
+        self.baseline = CountMinSketch(width, depth)
+        self.heavy = SpaceSaving(k)
+        self.decay = decay
+        self.min_support = min_support
+        self.extractor = extractor or KeywordExtractor()
+        self.windows_closed = 0
+        self.scores: List[Tuple[str, float]] = []
+
+    def state(self) -> Tuple[Dict, bytes]:
+        """Plain-data snapshot: (JSON-able settings, counters and scores; both sketch tables as raw doubles)"""
+        meta = {
+            "width": self.window.width, "depth": self.window.depth, "k": self.heavy.k,
+            "decay": self.decay, "min_support": self.min_support,
+            "windows_closed": self.windows_closed, "scores": self.scores, "heavy": self.heavy.counts,
+        }
+        return meta, self.window.table.tobytes() + self.baseline.table.tobytes()
+
+    @classmethod
+    def from_state(cls, meta: Dict, tables: bytes,
+                   extractor: Optional[KeywordExtractor] = None) -> "TrendDetector":
+        """Rebuild a detector from state(); ValueError if the tables don't match the saved sizes"""
+        detector = cls(meta["width"], meta["depth"], meta["k"], meta["decay"], meta["min_support"], extractor)
+        cells = detector.window.width * detector.window.depth
+        data = array("d")
+        data.frombytes(tables)
+        if len(data) != 2 * cells:
+            raise ValueError(f"expected {2 * cells} sketch cells, got {len(data)}")
+        detector.window.table, detector.baseline.table = data[:cells], data[cells:]
+        for term, count in meta["heavy"].items():
+            detector.heavy.add(term, count)
+        detector.windows_closed = meta["windows_closed"]
+        detector.scores = [(term, score) for term, score in meta["scores"]]
+        return detector
+
+    def observe(self, terms: Iterable[str]):
+        for term in terms:
+            self.window.add(term)
+            self.heavy.add(term)
+
+    def observe_item(self, item: dict):
+        """Tokens of a post's title/description plus the dictionary keywords it mentions"""
+        text = self.extractor.clean_text(item.get("title", ""), item.get("description", ""))
+        terms = tokenize(text)
+        terms.extend(keyword for keyword, _ in self.extractor.extract(text))
+        self.observe(terms)
+
+    def close_window(self) -> List[Tuple[str, float]]:
+        """Score the window's heavy hitters, fold the window into the baseline and start a new one"""
+        scores = []
+        # Without any history every term would look like a burst, so the first window only seeds the baseline
+        candidates = self.heavy.top() if self.windows_closed else []
+        for term, _ in candidates:
+            count = self.window.estimate(term)
+            if count < self.min_support:
+                continue
+            base = self.baseline.estimate(term)
+            z = (count - base) / math.sqrt(base + 1.0)
+            if z > 0:
+                scores.append((term, round(z / (z + HALF_SCORE_Z), 4)))
+        scores.sort(key=lambda x: (-x[1], x[0]))
+
+        self.baseline.blend(self.window, 1.0 if self.windows_closed == 0 else self.decay)
+        self.window.clear()
+        self.heavy.clear()
+        self.windows_closed += 1
+        self.scores = scores
+        return scores
+
+    def trending(self, n: int = 20) -> List[Tuple[str, float]]:
+        """(keyword, score in 0–1) for the last closed window, ready for merge_keywords"""
+        return self.scores[:n]
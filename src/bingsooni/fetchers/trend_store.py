@@ -0,0 +1,188 @@
+"""
+Append-only trend history: every (source, keyword, score, timestamp) a fetcher returns, in SQLite (WAL)
+
+Usage:
+    python -m bingsooni.fetchers.trend_store moving 빙수 [--days 7]
+    python -m bingsooni.fetchers.trend_store risers [--days 7] [--top 20]
+    python -m bingsooni.fetchers.trend_store import outputs/hashtag_trends_*.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+STORE_PATH = Path(os.getenv("BINGSOONI_TREND_DB", "state/trends.sqlite3"))
+
+DAY = 86400.0
+# History older than this does not contribute to decayed scores
+HISTORY_DAYS = 30
+# A snapshot's weight halves every HALF_LIFE_DAYS
+HALF_LIFE_DAYS = 3.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    ts      REAL NOT NULL,
+    source  TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    score   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_keyword_ts ON snapshots (keyword, ts);
+CREATE INDEX IF NOT EXISTS snapshots_ts ON snapshots (ts);
+"""
+
+
+class TrendStore:
+    """Snapshot history indexed by keyword and time; the database is only created on first write.
+
+    Each thread gets its own connection; WAL mode lets readers run alongside the single writer.
+    """
+
+    def __init__(self, path: Path = STORE_PATH, enabled: bool = True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.create_function("decay", 2, lambda age, half_life: 0.5 ** (age / half_life),
+                                 deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    def _readable(self) -> bool:
+        return self.enabled and (self.path.exists() or getattr(self._local, "conn", None) is not None)
+
+    def record(self, source: str, pairs: Iterable[Tuple[str, float]], ts: Optional[float] = None) -> int:
+        """Append one snapshot of a source's (keyword, score) pairs; returns the number of rows stored"""
+        if not self.enabled:
+            return 0
+        ts = time.time() if ts is None else ts
+        rows = [(ts, source, str(k), float(s)) for k, s in pairs]
+        if not rows:
+            return 0
+        try:
+            with self._conn() as conn:
+                conn.executemany("INSERT INTO snapshots (ts, source, keyword, score) VALUES (?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            # History is best-effort; a locked or unwritable store must not fail the run
+            print(f"⚠️  Could not record {source} snapshot: {e}")
+            return 0
+        return len(rows)
+
+    @staticmethod
+    def _source_filter(sources: Optional[Sequence[str]]) -> Tuple[str, list]:
+        if not sources:
+            return "", []
+        return f" AND source IN ({','.join('?' * len(sources))})", list(sources)
+
+    def moving_score(self, keyword: str, days: float = 7, now: Optional[float] = None,
+                     sources: Optional[Sequence[str]] = None) -> Optional[float]:
+        """Mean score of a keyword over the last `days` days, or None without snapshots"""
+        if not self._readable():
+            return None
+        now = time.time() if now is None else now
+        where, args = self._source_filter(sources)
+        row = self._conn().execute(
+            f"SELECT AVG(score) FROM snapshots WHERE keyword = ? AND ts >= ?{where}",
+            [keyword, now - days * DAY, *args]).fetchone()
+        return row[0]
+
+    def top_risers(self, days: float = 7, n: int = 20, now: Optional[float] = None,
+                   sources: Optional[Sequence[str]] = None) -> List[Tuple[str, float, Optional[float]]]:
+        """(keyword, mean score over the last `days`, mean over the `days` before) by largest rise"""
+        if not self._readable():
+            return []
+        now = time.time() if now is None else now
+        mid, start = now - days * DAY, now - 2 * days * DAY
+        where, args = self._source_filter(sources)
+        rows = self._conn().execute(
+            f"""SELECT keyword,
+                       AVG(CASE WHEN ts >= ? THEN score END) AS recent,
+                       AVG(CASE WHEN ts < ? THEN score END) AS prior
+                FROM snapshots WHERE ts >= ?{where}
+                GROUP BY keyword HAVING recent IS NOT NULL
+                ORDER BY recent - COALESCE(prior, 0) DESC, keyword
+                LIMIT ?""",
+            [mid, mid, start, *args, n]).fetchall()
+        return [(k, recent, prior) for k, recent, prior in rows]
+
+    def decayed_scores(self, days: float = HISTORY_DAYS, half_life: float = HALF_LIFE_DAYS,
+                       n: int = 50, now: Optional[float] = None, sources: Optional[Sequence[str]] = None,
+                       before: Optional[float] = None) -> List[Tuple[str, float]]:
+        """(keyword, recency-weighted mean score) for the strongest keywords (merge_keywords format).
+
+        before excludes snapshots recorded at or after that time (e.g. by the current run).
+        """
+        if not self._readable():
+            return []
+        now = time.time() if now is None else now
+        where, args = self._source_filter(sources)
+        if before is not None:
+            where, args = where + " AND ts < ?", [*args, before]
+        rows = self._conn().execute(
+            f"""SELECT keyword, SUM(score * w) / SUM(w) AS s FROM (
+                    SELECT keyword, score, decay((? - ts) / {DAY}, ?) AS w
+                    FROM snapshots WHERE ts >= ?{where})
+                GROUP BY keyword ORDER BY s DESC, keyword LIMIT ?""",
+            [now, half_life, now - days * DAY, *args, n]).fetchall()
+        return [(k, round(s, 4)) for k, s in rows]
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+TREND_STORE = TrendStore(enabled=os.getenv("BINGSOONI_NO_HISTORY", "") == "")
+
+
+def import_reports(paths: Iterable[Path], store: TrendStore = TREND_STORE) -> int:
+    """Backfill the store from outputs/hashtag_trends_YYYYMMDD.json reports"""
+    total = 0
+    for path in paths:
+        report = json.loads(Path(path).read_text(encoding="utf-8"))
+        ts = datetime.fromisoformat(report["date"]).timestamp()
+        total += store.record("instagram", report.get("trending_hashtags", []), ts=ts)
+    return total
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Query the trend snapshot history")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    moving = sub.add_parser("moving", help="Moving mean score of one keyword")
+    moving.add_argument("keyword")
+    moving.add_argument("--days", type=float, default=7)
+    risers = sub.add_parser("risers", help="Keywords whose score rose the most")
+    risers.add_argument("--days", type=float, default=7)
+    risers.add_argument("--top", type=int, default=20)
+    imp = sub.add_parser("import", help="Backfill from daily hashtag trend reports")
+    imp.add_argument("reports", nargs="+", type=Path)
+    args = ap.parse_args()
+
+    if args.cmd == "moving":
+        score = TREND_STORE.moving_score(args.keyword, args.days)
+        print(f"{args.keyword}: " + ("no snapshots" if score is None else f"{score:.3f} ({args.days:g}-day mean)"))
+    elif args.cmd == "risers":
+        for kw, recent, prior in TREND_STORE.top_risers(args.days, args.top):
+            before = "new" if prior is None else f"{prior:.3f}"
+            print(f"  {kw:<20} {recent:.3f}  (was {before})")
+    else:
+        print(f"📥 Imported {import_reports(args.reports)} snapshots into {TREND_STORE.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,61 @@ from __future__ import annotations
 from pathlib import Path
 import csv
 import os
-from typing import List, Tuple
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+try:
+    from .trend_cache import TREND_CACHE
+    from .trend_store import TREND_STORE
+except ImportError:  # imported as a plain module (scripts run from this directory)
+    from trend_cache import TREND_CACHE
+    from trend_store import TREND_STORE
+
+# Food/cafe related keywords in Korean
+PYTRENDS_KEYWORDS = ["카페", "빙수", "디저트", "맛집", "서울맛집"]
+PYTRENDS_PARAMS = {"keywords": PYTRENDS_KEYWORDS, "timeframe": "now 7-d", "geo": "KR"}
+NAVER_PARAMS: dict = {}
+
+# One ingestor per process: constructing it loads cursors, counts and the detector from disk
+_NAVER_INGESTOR = None
+_NAVER_LOCK = threading.Lock()
+
+# Messages of the source fetch running on this thread (see fetch_sources_concurrently)
+_WORKER = threading.local()
+
+class SourceStatus(NamedTuple):
+    """How one external source's fetch ended: ok/timeout/error, plus the messages it reported"""
+    state: str
+    messages: Tuple[str, ...] = ()
+
+def _warn(message: str):
+    """Report a fetch problem: kept for the source's status on fetch workers, printed elsewhere"""
+    notes = getattr(_WORKER, "notes", None)
+    if notes is None:
+        print(message)
+    else:
+        notes.append(message)
+
+def _as_pairs(value) -> list[tuple[str, float]]:
+    return [(str(k), float(s)) for k, s in value]
 
 def fetch_pytrends_keywords() -> list[tuple[str, float]]:
-    """Fetch real Google Trends data for Korean food/cafe keywords"""
+    """Fetch real Google Trends data for Korean food/cafe keywords (served from the trend cache when warm)"""
+    value = TREND_CACHE.get_or_fetch("pytrends", PYTRENDS_PARAMS, _fetch_pytrends_live)
+    return _as_pairs(value) if value else _fallback_pytrends_keywords()
+
+def _fetch_pytrends_live() -> list[tuple[str, float]] | None:
+    """Query Google Trends; None when it is unavailable (so nothing gets cached)"""
     try:
         from pytrends.request import TrendReq
         
         # Initialize pytrends
         pytrends = TrendReq(hl='ko-KR', tz=540)  # Korean timezone
-        
-        # Food/cafe related keywords in Korean
-        keywords = ["카페", "빙수", "디저트", "맛집", "서울맛집"]
+        keywords = PYTRENDS_PARAMS["keywords"]
         
         # Build payload for interest over time
-        pytrends.build_payload(keywords, cat=0, timeframe='now 7-d', geo='KR')
+        pytrends.build_payload(keywords, cat=0, timeframe=PYTRENDS_PARAMS["timeframe"], geo=PYTRENDS_PARAMS["geo"])
         
         # Get interest over time data
         data = pytrends.interest_over_time()
@@ -27,50 +67,77 @@ def fetch_pytrends_keywords() -> list[tuple[str, float]]:
             for keyword in keywords:
                 if keyword in data.columns:
                     avg_score = data[keyword].mean() / 100.0  # Normalize to 0-1
-                    results.append((keyword, avg_score))
+                    results.append((keyword, float(avg_score)))
             
             # Add trending searches
             trending = pytrends.trending_searches(pn='south_korea')
             if not trending.empty:
                 for trend in trending.head(5).values:
-                    results.append((trend[0], 0.5))  # Default score for trending
+                    results.append((str(trend[0]), 0.5))  # Default score for trending
             
-            return results if results else _fallback_pytrends_keywords()
+            TREND_STORE.record("pytrends", results)
+            return results or None
+        return None
         
     except ImportError:
-        print("⚠️  pytrends not installed. Run: pip install pytrends")
-        return _fallback_pytrends_keywords()
+        _warn("⚠️  pytrends not installed. Run: pip install pytrends")
+        return None
     except Exception as e:
-        print(f"⚠️  Google Trends API error: {e}")
-        return _fallback_pytrends_keywords()
+        _warn(f"⚠️  Google Trends API error: {e}")
+        return None
 
 def _fallback_pytrends_keywords() -> list[tuple[str, float]]:
     """Fallback data when Google Trends is unavailable"""
     return [("빙수", 0.6), ("카페", 0.55), ("여름디저트", 0.5), ("서울맛집", 0.45), ("노포", 0.4)]
 
+def _cached_or_fallback_pytrends() -> list[tuple[str, float]]:
+    """Last cached Google Trends data of any age, else the static fallback"""
+    cached = TREND_CACHE.peek("pytrends", PYTRENDS_PARAMS)
+    return _as_pairs(cached[0]) if cached else _fallback_pytrends_keywords()
+
 def fetch_naver_blog_keywords() -> list[tuple[str, float]]:
-    """Fetch trending food/cafe keywords from Naver Blog posts"""
+    """Fetch trending food/cafe keywords from Naver Blog posts (served from the trend cache when warm)"""
+    value = TREND_CACHE.get_or_fetch("naver", NAVER_PARAMS, _fetch_naver_live)
+    return _as_pairs(value) if value else _fallback_naver_keywords()
+
+def _naver_ingestor():
+    global _NAVER_INGESTOR
+    with _NAVER_LOCK:
+        if _NAVER_INGESTOR is None:
+            try:
+                from .naver_ingest import NaverIngestor
+            except ImportError:  # run as a script from this directory
+                from naver_ingest import NaverIngestor
+            _NAVER_INGESTOR = NaverIngestor()
+        return _NAVER_INGESTOR
+
+def _fetch_naver_live() -> list[tuple[str, float]] | None:
     try:
         # Use Naver Search API for trending blog keywords
         client_id = os.getenv('NAVER_CLIENT_ID')
         client_secret = os.getenv('NAVER_CLIENT_SECRET')
         
         if not all([client_id, client_secret]):
-            print("⚠️  Naver API credentials not configured")
-            return _fallback_naver_keywords()
+            _warn("⚠️  Naver API credentials not configured")
+            return None
         
-        # This would integrate with Naver Search API
-        # For now, return enhanced local trending keywords
-        return _fallback_naver_keywords()
+        # Terms bursting in the latest ingestion run (python -m bingsooni.fetchers.naver_ingest);
+        # the ingestor records each window's rising terms once, cache misses only re-read them.
+        # Nothing rising is a miss like an API error: the caller's fallback must not be cached
+        return _naver_ingestor().rising_keywords() or None
         
     except Exception as e:
-        print(f"⚠️  Naver API error: {e}")
-        return _fallback_naver_keywords()
+        _warn(f"⚠️  Naver API error: {e}")
+        return None
 
 def _fallback_naver_keywords() -> list[tuple[str, float]]:
     """Enhanced fallback keywords based on Korean food/cafe trends"""
     return [("숨은맛집", 0.4), ("가성비맛집", 0.35), ("맛집팁", 0.3), ("연남동카페", 0.32), ("성수동맛집", 0.28)]
 
+def _cached_or_fallback_naver() -> list[tuple[str, float]]:
+    cached = TREND_CACHE.peek("naver", NAVER_PARAMS)
+    return _as_pairs(cached[0]) if cached else _fallback_naver_keywords()
+
 def load_internal_keywords(path: str = "data/internal_keywords.csv") -> list[tuple[str, float]]:
     p = Path(path)
     if not p.exists():
@@ -91,15 +158,119 @@ def merge_keywords(
     w_internal: float = 1.5,
     w_external: float = 1.3,
     top_n: int = 20,
+    history: list[tuple[str, float]] | None = None,
+    w_history: float = 1.0,
 ) -> list[str]:
     from collections import defaultdict
     score = defaultdict(float)
+    for k, s in history or []: score[k] += s * w_history
     for k, s in external: score[k] += s * w_external
     for k, s in internal: score[k] += s * w_internal
     ranked = sorted(score.items(), key=lambda x: x[1], reverse=True)
     return [k for k, _ in ranked[:top_n]]
 
-def get_final_keywords() -> list[str]:
-    internal = load_internal_keywords()
-    externals = fetch_pytrends_keywords() + fetch_naver_blog_keywords()
-    return merge_keywords(internal, externals)
+# External sources: name → (fetcher, fallback used when the fetcher misses its deadline or fails)
+EXTERNAL_SOURCES: Dict[str, Tuple[Callable[[], list], Callable[[], list]]] = {
+    "pytrends": (fetch_pytrends_keywords, _cached_or_fallback_pytrends),
+    "naver": (fetch_naver_blog_keywords, _cached_or_fallback_naver),
+}
+
+def load_keyword_history(n: int = 50, before: float | None = None) -> list[tuple[str, float]]:
+    """Recency-weighted scores of external keywords seen in earlier runs (see trend_store.py).
+
+    Pass the run's start time as before: the run's own snapshot already counts as an external
+    keyword and must not be counted again as history.
+    """
+    return TREND_STORE.decayed_scores(n=n, sources=list(EXTERNAL_SOURCES), before=before)
+
+# Seconds each source may take, and the upper bound for the whole fetch stage
+SOURCE_DEADLINES = {"pytrends": 8.0, "naver": 5.0}
+TOTAL_FETCH_BUDGET = 10.0
+
+def fetch_sources_concurrently(
+    sources: Dict[str, Tuple[Callable[[], list], Callable[[], list]]] | None = None,
+    deadlines: Dict[str, float] | None = None,
+    total_budget: float = TOTAL_FETCH_BUDGET,
+) -> Tuple[Dict[str, list], Dict[str, SourceStatus]]:
+    """Run every source at once; returns (results by source, SourceStatus by source).
+
+    Sources that miss their own deadline or the total budget get their fallback value (the last
+    cached value when there is one, see EXTERNAL_SOURCES). Fetchers run on daemon threads, so a
+    hung request can never keep the CLI from exiting. Nothing is printed here: what the workers
+    report ends up in the statuses, in source order (see print_fetch_status).
+    """
+    sources = sources or EXTERNAL_SOURCES
+    deadlines = {**SOURCE_DEADLINES, **(deadlines or {})}
+    boxes: Dict[str, dict] = {name: {"notes": []} for name in sources}
+
+    def run(name: str, fetch: Callable[[], list]):
+        _WORKER.notes = boxes[name]["notes"]
+        try:
+            boxes[name]["value"] = fetch()
+        except Exception as e:
+            boxes[name]["error"] = e
+        finally:
+            _WORKER.notes = None
+
+    start = time.monotonic()
+    threads = {}
+    for name, (fetch, _) in sources.items():
+        t = threading.Thread(target=run, args=(name, fetch), name=f"fetch-{name}", daemon=True)
+        t.start()
+        threads[name] = t
+
+    results: Dict[str, list] = {}
+    status: Dict[str, SourceStatus] = {}
+    for name, (_, fallback) in sources.items():
+        limit = min(deadlines.get(name, total_budget), total_budget)
+        threads[name].join(max(0.0, start + limit - time.monotonic()))
+        box = boxes[name]
+        # A timed-out worker may still add notes; take what it reported so far
+        notes = list(box["notes"])
+        if "value" in box:
+            results[name], status[name] = box["value"], SourceStatus("ok", tuple(notes))
+        elif "error" in box:
+            notes.append(f"⚠️  {name} fetch failed: {box['error']}")
+            results[name], status[name] = fallback(), SourceStatus("error", tuple(notes))
+        else:
+            notes.append(f"⏱️  {name} did not respond within {limit:.1f}s, using fallback")
+            results[name], status[name] = fallback(), SourceStatus("timeout", tuple(notes))
+    return results, status
+
+def print_fetch_status(status: Dict[str, SourceStatus]):
+    """Print what each source reported during a concurrent fetch, one source after another"""
+    for source_status in status.values():
+        for message in source_status.messages:
+            print(message)
+
+def fetch_external_keywords_with_status(
+    deadlines: Dict[str, float] | None = None, total_budget: float = TOTAL_FETCH_BUDGET
+) -> Tuple[list[tuple[str, float]], Dict[str, SourceStatus]]:
+    """Fetch every external source concurrently; also returns each source's status"""
+    results, status = fetch_sources_concurrently(EXTERNAL_SOURCES, deadlines, total_budget)
+    return [kw for name in EXTERNAL_SOURCES for kw in results[name]], status
+
+def fetch_external_keywords(
+    deadlines: Dict[str, float] | None = None, total_budget: float = TOTAL_FETCH_BUDGET
+) -> list[tuple[str, float]]:
+    """Fetch keywords from every external source (shared across campaigns in batch runs)"""
+    externals, status = fetch_external_keywords_with_status(deadlines, total_budget)
+    print_fetch_status(status)
+    return externals
+
+def get_final_keywords_with_status(
+    internal_path: str = "data/internal_keywords.csv", externals: list[tuple[str, float]] | None = None
+) -> Tuple[list[str], Dict[str, SourceStatus]]:
+    """Merged keywords plus each external source's fetch status (empty when externals are given)"""
+    started = time.time()
+    internal = load_internal_keywords(internal_path)
+    status: Dict[str, SourceStatus] = {}
+    if externals is None:
+        externals, status = fetch_external_keywords_with_status()
+    return merge_keywords(internal, externals, history=load_keyword_history(before=started)), status
+
+def get_final_keywords(internal_path: str = "data/internal_keywords.csv",
+                       externals: list[tuple[str, float]] | None = None) -> list[str]:
+    keywords, status = get_final_keywords_with_status(internal_path, externals)
+    print_fetch_status(status)
+    return keywords
@@ -4,21 +4,60 @@ Web scraping module for fetching trending hashtags and keywords from various sou
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import re
 import os
 import time
 import random
-from typing import List, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from urllib.parse import urljoin
 import json
 
+try:
+    from .keyword_extraction import KeywordExtractor
+    from .rate_limit import TokenBucket
+    from .trend_cache import TREND_CACHE
+    from .trend_store import TREND_STORE
+except ImportError:  # run as a script from this directory
+    from keyword_extraction import KeywordExtractor
+    from rate_limit import TokenBucket
+    from trend_cache import TREND_CACHE
+    from trend_store import TREND_STORE
+
+# Search terms used to sample recent Naver blog posts
+NAVER_SEARCH_TERMS = ["서울맛집", "카페추천", "디저트맛집", "빙수추천", "핫플레이스"]
+
+# Naver blog search endpoint (override to point at a local stand-in server)
+NAVER_SEARCH_URL = os.getenv("NAVER_SEARCH_URL", "https://openapi.naver.com/v1/search/blog.json")
+# The API returns at most 100 items per page and refuses start offsets past 1000
+NAVER_MAX_DISPLAY = 100
+NAVER_MAX_START = 1000
+# Naver Search API allows roughly 10 calls/second per application
+NAVER_RATE_PER_SEC = 10.0
+# Set to 1 to count only posts published since the previous run (see naver_ingest.py)
+NAVER_INCREMENTAL = os.getenv("BINGSOONI_NAVER_INCREMENTAL", "") == "1"
+
 class TrendsScraper:
-    def __init__(self):
+    def __init__(self, search_terms: Optional[List[str]] = None, display: int = 20, max_pages: int = 1,
+                 max_workers: int = 8, rate_per_sec: float = NAVER_RATE_PER_SEC, base_url: Optional[str] = None,
+                 incremental: bool = NAVER_INCREMENTAL):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        self.search_terms = list(search_terms or NAVER_SEARCH_TERMS)
+        self.display = max(1, min(display, NAVER_MAX_DISPLAY))
+        self.max_pages = max(1, max_pages)
+        self.max_workers = max_workers
+        self.base_url = base_url or NAVER_SEARCH_URL
+        self.incremental = incremental
+        self.rate_limiter = TokenBucket(rate_per_sec)
+        # One keep-alive connection per worker, shared across every request this scraper makes
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update(self.headers)
 
     def scrape_instagram_hashtags(self, keywords: List[str]) -> List[Tuple[str, float]]:
@@ -48,73 +87,113 @@ class TrendsScraper:
         return trending_hashtags[:15]
 
     def scrape_naver_blog_trends(self) -> List[Tuple[str, float]]:
-        """Scrape trending keywords from Naver Blog using real API"""
+        """Scrape trending keywords from Naver Blog using real API (served from the trend cache when warm)"""
+        if self.incremental:
+            return self._ingest_naver_blog_trends() or self._fallback_naver_trends()
+        params = {"search_terms": self.search_terms, "display": self.display,
+                  "max_pages": self.max_pages, "sort": "date"}
+        value = TREND_CACHE.get_or_fetch("naver_blog_trends", params, self._scrape_naver_blog_live)
+        return [(k, s) for k, s in value] if value else self._fallback_naver_trends()
+
+    def _ingest_naver_blog_trends(self) -> List[Tuple[str, float]]:
+        """Rising (else most-mentioned) keywords after ingesting only posts newer than each term's cursor"""
+        try:
+            from .naver_ingest import NaverIngestor
+        except ImportError:  # run as a script from this directory
+            from naver_ingest import NaverIngestor
+        ingestor = NaverIngestor(self, max_pages=max(self.max_pages, 10))
+        try:
+            ingestor.run()
+        except Exception as e:
+            print(f"Error ingesting Naver posts: {e}")
+        return ingestor.rising_keywords() or ingestor.top_keywords()
+
+    def naver_headers(self) -> Optional[Dict[str, str]]:
+        """Naver search API headers, or None when the credentials are not configured"""
+        client_id = os.getenv('NAVER_CLIENT_ID')
+        client_secret = os.getenv('NAVER_CLIENT_SECRET')
+        if not all([client_id, client_secret]):
+            return None
+        return {
+            'X-Naver-Client-Id': client_id,
+            'X-Naver-Client-Secret': client_secret,
+            'User-Agent': self.headers['User-Agent']
+        }
+
+    def fetch_naver_page(self, headers: Dict[str, str], term: str, start: int) -> Optional[dict]:
+        """One date-sorted result page for term starting at start; None on a non-200 response"""
+        self.rate_limiter.acquire()
+        params = {
+            'query': term,
+            'display': self.display,
+            'start': start,
+            'sort': 'date'  # Most recent posts
+        }
+        response = self.session.get(self.base_url, headers=headers, params=params, timeout=10)
+        if response.status_code != 200:
+            print(f"⚠️  Naver search for {term!r} (start={start}) returned {response.status_code}")
+            return None
+        return response.json()
+
+    @staticmethod
+    def _page_result(fut, term: str, start: int) -> Optional[dict]:
+        """A fetched page, or None if its request failed (the other pages are kept)"""
+        try:
+            return fut.result()
+        except Exception as e:
+            print(f"⚠️  Naver search for {term!r} (start={start}) failed: {e}")
+            return None
+
+    def fetch_naver_blog_posts(self, headers: Dict[str, str],
+                               search_terms: Optional[List[str]] = None) -> Dict[str, List[List[dict]]]:
+        """Fetch up to max_pages result pages per search term in parallel; returns term → pages of items"""
+        terms = list(search_terms or self.search_terms)
+        pages: Dict[str, List[Optional[List[dict]]]] = {term: [None] * self.max_pages for term in terms}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # First page of every term tells us how many results exist, so we never request empty pages
+            firsts = {term: pool.submit(self.fetch_naver_page, headers, term, 1) for term in terms}
+            rest = []
+            for term, fut in firsts.items():
+                data = self._page_result(fut, term, 1)
+                if not data:
+                    continue
+                pages[term][0] = data.get('items', [])
+                total = min(int(data.get('total', 0)), NAVER_MAX_START + self.display - 1)
+                for page in range(1, self.max_pages):
+                    start = 1 + page * self.display
+                    if start > total or start > NAVER_MAX_START:
+                        break
+                    rest.append((term, page, start, pool.submit(self.fetch_naver_page, headers, term, start)))
+            for term, page, start, fut in rest:
+                data = self._page_result(fut, term, start)
+                if data:
+                    pages[term][page] = data.get('items', [])
+        return {term: [p for p in term_pages if p] for term, term_pages in pages.items()}
+
+    def _scrape_naver_blog_live(self) -> Optional[List[Tuple[str, float]]]:
+        """Query the Naver blog search API; None when it is unavailable (so nothing gets cached)"""
         try:
             # Use Naver Search API
-            client_id = os.getenv('NAVER_CLIENT_ID')
-            client_secret = os.getenv('NAVER_CLIENT_SECRET')
-            
-            if not all([client_id, client_secret]):
+            headers = self.naver_headers()
+            if headers is None:
                 print("⚠️  Naver API credentials not configured")
-                return self._fallback_naver_trends()
-            
-            headers = {
-                'X-Naver-Client-Id': client_id,
-                'X-Naver-Client-Secret': client_secret,
-                'User-Agent': self.headers['User-Agent']
-            }
+                return None
             
             trending_keywords = []
             
             # Search for trending food/cafe posts
-            search_terms = ["서울맛집", "카페추천", "디저트맛집", "빙수추천", "핫플레이스"]
+            extractor = KeywordExtractor()
+            for term_pages in self.fetch_naver_blog_posts(headers).values():
+                for items in term_pages:
+                    # Extract location/content keywords from blog titles and descriptions
+                    trending_keywords.extend(extractor.score_items(items))
             
-            for term in search_terms:
-                url = "https://openapi.naver.com/v1/search/blog.json"
-                params = {
-                    'query': term,
-                    'display': 20,
-                    'sort': 'date'  # Most recent posts
-                }
-                
-                response = self.session.get(url, headers=headers, params=params)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Extract keywords from blog titles and descriptions
-                    for item in data.get('items', []):
-                        title = item.get('title', '')
-                        description = item.get('description', '')
-                        
-                        # Clean HTML tags
-                        import re
-                        title = re.sub('<[^<]+?>', '', title)
-                        description = re.sub('<[^<]+?>', '', description)
-                        
-                        # Extract relevant keywords
-                        text = f"{title} {description}".lower()
-                        
-                        # Score based on how recent and relevant the post is
-                        score = 0.7 + (len(data['items']) - data['items'].index(item)) * 0.01
-                        
-                        # Add location-based trends
-                        if any(loc in text for loc in ['연남', '성수', '홍대', '강남']):
-                            location_kw = next(loc for loc in ['연남', '성수', '홍대', '강남'] if loc in text)
-                            trending_keywords.append((f"{location_kw}맛집", min(score + 0.1, 1.0)))
-                        
-                        # Add content-based trends  
-                        if any(food in text for food in ['빙수', '카페', '디저트']):
-                            food_kw = next(food for food in ['빙수', '카페', '디저트'] if food in text)
-                            trending_keywords.append((f"{food_kw}추천", score))
-                
-                time.sleep(0.1)  # Rate limiting
-            
-            return trending_keywords if trending_keywords else self._fallback_naver_trends()
+            TREND_STORE.record("naver_blog_trends", trending_keywords)
+            return trending_keywords or None
             
         except Exception as e:
             print(f"Error scraping Naver trends: {e}")
-            return self._fallback_naver_trends()
+            return None
     
     def _fallback_naver_trends(self) -> List[Tuple[str, float]]:
         """Fallback data when Naver API is unavailable"""
@@ -170,13 +249,17 @@ class TrendsScraper:
         
         return trends
 
-def integrate_web_trends_to_system():
+def integrate_web_trends_to_system(base_keywords: Optional[List[str]] = None):
     """Integration function to fetch and merge web trends with existing system"""
     scraper = TrendsScraper()
     
-    # Get base keywords from existing system
-    from trends_fetchers import get_final_keywords
-    base_keywords = get_final_keywords()
+    # Get base keywords from existing system unless the caller already has them
+    if base_keywords is None:
+        try:
+            from .trends_fetchers import get_final_keywords
+        except ImportError:  # run as a script from this directory
+            from trends_fetchers import get_final_keywords
+        base_keywords = get_final_keywords()
     
     # Fetch web trends
     web_trends = scraper.get_all_trends(base_keywords)
@@ -0,0 +1,214 @@
+"""
+Concurrent LLM generation for many keyword sets
+
+One AsyncOpenAI client (and therefore one HTTP connection pool) serves every job. A semaphore bounds
+the requests in flight, token buckets keep to the requests- and tokens-per-minute quotas, and
+transient API errors are retried with jittered exponential backoff. A job whose calls keep failing
+falls back to the local generators, like the synchronous AIGenerator methods do.
+
+Benchmark (any OpenAI-compatible server works as a stand-in; the key only has to be non-empty):
+    OPENAI_API_KEY=test OPENAI_BASE_URL=http://127.0.0.1:8000/v1 \\
+        python -m bingsooni.generators.ai_batch --jobs 50 --concurrency 1
+    OPENAI_API_KEY=test OPENAI_BASE_URL=http://127.0.0.1:8000/v1 \\
+        python -m bingsooni.generators.ai_batch --jobs 50 --concurrency 16
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import openai
+from openai import AsyncOpenAI
+
+try:
+    from ..fetchers.rate_limit import TokenBucket
+    from .ai_generator import AIGenerator
+    from .llm_cache import LLM_CACHE
+except ImportError:  # imported as a plain module (scripts run from this directory)
+    from bingsooni.fetchers.rate_limit import TokenBucket
+    from ai_generator import AIGenerator
+    from llm_cache import LLM_CACHE
+
+DEFAULT_CONCURRENCY = int(os.getenv("BINGSOONI_LLM_CONCURRENCY", 8))
+DEFAULT_RPM = float(os.getenv("BINGSOONI_LLM_RPM", 500))
+DEFAULT_TPM = float(os.getenv("BINGSOONI_LLM_TPM", 200_000))
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 20.0
+REQUEST_TIMEOUT = 60.0
+
+RETRYABLE = (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError,
+             openai.InternalServerError)
+
+
+class BatchJob(NamedTuple):
+    """Keywords for one campaign; hooks given up front are kept and only hashtags are generated"""
+    keywords: Sequence[str]
+    hooks: Sequence[str] = ()
+
+
+class BatchResult(NamedTuple):
+    keywords: List[str]
+    hooks: List[str]
+    hashtags: List[str]
+    errors: List[str]
+
+
+def estimate_tokens(request: Dict) -> int:
+    """Rough token cost for TPM budgeting: prompt characters / 2 (Hangul-heavy text) plus the completion cap"""
+    chars = sum(len(m["content"]) for m in request["messages"])
+    return chars // 2 + request.get("max_tokens", 0)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than a server-provided Retry-After"""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+    return max(delay, retry_after or 0.0)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    try:
+        return float(error.response.headers["retry-after"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+class AsyncBatchGenerator:
+    """Generates hooks and hashtags for many jobs concurrently with one shared AsyncOpenAI client"""
+
+    def __init__(self, generator: Optional[AIGenerator] = None, concurrency: int = DEFAULT_CONCURRENCY,
+                 rpm: float = DEFAULT_RPM, tpm: float = DEFAULT_TPM, max_attempts: int = MAX_ATTEMPTS,
+                 base_url: Optional[str] = None, use_cache: bool = True, hooks_per_job: int = 20,
+                 hashtags_per_job: int = 25, context: str = "Korean food and cafe content"):
+        self.generator = generator or AIGenerator()
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.base_url = base_url
+        self.use_cache = use_cache
+        self.hooks_per_job = hooks_per_job
+        self.hashtags_per_job = hashtags_per_job
+        self.context = context
+        self.requests_bucket = TokenBucket.per_minute(rpm)
+        self.tokens_bucket = TokenBucket.per_minute(tpm)
+        self.stats = {"requests": 0, "calls": 0, "retries": 0, "failed_calls": 0}
+        self._client: Optional[AsyncOpenAI] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def run(self, jobs: Iterable) -> List[BatchResult]:
+        """Results in job order; jobs are BatchJob or (keywords, hooks) tuples"""
+        jobs = [job if isinstance(job, BatchJob) else BatchJob(*job) for job in jobs]
+        if not self.generator.api_key:
+            # Nothing to call: local generation is the expected result here, not a per-job error
+            return [self._local_job(job) for job in jobs]
+        self._slots = asyncio.Semaphore(self.concurrency)
+        # SDK retries are off: every attempt has to pass through the rate limiters below
+        async with AsyncOpenAI(api_key=self.generator.api_key, base_url=self.base_url,
+                               max_retries=0, timeout=REQUEST_TIMEOUT) as client:
+            self._client = client
+            try:
+                return list(await asyncio.gather(*(self._run_job(job) for job in jobs)))
+            finally:
+                self._client = None
+
+    async def _call(self, request: Dict) -> str:
+        cost = estimate_tokens(request)
+        for attempt in range(self.max_attempts):
+            async with self._slots:
+                await self.requests_bucket.acquire_async()
+                await self.tokens_bucket.acquire_async(cost)
+                self.stats["calls"] += 1
+                try:
+                    response = await self._client.chat.completions.create(**request)
+                    return response.choices[0].message.content or ""
+                except RETRYABLE as e:
+                    if attempt + 1 >= self.max_attempts:
+                        self.stats["failed_calls"] += 1
+                        raise
+                    delay = backoff_delay(attempt, _retry_after(e))
+            # Back off without holding a concurrency slot
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+        raise RuntimeError("unreachable")
+
+    async def _complete(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        request = self.generator._request(prompt, max_tokens, temperature)
+        self.stats["requests"] += 1
+        if self._client is None:
+            raise RuntimeError("no API client")
+        if self.use_cache:
+            return await LLM_CACHE.get_or_create_async(request, lambda: self._call(request))
+        return await self._call(request)
+
+    def _local_job(self, job: BatchJob) -> BatchResult:
+        gen = self.generator
+        keywords = list(job.keywords)
+        hooks = list(job.hooks) or gen._generate_ai_style_hooks_locally(keywords, self.hooks_per_job)
+        hashtags = gen._generate_ai_style_hashtags_locally(keywords, hooks, self.hashtags_per_job)
+        return BatchResult(keywords, hooks, hashtags, [])
+
+    async def _run_job(self, job: BatchJob) -> BatchResult:
+        gen = self.generator
+        keywords, hooks, errors = list(job.keywords), list(job.hooks), []
+        if not hooks:
+            try:
+                text = await self._complete(**gen._hooks_prompt(keywords, self.context, self.hooks_per_job))
+                hooks = gen._parse_hooks(text, self.hooks_per_job)
+            except Exception as e:
+                errors.append(f"hooks: {e}")
+            if not hooks:
+                hooks = gen._generate_ai_style_hooks_locally(keywords, self.hooks_per_job)
+
+        hashtags: List[str] = []
+        try:
+            text = await self._complete(**gen._hashtags_prompt(keywords, hooks, self.hashtags_per_job))
+            hashtags = gen._parse_hashtags(text, self.hashtags_per_job)
+        except Exception as e:
+            errors.append(f"hashtags: {e}")
+        if not hashtags:
+            hashtags = gen._generate_ai_style_hashtags_locally(keywords, hooks, self.hashtags_per_job)
+        return BatchResult(keywords, hooks, hashtags, errors)
+
+
+def generate_batch(jobs: Iterable, generator: Optional[AIGenerator] = None, **options) -> List[BatchResult]:
+    """Blocking entry point: run AsyncBatchGenerator over jobs in a fresh event loop"""
+    return asyncio.run(AsyncBatchGenerator(generator, **options).run(jobs))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark concurrent hook + hashtag generation")
+    ap.add_argument("--jobs", type=int, default=50)
+    ap.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    ap.add_argument("--rpm", type=float, default=DEFAULT_RPM)
+    ap.add_argument("--tpm", type=float, default=DEFAULT_TPM)
+    ap.add_argument("--base-url", default=None, help="OpenAI-compatible endpoint (default: OPENAI_BASE_URL)")
+    ap.add_argument("--keywords", default="카페,아이스크림,와인,디저트,빙수,성수동")
+    ap.add_argument("--cache", action="store_true", help="Serve repeated prompts from the response cache")
+    args = ap.parse_args()
+
+    base = [k.strip() for k in args.keywords.split(",") if k.strip()]
+    # Distinct keyword sets so every job sends its own prompts
+    jobs = [BatchJob(base[i % len(base):] + base[:i % len(base)] + [f"캠페인{i + 1}"]) for i in range(args.jobs)]
+
+    batch = AsyncBatchGenerator(concurrency=args.concurrency, rpm=args.rpm, tpm=args.tpm,
+                                base_url=args.base_url, use_cache=args.cache)
+    if not batch.generator.api_key:
+        print("⚠️  OPENAI_API_KEY not set, jobs will use local generation")
+    started = time.perf_counter()
+    results = asyncio.run(batch.run(jobs))
+    elapsed = time.perf_counter() - started
+
+    failed = sum(1 for r in results if r.errors)
+    s = batch.stats
+    print(f"⏱️  {len(results)} jobs in {elapsed:.2f}s ({len(results) / elapsed:.1f} jobs/s, "
+          f"concurrency {batch.concurrency})")
+    print(f"   {s['requests']} requests, {s['calls']} API calls, {s['retries']} retries, "
+          f"{failed} jobs with local fallback")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,14 +6,52 @@ AI-powered hook and hashtag generation using LLM APIs
 from openai import OpenAI
 import json
 import os
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional
 import random
 import time
 from dotenv import load_dotenv
 
+try:
+    from .llm_cache import LLM_CACHE
+except ImportError:
+    from llm_cache import LLM_CACHE
+
+try:
+    from ..managers.hashtag_catalog import TIERS
+except ImportError:  # imported as a plain module (scripts run from this directory)
+    from bingsooni.managers.hashtag_catalog import TIERS
+
 # Load environment variables from .env file
 load_dotenv()
 
+DEFAULT_MODEL = "gpt-3.5-turbo"
+# Combined generation needs a model with JSON-schema structured outputs
+STRUCTURED_MODEL = os.getenv("BINGSOONI_STRUCTURED_MODEL", "gpt-4o-mini")
+
+_TAG_LIST = {"type": "array", "items": {"type": "string"}}
+CONTENT_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "required": ["hooks", "tiers"],
+    "properties": {
+        "hooks": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["hook", "hashtags"],
+                "properties": {"hook": {"type": "string"}, "hashtags": _TAG_LIST},
+            },
+        },
+        "tiers": {
+            "type": "object",
+            "additionalProperties": False,
+            "required": list(TIERS),
+            "properties": {tier: _TAG_LIST for tier in TIERS},
+        },
+    },
+}
+
 class AIGenerator:
     def __init__(self, api_key: str = None):
         # Initialize OpenAI client (you can also use other LLM APIs)
@@ -22,7 +60,206 @@ class AIGenerator:
             self.client = OpenAI(api_key=self.api_key)
         else:
             self.client = None
+
+    @staticmethod
+    def _request(prompt: str, max_tokens: int, temperature: float, model: str = DEFAULT_MODEL, **params) -> Dict:
+        """Chat completion arguments for a single-message prompt (also the response cache key)"""
+        return {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            **params,
+        }
+
+    @staticmethod
+    def _options(timeout: Optional[float]) -> Dict:
+        """Per-request client options (kept out of the request dict so they don't change the cache key)"""
+        return {} if timeout is None else {"timeout": timeout}
+
+    def _complete(self, prompt: str, max_tokens: int, temperature: float, model: str = DEFAULT_MODEL,
+                  timeout: Optional[float] = None, **params) -> str:
+        """Completion text for a single-message prompt, served from the response cache when warm"""
+        request = self._request(prompt, max_tokens, temperature, model, **params)
+
+        def create() -> str:
+            response = self.client.chat.completions.create(**request, **self._options(timeout))
+            return response.choices[0].message.content or ""
+
+        return LLM_CACHE.get_or_create(request, create)
+        
+    def _hooks_prompt(self, keywords: List[str], context: str, target_n: int) -> Dict:
+        """_complete() arguments for hook generation"""
+        # Create a comprehensive prompt for hook generation
+        prompt = f"""
+        Generate {target_n} engaging Korean social media hooks about {', '.join(keywords[:5])}.
+        
+        Context: {context}
+        
+        Requirements:
+        - Write in Korean
+        - Each hook should be 4-12 words
+        - Use emotional triggers and curiosity gaps
+        - Include trending social media language
+        - Make them feel authentic and shareable
+        - Avoid repetitive patterns
+        
+        Style examples:
+        - "이거 모르면 진짜 손해"
+        - "알고보니 여기가 맛집이었다"
+        - "MZ가 열광하는 이유 있었네"
+        
+        Keywords to incorporate: {', '.join(keywords)}
+        
+        Return only the hooks, one per line:
+        """
+        return {"prompt": prompt, "max_tokens": 1000, "temperature": 0.8}
+
+    @staticmethod
+    def _parse_hooks(text: str, target_n: int) -> List[str]:
+        return [hook.strip() for hook in text.strip().split('\n') if hook.strip()][:target_n]
+
+    def _hashtags_prompt(self, keywords: List[str], hooks: List[str], target_n: int) -> Dict:
+        """_complete() arguments for hashtag generation"""
+        prompt = f"""
+        Generate {target_n} trending Korean hashtags for social media posts about {', '.join(keywords[:3])}.
+        
+        Context: Korean food, cafe, and lifestyle content
+        Hooks for reference: {'; '.join(hooks[:5])}
+        
+        Requirements:
+        - Mix Korean and English naturally
+        - Include location-specific tags
+        - Use current social media slang
+        - Create unique combinations
+        - Make them searchable and trendy
+        
+        Style examples:
+        - #서울맛집헌터
+        - #감성카페탐방
+        - #MZ맛집인정
+        - #인생샷명소
+        
+        Return only hashtags starting with #, one per line:
+        """
+        return {"prompt": prompt, "max_tokens": 800, "temperature": 0.9}
+
+    @staticmethod
+    def _parse_hashtags(text: str, target_n: int) -> List[str]:
+        return [tag.strip() for tag in text.strip().split('\n') if tag.strip().startswith('#')][:target_n]
+
+    def _content_prompt(self, keywords: List[str], context: str, target_n: int, tags_per_hook: int,
+                        tier_n: int) -> Dict:
+        """_complete() arguments for combined hook + hashtag generation (JSON-schema response)"""
+        prompt = f"""
+        Generate {target_n} engaging Korean social media hooks about {', '.join(keywords[:5])},
+        each with {tags_per_hook} hashtags that fit that specific hook.
+        Also suggest about {tier_n} trending hashtags per reach tier for the whole campaign.
         
+        Context: {context}
+        
+        Hook requirements:
+        - Write in Korean
+        - Each hook should be 4-12 words
+        - Use emotional triggers and curiosity gaps
+        - Include trending social media language
+        - Make them feel authentic and shareable
+        - Avoid repetitive patterns
+        
+        Hashtag requirements:
+        - Start with #, no spaces
+        - Mix Korean and English naturally
+        - Use current social media slang
+        
+        Tiers:
+        - broad: very popular, general tags
+        - mid: popular within food, cafe and lifestyle content
+        - niche: specific dishes, styles and communities
+        - local: neighbourhoods and cities
+        
+        Keywords to incorporate: {', '.join(keywords)}
+        """
+        return {
+            "prompt": prompt, "max_tokens": 2500, "temperature": 0.8, "model": STRUCTURED_MODEL,
+            "response_format": {"type": "json_schema",
+                                "json_schema": {"name": "hook_content", "strict": True, "schema": CONTENT_SCHEMA}},
+        }
+
+    @staticmethod
+    def _clean_tags(tags, limit: int) -> List[str]:
+        """Valid, distinct hashtags from a model-provided list"""
+        if not isinstance(tags, list):
+            return []
+        cleaned = []
+        for tag in tags:
+            if not isinstance(tag, str):
+                continue
+            tag = "".join(tag.split())
+            if len(tag) > 1 and tag.startswith("#") and tag not in cleaned:
+                cleaned.append(tag)
+        return cleaned[:limit]
+
+    def _parse_content(self, text: str, target_n: int, tags_per_hook: int, tier_n: int) -> Dict:
+        """Validate a combined response field by field; anything invalid is left out for the caller to fill"""
+        content = {"hooks": [], "hook_hashtags": {}, "tiers": {}}
+        try:
+            data = json.loads(text)
+        except (TypeError, ValueError):
+            return content
+        if not isinstance(data, dict):
+            return content
+
+        items = data.get("hooks")
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict) or not isinstance(item.get("hook"), str):
+                continue
+            hook = item["hook"].strip()
+            if not hook or hook in content["hooks"]:
+                continue
+            content["hooks"].append(hook)
+            tags = self._clean_tags(item.get("hashtags"), tags_per_hook)
+            if tags:
+                content["hook_hashtags"][hook] = tags
+            if len(content["hooks"]) >= target_n:
+                break
+
+        tiers = data.get("tiers")
+        for tier in TIERS:
+            tags = self._clean_tags(tiers.get(tier), tier_n) if isinstance(tiers, dict) else []
+            if tags:
+                content["tiers"][tier] = tags
+        return content
+
+    def generate_ai_content(self, keywords: List[str], context: str = "Korean food and cafe content",
+                            target_n: int = 20, tags_per_hook: int = 10, tier_n: int = 8,
+                            fallback: bool = True, timeout: Optional[float] = None) -> Dict:
+        """Hooks, per-hook hashtags and tiered hashtags from one structured LLM call.
+
+        Returns {"hooks": [...], "hook_hashtags": {hook: [...]}, "tiers": {tier: [...]}}. Missing
+        hooks or tiers are filled by local generation (unless fallback is False); hooks without
+        valid tags are simply absent from hook_hashtags so the output stage ranks the catalog for them.
+        """
+        content = {"hooks": [], "hook_hashtags": {}, "tiers": {}}
+        if self.api_key and self.client:
+            try:
+                text = self._complete(**self._content_prompt(keywords, context, target_n, tags_per_hook, tier_n),
+                                      timeout=timeout)
+                content = self._parse_content(text, target_n, tags_per_hook, tier_n)
+            except Exception as e:
+                print(f"AI combined generation failed: {e}")
+
+        if not fallback:
+            return content
+        if not content["hooks"]:
+            content["hooks"] = self._generate_ai_style_hooks_locally(keywords, target_n)
+        missing = [tier for tier in TIERS if tier not in content["tiers"]]
+        if missing:
+            local = self._generate_ai_style_hashtags_locally(keywords, content["hooks"], tier_n * len(missing))
+            # Dealt round-robin: the local generator may return fewer tags than asked for
+            for i, tier in enumerate(missing):
+                content["tiers"][tier] = local[i::len(missing)][:tier_n]
+        return content
+
     def generate_ai_hooks(self, keywords: List[str], context: str = "Korean food and cafe content", target_n: int = 20) -> List[str]:
         """Generate hooks using AI/LLM"""
         
@@ -31,44 +268,69 @@ class AIGenerator:
             return self._generate_ai_style_hooks_locally(keywords, target_n)
         
         try:
-            # Create a comprehensive prompt for hook generation
-            prompt = f"""
-            Generate {target_n} engaging Korean social media hooks about {', '.join(keywords[:5])}.
-            
-            Context: {context}
-            
-            Requirements:
-            - Write in Korean
-            - Each hook should be 4-12 words
-            - Use emotional triggers and curiosity gaps
-            - Include trending social media language
-            - Make them feel authentic and shareable
-            - Avoid repetitive patterns
-            
-            Style examples:
-            - "이거 모르면 진짜 손해"
-            - "알고보니 여기가 맛집이었다"
-            - "MZ가 열광하는 이유 있었네"
-            
-            Keywords to incorporate: {', '.join(keywords)}
-            
-            Return only the hooks, one per line:
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000,
-                temperature=0.8
-            )
-            
-            hooks = response.choices[0].message.content.strip().split('\n')
-            return [hook.strip() for hook in hooks if hook.strip()][:target_n]
+            text = self._complete(**self._hooks_prompt(keywords, context, target_n))
+            return self._parse_hooks(text, target_n)
             
         except Exception as e:
             print(f"AI generation failed: {e}")
             return self._generate_ai_style_hooks_locally(keywords, target_n)
     
+    def generate_batch(self, jobs, **options):
+        """Hooks and hashtags for many (keywords, hooks) jobs at once; see ai_batch.AsyncBatchGenerator"""
+        try:
+            from .ai_batch import generate_batch
+        except ImportError:
+            from ai_batch import generate_batch
+        return generate_batch(jobs, generator=self, **options)
+
+    def stream_ai_hooks(self, keywords: List[str], context: str = "Korean food and cafe content",
+                        target_n: int = 20, fallback: bool = True,
+                        timeout: Optional[float] = None) -> Iterator[str]:
+        """Yield hooks line by line as the completion streams in.
+
+        Closing the generator (e.g. once the caller has enough valid hooks) cancels the request.
+        Only complete responses are cached; a warm cache entry is replayed without a request.
+        If the stream fails before producing anything, local hooks are yielded instead (unless
+        fallback is False). timeout bounds the wait for each chunk, so a stalled stream is abandoned.
+        """
+        if not self.api_key or not self.client:
+            if fallback:
+                yield from self._generate_ai_style_hooks_locally(keywords, target_n)
+            return
+
+        request = self._request(**self._hooks_prompt(keywords, context, target_n))
+        cached = LLM_CACHE.cached(request)
+        if cached is not None:
+            yield from self._parse_hooks(cached, target_n)
+            return
+
+        produced, parts, buffer = 0, [], ""
+        stream = None
+        try:
+            stream = self.client.chat.completions.create(**request, stream=True, **self._options(timeout))
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                parts.append(delta)
+                buffer += delta
+                *lines, buffer = buffer.split('\n')
+                for line in lines:
+                    if line.strip():
+                        produced += 1
+                        yield line.strip()
+            if buffer.strip():
+                produced += 1
+                yield buffer.strip()
+            LLM_CACHE.remember(request, "".join(parts))
+        except Exception as e:
+            print(f"AI streaming failed: {e}")
+            if fallback and not produced:
+                yield from self._generate_ai_style_hooks_locally(keywords, target_n)
+        finally:
+            if stream is not None:
+                stream.close()
+
     def _generate_ai_style_hooks_locally(self, keywords: List[str], target_n: int) -> List[str]:
         """Generate AI-style hooks locally without API"""
         
@@ -122,48 +384,20 @@ class AIGenerator:
                 
         return hooks[:target_n]
     
-    def generate_ai_hashtags(self, keywords: List[str], hooks: List[str], target_n: int = 25) -> List[str]:
-        """Generate hashtags using AI/LLM"""
+    def generate_ai_hashtags(self, keywords: List[str], hooks: List[str], target_n: int = 25,
+                             fallback: bool = True, timeout: Optional[float] = None) -> List[str]:
+        """Generate hashtags using AI/LLM (an empty list on failure when fallback is False)"""
         
         if not self.api_key or not self.client:
-            return self._generate_ai_style_hashtags_locally(keywords, hooks, target_n)
+            return self._generate_ai_style_hashtags_locally(keywords, hooks, target_n) if fallback else []
         
         try:
-            prompt = f"""
-            Generate {target_n} trending Korean hashtags for social media posts about {', '.join(keywords[:3])}.
-            
-            Context: Korean food, cafe, and lifestyle content
-            Hooks for reference: {'; '.join(hooks[:5])}
-            
-            Requirements:
-            - Mix Korean and English naturally
-            - Include location-specific tags
-            - Use current social media slang
-            - Create unique combinations
-            - Make them searchable and trendy
-            
-            Style examples:
-            - #서울맛집헌터
-            - #감성카페탐방
-            - #MZ맛집인정
-            - #인생샷명소
-            
-            Return only hashtags starting with #, one per line:
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=800,
-                temperature=0.9
-            )
-            
-            hashtags = response.choices[0].message.content.strip().split('\n')
-            return [tag.strip() for tag in hashtags if tag.strip().startswith('#')][:target_n]
+            text = self._complete(**self._hashtags_prompt(keywords, hooks, target_n), timeout=timeout)
+            return self._parse_hashtags(text, target_n)
             
         except Exception as e:
             print(f"AI hashtag generation failed: {e}")
-            return self._generate_ai_style_hashtags_locally(keywords, hooks, target_n)
+            return self._generate_ai_style_hashtags_locally(keywords, hooks, target_n) if fallback else []
     
     def _generate_ai_style_hashtags_locally(self, keywords: List[str], hooks: List[str], target_n: int) -> List[str]:
         """Generate AI-style hashtags locally"""
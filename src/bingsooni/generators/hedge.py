@@ -0,0 +1,194 @@
+"""
+Deadline-bounded hedging between LLM and local generation, plus a log of how each hedged stage ended
+
+The LLM side runs on a background thread and hands its items over as they arrive, while the local
+side runs in the caller. When the latency budget runs out the LLM request is abandoned (a streaming
+request is cancelled), whatever it produced so far is kept and local items fill the rest. Producers
+should give their request a timeout of the budget: the worker only sees the deadline between items,
+so that timeout is what stops a stalled request.
+
+Usage:
+    python -m bingsooni.generators.hedge [--days 7]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+OUTCOME_PATH = Path(os.getenv("BINGSOONI_OUTCOME_DB", "state/ai_outcomes.sqlite3"))
+
+
+def _parse_budget(value: str) -> Optional[float]:
+    """Seconds from BINGSOONI_AI_BUDGET; unset or malformed means no hedging"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        print(f"⚠️  Ignoring BINGSOONI_AI_BUDGET={value!r} (expected seconds), hedging disabled")
+        return None
+
+
+# Seconds the LLM gets per hedged stage
+DEFAULT_BUDGET = _parse_budget(os.getenv("BINGSOONI_AI_BUDGET", ""))
+
+DAY = 86400.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outcomes (
+    ts          REAL NOT NULL,
+    stage       TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    latency     REAL NOT NULL,
+    llm_latency REAL,
+    llm_items   INTEGER NOT NULL,
+    local_items INTEGER NOT NULL,
+    budget      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outcomes_ts ON outcomes (ts);
+"""
+
+
+def _drain(produce: Callable[[], Iterable[str]], want: int, partial: List[str], cancel: threading.Event,
+           done: threading.Event, finished: List[float]):
+    """Worker: move LLM items into partial until the source ends, want is reached or the caller gives up"""
+    items = None
+    try:
+        items = produce()
+        for item in items:
+            if cancel.is_set():
+                break
+            partial.append(item)
+            if len(partial) >= want:
+                break
+    except Exception as e:
+        print(f"⚠️  LLM side of hedged generation failed: {e}")
+    finally:
+        close = getattr(items, "close", None)
+        if close is not None:
+            close()  # cancels a streaming request
+        finished.append(time.monotonic())
+        done.set()
+
+
+def run_hedged(produce: Callable[[], Iterable[str]], local: Callable[[], List[str]], want: int,
+               budget: float, accept: Optional[Callable[[str], bool]] = None,
+               stage: str = "hooks") -> Tuple[List[str], Dict]:
+    """Up to `want` items: LLM items that arrived within budget seconds first, then local ones.
+
+    produce() is called on a daemon thread and may return a list or a generator; local() runs in
+    the calling thread meanwhile. accept() (e.g. a near-duplicate check) screens the merged items.
+    Returns (items, outcome) where outcome["source"] is "llm", "local" or "mixed".
+    """
+    started = time.monotonic()
+    partial: List[str] = []
+    cancel, done = threading.Event(), threading.Event()
+    finished: List[float] = []
+    worker = threading.Thread(target=_drain, args=(produce, want, partial, cancel, done, finished),
+                              name=f"hedge-{stage}", daemon=True)
+    worker.start()
+
+    local_items = local()
+    done.wait(max(0.0, budget - (time.monotonic() - started)))
+    cancel.set()
+    llm_items = list(partial)
+
+    merged, from_llm = [], 0
+    for item in llm_items:
+        if len(merged) >= want:
+            break
+        if accept is None or accept(item):
+            merged.append(item)
+            from_llm += 1
+    for item in local_items:
+        if len(merged) >= want:
+            break
+        if item not in merged and (accept is None or accept(item)):
+            merged.append(item)
+
+    from_local = len(merged) - from_llm
+    outcome = {
+        "stage": stage,
+        "source": "local" if not from_llm else "llm" if not from_local else "mixed",
+        "latency": time.monotonic() - started,
+        "llm_latency": finished[0] - started if finished else None,  # None: still running at the deadline
+        "llm_items": from_llm,
+        "local_items": from_local,
+        "budget": budget,
+    }
+    return merged, outcome
+
+
+def record_outcome(outcome: Dict, log: Optional["OutcomeLog"] = None):
+    """Print a one-line summary of a hedged stage and append it to the outcome log"""
+    llm = "timed out" if outcome["llm_latency"] is None else f"LLM {outcome['llm_latency']:.2f}s"
+    print(f"⏱️  AI {outcome['stage']}: {outcome['source']} in {outcome['latency']:.2f}s "
+          f"({llm}, budget {outcome['budget']:g}s)")
+    (log or OUTCOME_LOG).record(outcome)
+
+
+class OutcomeLog:
+    """Hedged stage outcomes in SQLite (WAL); recording is best-effort like the trend history"""
+
+    def __init__(self, path: Path = OUTCOME_PATH, enabled: bool = True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def record(self, outcome: Dict, ts: Optional[float] = None):
+        if not self.enabled:
+            return
+        row = (time.time() if ts is None else ts, outcome["stage"], outcome["source"], outcome["latency"],
+               outcome["llm_latency"], outcome["llm_items"], outcome["local_items"], outcome["budget"])
+        try:
+            with self._conn() as conn:
+                conn.execute("INSERT INTO outcomes (ts, stage, source, latency, llm_latency, llm_items, "
+                             "local_items, budget) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not record {outcome['stage']} outcome: {e}")
+
+    def summary(self, days: float = 7, now: Optional[float] = None) -> List[Tuple[str, str, int, float, float]]:
+        """(stage, source, runs, mean latency, max latency) over the last `days` days"""
+        if not self.enabled or not self.path.exists():
+            return []
+        now = time.time() if now is None else now
+        return self._conn().execute(
+            """SELECT stage, source, COUNT(*), AVG(latency), MAX(latency) FROM outcomes
+               WHERE ts >= ? GROUP BY stage, source ORDER BY stage, source""",
+            (now - days * DAY,)).fetchall()
+
+
+OUTCOME_LOG = OutcomeLog(enabled=os.getenv("BINGSOONI_NO_HISTORY", "") == "")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Summarize how hedged AI generation stages ended")
+    ap.add_argument("--days", type=float, default=7)
+    args = ap.parse_args()
+
+    rows = OUTCOME_LOG.summary(args.days)
+    if not rows:
+        print("No hedged generation recorded")
+        return
+    for stage, source, runs, mean, worst in rows:
+        print(f"{stage:<9} {source:<6} {runs:>5} runs  mean {mean:.2f}s  max {worst:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Content-addressed cache for LLM completions: keyed by a hash of (model, messages, sampling parameters),
+persisted in SQLite with TTL expiry, LRU eviction and optional rotation through N sampled responses
+
+Usage:
+    python -m bingsooni.generators.llm_cache stats
+    python -m bingsooni.generators.llm_cache clear
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+CACHE_PATH = Path(os.getenv("BINGSOONI_LLM_CACHE", "state/llm_cache.sqlite3"))
+
+# Responses older than this are discarded (prompts embed trending keywords, which go stale)
+DEFAULT_TTL = float(os.getenv("BINGSOONI_LLM_CACHE_TTL", 7 * 86400))
+# Keys kept before the least recently used ones are evicted
+DEFAULT_MAX_KEYS = 2000
+# Distinct responses collected per key; once full, lookups rotate through them. The default of 1
+# answers repeats deterministically; BINGSOONI_LLM_CACHE_SAMPLES=3 keeps repeated runs varied
+DEFAULT_SAMPLES = int(os.getenv("BINGSOONI_LLM_CACHE_SAMPLES", 1))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keys (
+    key         TEXT PRIMARY KEY,
+    last_used   REAL NOT NULL,
+    next_sample INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS samples (
+    key        TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    response   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_key ON samples (key, created_at);
+CREATE INDEX IF NOT EXISTS keys_last_used ON keys (last_used);
+"""
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Stable hash of a completion request (model, messages, temperature and any other parameters)"""
+    canonical = json.dumps(request, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Completion texts keyed by request hash.
+
+    By default the first response is replayed for every repeat. With samples > 1 a key collects
+    that many responses (each miss calls the model once more) and lookups then rotate through them. Expired samples are
+    dropped on access and the least recently used keys are evicted beyond max_keys.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, ttl: float = DEFAULT_TTL, max_keys: int = DEFAULT_MAX_KEYS,
+                 samples: int = DEFAULT_SAMPLES, enabled: bool = True):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self.samples = max(1, samples)
+        self.enabled = enabled
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, key: str, samples: Optional[int] = None) -> Optional[str]:
+        """Next cached response for key, or None when the key still needs another sample"""
+        samples = self.samples if samples is None else max(1, samples)
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM samples WHERE key = ? AND created_at < ?", (key, now - self.ttl))
+            rows = conn.execute("SELECT response FROM samples WHERE key = ? ORDER BY created_at, rowid",
+                                (key,)).fetchall()
+            row = conn.execute("SELECT next_sample FROM keys WHERE key = ?", (key,)).fetchone()
+            if len(rows) < samples:
+                return None
+            idx = (row[0] if row else 0) % len(rows)
+            conn.execute("INSERT INTO keys (key, last_used, next_sample) VALUES (?, ?, ?) "
+                         "ON CONFLICT(key) DO UPDATE SET last_used = excluded.last_used, "
+                         "next_sample = excluded.next_sample", (key, now, idx + 1))
+            return rows[idx][0]
+
+    def store(self, key: str, response: str):
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("INSERT INTO samples (key, created_at, response) VALUES (?, ?, ?)", (key, now, response))
+            conn.execute("INSERT INTO keys (key, last_used) VALUES (?, ?) "
+                         "ON CONFLICT(key) DO UPDATE SET last_used = excluded.last_used", (key, now))
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        (n,) = conn.execute("SELECT COUNT(*) FROM keys").fetchone()
+        if n <= self.max_keys:
+            return
+        victims = [r[0] for r in conn.execute("SELECT key FROM keys ORDER BY last_used LIMIT ?", (n - self.max_keys,))]
+        conn.executemany("DELETE FROM samples WHERE key = ?", [(k,) for k in victims])
+        conn.executemany("DELETE FROM keys WHERE key = ?", [(k,) for k in victims])
+
+    def cached(self, request: Dict[str, Any], samples: Optional[int] = None) -> Optional[str]:
+        """Next cached response for request; None when it needs a fresh sample or the cache is off/unavailable"""
+        if not self.enabled:
+            return None
+        try:
+            return self.lookup(request_key(request), samples)
+        except sqlite3.Error as e:
+            print(f"⚠️  LLM cache unavailable: {e}")
+            return None
+
+    def remember(self, request: Dict[str, Any], response: str):
+        """Store a complete response for request (best effort)"""
+        if not self.enabled or not response:
+            return
+        try:
+            self.store(request_key(request), response)
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not cache LLM response: {e}")
+
+    def get_or_create(self, request: Dict[str, Any], create: Callable[[], str],
+                      samples: Optional[int] = None) -> str:
+        """Cached response for request, calling create() (and caching its result) while samples are missing"""
+        cached = self.cached(request, samples)
+        if cached is not None:
+            return cached
+        response = create()
+        self.remember(request, response)
+        return response
+
+    async def get_or_create_async(self, request: Dict[str, Any], create: Callable[[], Awaitable[str]],
+                                  samples: Optional[int] = None) -> str:
+        """get_or_create() for coroutine producers; the blocking SQLite calls run on worker threads"""
+        cached = await asyncio.to_thread(self.cached, request, samples)
+        if cached is not None:
+            return cached
+        response = await create()
+        await asyncio.to_thread(self.remember, request, response)
+        return response
+
+    def stats(self) -> Dict[str, float]:
+        conn = self._conn()
+        (keys,) = conn.execute("SELECT COUNT(*) FROM keys").fetchone()
+        (samples,) = conn.execute("SELECT COUNT(*) FROM samples").fetchone()
+        return {"keys": keys, "samples": samples, "ttl": self.ttl, "max_keys": self.max_keys}
+
+    def clear(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM samples")
+            conn.execute("DELETE FROM keys")
+
+
+LLM_CACHE = LLMResponseCache(enabled=os.getenv("BINGSOONI_NO_LLM_CACHE", "") == "")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspect or clear the LLM response cache")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="Show cache size")
+    sub.add_parser("clear", help="Delete every cached response")
+    args = ap.parse_args()
+
+    if args.cmd == "stats":
+        s = LLM_CACHE.stats()
+        print(f"{s['keys']} keys, {s['samples']} responses (ttl {s['ttl'] / 3600:.0f}h, max {s['max_keys']} keys) "
+              f"in {LLM_CACHE.path}")
+    else:
+        LLM_CACHE.clear()
+        print("🧹 LLM cache cleared")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Combinatorial hook spaces: templates × slot options compiled into valid blocks, sampled lazily without replacement
+"""
+from __future__ import annotations
+
+import bisect
+import hashlib
+import itertools
+import random
+from string import Formatter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .matching import TermMatcher
+
+
+def _wc(s: str) -> int:
+    return len(s.split())
+
+
+class HookTemplate:
+    """A str.format pattern plus the options available for each of its named slots.
+
+    fallback_suffix is appended only to fills whose word count is out of range without it
+    (e.g. " | 저장 필수" pads short template hooks up to the minimum length).
+    """
+
+    def __init__(self, pattern: str, slots: Dict[str, Sequence[str]], fallback_suffix: Optional[str] = None):
+        self.pattern = pattern
+        self.fields: List[str] = []
+        literals: List[str] = []
+        for literal, field, _, _ in Formatter().parse(pattern):
+            literals.append(literal)
+            if field is not None and field not in self.fields:
+                self.fields.append(field)
+        missing = [f for f in self.fields if f not in slots]
+        if missing:
+            raise KeyError(f"no options for slot(s) {missing} in {pattern!r}")
+        self.literal_text = " ".join(literals)
+        self.slots = {f: list(slots[f]) for f in self.fields}
+        self.occurrences = {f: sum(1 for _, fld, _, _ in Formatter().parse(pattern) if fld == f) for f in self.fields}
+        # Word count with every slot rendered as a single token
+        self.base_words = _wc(pattern.format(**{f: "X" for f in self.fields}))
+        self.fallback_suffix = fallback_suffix
+
+    def render(self, values: Dict[str, str], suffix: str = "") -> str:
+        return " ".join(f"{self.pattern.format(**values)}{suffix}".split())
+
+
+class _Block:
+    """A rectangular region of one template: one option group per slot, fixed suffix"""
+
+    __slots__ = ("template", "groups", "suffix", "size")
+
+    def __init__(self, template: HookTemplate, groups: List[List[str]], suffix: str):
+        self.template = template
+        self.groups = groups
+        self.suffix = suffix
+        size = 1
+        for g in groups:
+            size *= len(g)
+        self.size = size
+
+    def render(self, offset: int) -> str:
+        values = {}
+        for field, group in zip(reversed(self.template.fields), reversed(self.groups)):
+            offset, k = divmod(offset, len(group))
+            values[field] = group[k]
+        return self.template.render(values, self.suffix)
+
+
+class _FeistelPermutation:
+    """Keyed bijection on range(n) so draws come out in shuffled order with O(1) memory"""
+
+    def __init__(self, n: int, rng: random.Random, rounds: int = 4):
+        self.n = n
+        bits = max(2, (n - 1).bit_length())
+        bits += bits % 2
+        self.half = bits // 2
+        self.mask = (1 << self.half) - 1
+        self.keys = [rng.getrandbits(64).to_bytes(8, "little") for _ in range(rounds)]
+
+    def _round(self, value: int, key: bytes) -> int:
+        digest = hashlib.blake2b(value.to_bytes(8, "little"), key=key, digest_size=8).digest()
+        return int.from_bytes(digest, "little") & self.mask
+
+    def _encrypt(self, x: int) -> int:
+        left, right = x >> self.half, x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self.half) | right
+
+    def __call__(self, i: int) -> int:
+        # Cycle-walk until the image lands back inside range(n)
+        x = self._encrypt(i)
+        while x >= self.n:
+            x = self._encrypt(x)
+        return x
+
+
+class HookSpace:
+    """All valid fills of a set of templates, indexable and lazily shuffled.
+
+    Compilation drops slot options (and whole templates) containing a stopword and groups the
+    remaining options by word count, so every block in the space already satisfies the word-count
+    range. ``size`` is therefore the exact number of valid hooks; only stopwords that span a slot
+    boundary are left to the caller's final check.
+    """
+
+    def __init__(self, templates: Sequence[HookTemplate], min_words: int, max_words: int,
+                 matcher: Optional[TermMatcher] = None):
+        self.min_words = min_words
+        self.max_words = max_words
+        self._blocks: List[_Block] = []
+        for tpl in templates:
+            self._blocks.extend(self._compile(tpl, matcher))
+        self._offsets: List[int] = []
+        total = 0
+        for block in self._blocks:
+            self._offsets.append(total)
+            total += block.size
+        self.size = total
+
+    def _compile(self, tpl: HookTemplate, matcher: Optional[TermMatcher]) -> List[_Block]:
+        if matcher and matcher.search(tpl.literal_text) is not None:
+            return []
+        # Per slot: extra words contributed → options contributing that many
+        by_extra: List[List[Tuple[int, List[str]]]] = []
+        for field in tpl.fields:
+            groups: Dict[int, List[str]] = {}
+            seen = set()
+            for opt in tpl.slots[field]:
+                opt = " ".join(opt.split())
+                if not opt or opt in seen:
+                    continue
+                if matcher and matcher.search(opt) is not None:
+                    continue
+                seen.add(opt)
+                groups.setdefault((_wc(opt) - 1) * tpl.occurrences[field], []).append(opt)
+            if not groups:
+                return []
+            by_extra.append(sorted(groups.items()))
+
+        suffix_words = _wc(tpl.fallback_suffix) if tpl.fallback_suffix else None
+        blocks = []
+        for combo in itertools.product(*by_extra):
+            words = tpl.base_words + sum(extra for extra, _ in combo)
+            groups = [opts for _, opts in combo]
+            if self.min_words <= words <= self.max_words:
+                blocks.append(_Block(tpl, groups, ""))
+            elif suffix_words is not None and self.min_words <= words + suffix_words <= self.max_words:
+                blocks.append(_Block(tpl, groups, tpl.fallback_suffix))
+        return blocks
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        b = bisect.bisect_right(self._offsets, i) - 1
+        return self._blocks[b].render(i - self._offsets[b])
+
+    def iter_shuffled(self, rng: Optional[random.Random] = None) -> Iterator[str]:
+        """Yield every valid hook exactly once, in random order, one O(1) draw per hook"""
+        if not self.size:
+            return
+        perm = _FeistelPermutation(self.size, rng or random.Random())
+        for i in range(self.size):
+            yield self[perm(i)]
@@ -0,0 +1,137 @@
+"""
+Background refresh of the hashtag catalog from Instagram trends
+
+Requests keep serving the catalog they already have while at most one refresh runs (single flight
+within the process via a lock, across processes via a claimed row in the rotation state store).
+The updater replaces the catalog file atomically and the new version is parsed off the request
+path before being swapped into the shared catalog registry. The update time is only recorded once
+an update succeeds, and a claim left behind by a crashed or killed refresh expires after an hour.
+
+The update rewrites data/hashtags.csv, so only the scheduler entry point runs it by default;
+BINGSOONI_AUTO_REFRESH=1 lets hashtag requests start it in the background when it is due.
+
+Scheduler entry point (e.g. cron at 09:00):
+    python -m bingsooni.managers.catalog_refresh [--force]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from .hashtag_catalog import get_catalog
+from .state_store import STATE_DB_PATH, RotationStateStore, get_state_store
+
+DATA_PATH = Path("data/hashtags.csv")
+
+# Meta key holding when the daily Instagram trend update last succeeded
+DAILY_UPDATE_KEY = "instagram_daily_update"
+DAILY_UPDATE_INTERVAL = 86400
+# A daily scheduler fires a little early or late; an update this close to a day old is due
+DAILY_UPDATE_SLACK = 3600
+# Meta key claimed while an update runs ("idle" otherwise); older claims belong to dead workers
+RUNNING_KEY = "instagram_daily_update_running"
+RUNNING_IDLE = "idle"
+CLAIM_TIMEOUT = 3600
+
+# Opt-in: hashtag requests start a due refresh themselves
+AUTO_REFRESH = os.getenv("BINGSOONI_AUTO_REFRESH", "") == "1"
+
+_LOCK = threading.Lock()
+_START_LOCK = threading.Lock()
+_THREAD: Optional[threading.Thread] = None
+
+
+def _run_update(data_path: Path) -> bool:
+    try:
+        from ..fetchers.instagram_hashtag_updater import InstagramHashtagUpdater
+    except ImportError as e:
+        print(f"📱 Instagram updater not available ({e})")
+        return False
+    InstagramHashtagUpdater().run_daily_update(data_path=data_path)
+    get_catalog(data_path)  # parse the new version here, not in the next request
+    return True
+
+
+def _claim(store: RotationStateStore) -> Optional[str]:
+    """Claim the running row for this worker; the claim token, or None if a live worker holds it"""
+    token = f"{os.getpid()}:{threading.get_ident()}:{time.time()}"
+    claim = store.get_meta(RUNNING_KEY)
+    if claim is None:
+        return token if store.claim_meta(RUNNING_KEY, None, token) else None
+    value, claimed_at = claim
+    if value != RUNNING_IDLE and time.time() - claimed_at < CLAIM_TIMEOUT:
+        return None
+    return token if store.claim_meta(RUNNING_KEY, value, token) else None
+
+
+def refresh_catalog(data_path: Path = DATA_PATH, store: Optional[RotationStateStore] = None,
+                    force: bool = False) -> bool:
+    """Run the daily update now if it is due (or forced) and nobody else is running it; True if it ran"""
+    store = store or get_state_store(STATE_DB_PATH)
+    if not _LOCK.acquire(blocking=False):
+        return False
+    try:
+        if not force and not is_due(store):
+            return False
+        token = _claim(store)
+        if token is None:
+            return False  # another worker is running this refresh
+        try:
+            if not force and not is_due(store):
+                return False  # finished by another worker since the check above
+            print("🔄 Running daily hashtag trend update...")
+            try:
+                ok = _run_update(Path(data_path))
+            except Exception as e:
+                print(f"⚠️  Hashtag trend update failed: {e}")
+                return False
+            if ok:
+                store.set_meta(DAILY_UPDATE_KEY, datetime.datetime.now().isoformat())
+            return ok
+        finally:
+            store.claim_meta(RUNNING_KEY, token, RUNNING_IDLE)
+    finally:
+        _LOCK.release()
+
+
+def refresh_in_background(data_path: Path = DATA_PATH,
+                          store: Optional[RotationStateStore] = None) -> Optional[threading.Thread]:
+    """Start refresh_catalog() on a background thread unless one is already running.
+
+    The thread is not a daemon, so the interpreter waits for a running update before exiting
+    instead of killing it halfway.
+    """
+    global _THREAD
+    with _START_LOCK:
+        if _THREAD is not None and _THREAD.is_alive():
+            return None
+        _THREAD = threading.Thread(target=refresh_catalog, args=(data_path, store),
+                                   name="catalog-refresh")
+        _THREAD.start()
+        return _THREAD
+
+
+def is_due(store: RotationStateStore) -> bool:
+    """No successful update yet, or the last one is (nearly) a day old"""
+    last = store.get_meta(DAILY_UPDATE_KEY)
+    return last is None or time.time() - last[1] >= DAILY_UPDATE_INTERVAL - DAILY_UPDATE_SLACK
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Refresh the hashtag catalog from Instagram trends")
+    ap.add_argument("--data", type=Path, default=DATA_PATH)
+    ap.add_argument("--force", action="store_true", help="Run even if the last update is less than a day old")
+    args = ap.parse_args()
+    if refresh_catalog(args.data, force=args.force):
+        print(f"✅ Catalog refreshed ({len(get_catalog(args.data))} hashtags)")
+    else:
+        print("⏭️  Catalog refresh not due or already running")
+
+
+if __name__ == "__main__":
+    main()
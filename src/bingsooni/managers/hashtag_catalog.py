@@ -0,0 +1,223 @@
+"""
+Shared hashtag catalog: each hashtag file is parsed once into interned, tier-partitioned tuples and
+reloaded only when the file actually changes
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..matching import SubstringIndex
+
+TIERS = ("broad", "mid", "niche", "local")
+
+# Parsed JSON snapshots skip CSV parsing on cold start; opt in with BINGSOONI_CATALOG_SNAPSHOT=1
+SNAPSHOT_DIR = Path("state/catalog_cache")
+USE_SNAPSHOTS = os.getenv("BINGSOONI_CATALOG_SNAPSHOT", "") == "1"
+
+
+class HashtagEntry(NamedTuple):
+    tag: str
+    tier: str
+    category: Optional[str] = None
+    relevance_score: Optional[float] = None
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha1()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def parse_hashtag_rows(rows: Iterable[dict]) -> List[HashtagEntry]:
+    """Valid entries from csv rows (tag, tier[, category, relevance_score]); first row of a tag wins"""
+    entries, seen = [], set()
+    for row in rows:
+        tag = (row.get("tag") or "").strip()
+        tier = (row.get("tier") or "").strip().lower()
+        if tier not in TIERS or not tag.startswith("#") or tag in seen:
+            continue
+        seen.add(tag)
+        category = (row.get("category") or "").strip() or None
+        try:
+            relevance = float(row["relevance_score"]) if row.get("relevance_score") else None
+        except ValueError:
+            relevance = None
+        entries.append(HashtagEntry(sys.intern(tag), sys.intern(tier),
+                                    sys.intern(category) if category else None, relevance))
+    return entries
+
+
+class HashtagCatalog:
+    """One hashtag file: tier partitions plus optional per-tag category and relevance score.
+
+    Identified by the file's content hash (version); stat() is checked on every lookup and the
+    file is only re-hashed when its mtime or size changed.
+    """
+
+    def __init__(self, path: Path, entries: List[HashtagEntry], version: str, stat: Tuple[int, int],
+                 fieldnames: Tuple[str, ...] = ("tag", "tier")):
+        self.path = Path(path)
+        self.version = version
+        self.stat = stat
+        self.fieldnames = fieldnames
+        self.entries: Tuple[HashtagEntry, ...] = tuple(entries)
+        self.tiers: Dict[str, Tuple[str, ...]] = {
+            tier: tuple(e.tag for e in self.entries if e.tier == tier) for tier in TIERS}
+        self._by_tag: Dict[str, HashtagEntry] = {e.tag: e for e in self.entries}
+
+    @classmethod
+    def read(cls, path: Path) -> "HashtagCatalog":
+        path = Path(path)
+        st = path.stat()
+        with path.open(encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            entries = parse_hashtag_rows(reader)
+            fieldnames = tuple(reader.fieldnames or ("tag", "tier"))
+        return cls(path, entries, _file_digest(path), (st.st_mtime_ns, st.st_size), fieldnames)
+
+    def state(self) -> Dict:
+        """Plain-data snapshot: file version and stat, csv header and entries"""
+        return {"version": self.version, "stat": list(self.stat), "fieldnames": list(self.fieldnames),
+                "entries": [list(e) for e in self.entries]}
+
+    @classmethod
+    def from_state(cls, path: Path, state: Dict) -> "HashtagCatalog":
+        """Rebuild a catalog from state(); ValueError if an entry is malformed"""
+        entries = []
+        for tag, tier, category, relevance in state["entries"]:
+            if not isinstance(tag, str) or tier not in TIERS:
+                raise ValueError(f"invalid catalog entry {tag!r}")
+            entries.append(HashtagEntry(sys.intern(tag), sys.intern(tier),
+                                        sys.intern(category) if category else None,
+                                        None if relevance is None else float(relevance)))
+        mtime_ns, size = state["stat"]
+        return cls(path, entries, str(state["version"]), (int(mtime_ns), int(size)), tuple(state["fieldnames"]))
+
+    @property
+    def has_metadata(self) -> bool:
+        return "category" in self.fieldnames or "relevance_score" in self.fieldnames
+
+    def tier_lists(self) -> Dict[str, List[str]]:
+        """Fresh per-tier lists (callers extend them with generated tags)"""
+        return {tier: list(tags) for tier, tags in self.tiers.items()}
+
+    @cached_property
+    def match_index(self) -> SubstringIndex:
+        """Case-insensitive substring index over every tag, built once per catalog version"""
+        return SubstringIndex((e.tag for e in self.entries), ignore_case=True)
+
+    def keyword_hits(self, keywords: Sequence[str]) -> Dict[str, List[str]]:
+        """Tier → tags containing any keyword, in tier order (most relevant first when scored)"""
+        hits: Dict[str, List[str]] = {tier: [] for tier in TIERS}
+        ids = self.match_index.search_any(keywords)
+        if self.has_metadata:
+            ids.sort(key=lambda i: -self.relevance(self.entries[i].tag))
+        for i in ids:
+            entry = self.entries[i]
+            hits[entry.tier].append(entry.tag)
+        return hits
+
+    def get(self, tag: str) -> Optional[HashtagEntry]:
+        return self._by_tag.get(tag)
+
+    def category(self, tag: str) -> Optional[str]:
+        entry = self._by_tag.get(tag)
+        return entry.category if entry else None
+
+    def relevance(self, tag: str, default: float = 0.0) -> float:
+        entry = self._by_tag.get(tag)
+        if entry is None or entry.relevance_score is None:
+            return default
+        return entry.relevance_score
+
+    def by_category(self, category: str) -> List[str]:
+        return [e.tag for e in self.entries if e.category == category]
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self._by_tag
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def is_current(self) -> bool:
+        """False once the file's content differs from what was loaded"""
+        try:
+            st = self.path.stat()
+        except OSError:
+            return False
+        if (st.st_mtime_ns, st.st_size) == self.stat:
+            return True
+        if _file_digest(self.path) == self.version:
+            self.stat = (st.st_mtime_ns, st.st_size)  # touched but unchanged
+            return True
+        return False
+
+
+def _snapshot_path(path: Path) -> Path:
+    key = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return SNAPSHOT_DIR / f"{path.stem}-{key}.json"
+
+
+def _load_snapshot(path: Path) -> Optional[HashtagCatalog]:
+    """Snapshot of the file's current version, or None (missing, stale or unreadable: rebuild from the csv)"""
+    try:
+        st = path.stat()
+        state = json.loads(_snapshot_path(path).read_text(encoding="utf-8"))
+        catalog = HashtagCatalog.from_state(path, state)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if catalog.stat != (st.st_mtime_ns, st.st_size):
+        return None
+    return catalog
+
+
+def _save_snapshot(catalog: HashtagCatalog):
+    target = _snapshot_path(catalog.path)
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(catalog.state(), f, ensure_ascii=False)
+        os.replace(tmp, target)
+    except OSError as e:
+        print(f"⚠️  Could not write catalog snapshot: {e}")
+
+
+_CATALOGS: Dict[Path, HashtagCatalog] = {}
+_LOCK = threading.Lock()
+
+
+def get_catalog(path: Path, snapshot: bool = USE_SNAPSHOTS) -> HashtagCatalog:
+    """Catalog for a hashtag file, shared process-wide and reloaded only when the file changes"""
+    path = Path(path)
+    with _LOCK:
+        catalog = _CATALOGS.get(path)
+        if catalog is not None and catalog.is_current():
+            return catalog
+        catalog = _load_snapshot(path) if snapshot else None
+        if catalog is None:
+            catalog = HashtagCatalog.read(path)
+            if snapshot:
+                _save_snapshot(catalog)
+        _CATALOGS[path] = catalog
+        return catalog
+
+
+def invalidate_catalog(path: Optional[Path] = None):
+    """Forget one loaded catalog (or all of them); the next get_catalog() re-reads the file"""
+    with _LOCK:
+        if path is None:
+            _CATALOGS.clear()
+        else:
+            _CATALOGS.pop(Path(path), None)
@@ -0,0 +1,155 @@
+"""
+Hashtag relevance engine: inverted index over a hashtag catalog, batched hook × tag scoring
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from ..matching import TermMatcher
+
+# Core hashtags that should always be included
+CORE_TAGS = ["#카페추천", "#travel", "#foodie", "#instafood", "#reels"]
+
+# Concept → (words that trigger it in a hook, terms that mark a tag as belonging to it)
+CONCEPTS: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = [
+    # Location-based selection
+    (("연남",), ("연남", "yeonnam")),
+    (("성수",), ("성수", "seongsu")),
+    (("서울",), ("서울", "seoul")),
+    # Content-based selection
+    (("빙수",), ("빙수",)),
+    (("카페",), ("카페",)),
+    (("맛집",), ("맛집",)),
+    # Experience-based selection
+    (("후기", "리뷰", "체험"), ("후기", "review", "체험")),
+    (("가성비", "돈", "예산"), ("budget", "가성비")),
+    (("숨은", "숨겨진", "비밀"), ("hidden", "숨은")),
+]
+
+CONCEPT_WEIGHT = 1.0
+NGRAM_WEIGHT = 0.1
+# Bigrams present in more than this share of the catalog carry no ranking signal and are not indexed
+NGRAM_MAX_DF = 0.2
+
+_NON_WORD_RE = re.compile(r"[\s\W_]+")
+
+
+def _ngrams(text: str, n: int = 2) -> set:
+    compact = _NON_WORD_RE.sub("", text.casefold())
+    if len(compact) <= n:
+        return {compact} if compact else set()
+    return {compact[i:i + n] for i in range(len(compact) - n + 1)}
+
+
+def _terms_to_concepts(pairs: Iterable[Tuple[int, Tuple[str, ...]]]) -> Tuple[TermMatcher, Dict[str, List[int]]]:
+    """One automaton over every term, plus term → concept ids (a term can belong to several concepts)"""
+    owners: Dict[str, List[int]] = defaultdict(list)
+    for cid, terms in pairs:
+        for term in terms:
+            owners[term.casefold()].append(cid)
+    return TermMatcher(owners, ignore_case=True), owners
+
+
+class HashtagRelevanceEngine:
+    """Scores hooks against a hashtag catalog through an inverted index built once per catalog.
+
+    Tags are indexed by concept (via one automaton over all concept terms) and by character
+    bigrams. Scoring a batch of hooks is a sparse (hooks × features) · (features × tags) product
+    walked feature by feature, so cost scales with the number of matching postings rather than
+    with catalog size.
+    """
+
+    def __init__(self, hashtags: Sequence[str], concepts=CONCEPTS, core_tags: Sequence[str] = CORE_TAGS):
+        self.tags: List[str] = list(dict.fromkeys(hashtags))
+        self._pos = {t: i for i, t in enumerate(self.tags)}
+        self.core = [self._pos[t] for t in core_tags if t in self._pos]
+
+        self._hook_matcher, self._hook_owners = _terms_to_concepts(
+            (cid, triggers) for cid, (triggers, _) in enumerate(concepts))
+        tag_matcher, tag_owners = _terms_to_concepts(
+            (cid, markers) for cid, (_, markers) in enumerate(concepts))
+
+        postings: Dict[Tuple[str, object], List[int]] = defaultdict(list)
+        for idx, tag in enumerate(self.tags):
+            for cid in sorted({c for term in tag_matcher.found(tag) for c in tag_owners[term.casefold()]}):
+                postings[("c", cid)].append(idx)
+            for gram in _ngrams(tag.lstrip("#")):
+                postings[("g", gram)].append(idx)
+        self._postings = dict(postings)
+
+        n = max(1, len(self.tags))
+        if n >= 100:
+            self._postings = {f: p for f, p in self._postings.items()
+                              if f[0] == "c" or len(p) <= NGRAM_MAX_DF * n}
+        self._weights = {}
+        for feature, plist in self._postings.items():
+            base = CONCEPT_WEIGHT if feature[0] == "c" else NGRAM_WEIGHT
+            self._weights[feature] = base * math.log(1 + n / len(plist))
+
+    def _hook_features(self, hook: str) -> set:
+        features = {("c", cid) for term in self._hook_matcher.found(hook)
+                    for cid in self._hook_owners[term.casefold()]}
+        features.update(("g", gram) for gram in _ngrams(hook))
+        return {f for f in features if f in self._postings}
+
+    def score(self, hooks: Sequence[str]) -> List[Dict[int, float]]:
+        """Sparse hook × tag score rows (tag index → score) for a batch of hooks"""
+        # Hooks with identical feature sets share one row
+        row_of: Dict[frozenset, int] = {}
+        hook_rows: List[int] = []
+        by_feature: Dict[Tuple[str, object], List[int]] = defaultdict(list)
+        for hook in hooks:
+            features = frozenset(self._hook_features(hook))
+            if features not in row_of:
+                row_of[features] = len(row_of)
+                for feature in features:
+                    by_feature[feature].append(row_of[features])
+            hook_rows.append(row_of[features])
+        rows: List[Dict[int, float]] = [defaultdict(float) for _ in row_of]
+        for feature, row_ids in by_feature.items():
+            w = self._weights[feature]
+            plist = self._postings[feature]
+            for r in row_ids:
+                row = rows[r]
+                for t in plist:
+                    row[t] += w
+        return [rows[r] for r in hook_rows]
+
+    def rank(self, hooks: Sequence[str], top_k: int = 20) -> List[List[str]]:
+        """Top-k tags per hook: core tags, then by relevance, then catalog order to fill remaining slots"""
+        ranked = []
+        for row in self.score(hooks):
+            chosen = list(self.core)
+            seen = set(chosen)
+            best = heapq.nsmallest(top_k + len(chosen), row.items(), key=lambda x: (-x[1], x[0]))
+            for t, _ in best:
+                if len(chosen) >= top_k:
+                    break
+                if t not in seen:
+                    chosen.append(t); seen.add(t)
+            for t in range(len(self.tags)):
+                if len(chosen) >= top_k:
+                    break
+                if t not in seen:
+                    chosen.append(t); seen.add(t)
+            ranked.append([self.tags[t] for t in chosen[:top_k]])
+        return ranked
+
+    def with_core(self, tags: Sequence[str], top_k: int = 20) -> List[str]:
+        """Core tags followed by tags chosen elsewhere (e.g. per-hook tags from the LLM), as rank() would order them"""
+        return list(dict.fromkeys([self.tags[t] for t in self.core] + list(tags)))[:top_k]
+
+
+@lru_cache(maxsize=8)
+def _cached_engine(hashtags: Tuple[str, ...]) -> HashtagRelevanceEngine:
+    return HashtagRelevanceEngine(hashtags)
+
+
+def get_relevance_engine(hashtags: Sequence[str]) -> HashtagRelevanceEngine:
+    """Engine for this catalog, built once and reused while the catalog is unchanged"""
+    return _cached_engine(tuple(hashtags))
@@ -1,43 +1,23 @@
 from __future__ import annotations
-import csv, json, re
+import re
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
-STATE_PATH = Path("state/rotation.json")
-DATA_PATH = Path("data/hashtags.csv")
+from ..generators.hedge import record_outcome, run_hedged
+from ..matching import TermMatcher
+from .catalog_refresh import AUTO_REFRESH, is_due, refresh_in_background
+from .hashtag_catalog import get_catalog
+from .state_store import DEFAULT_NAMESPACE, STATE_DB_PATH, get_state_store
 
-def _load_hashtags() -> Dict[str, List[str]]:
-    tiers = {"broad": [], "mid": [], "niche": [], "local": []}
-    with DATA_PATH.open(encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            tag = row["tag"].strip()
-            tier = row["tier"].strip().lower()
-            if tier in tiers and tag and tag.startswith("#"):
-                tiers[tier].append(tag)
-    return tiers
+if TYPE_CHECKING:
+    from ..context import RunContext
 
-def _load_state() -> dict:
-    if not STATE_PATH.exists():
-        return {"broad": 0, "mid": 0, "niche": 0, "local": 0}
-    return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+STATE_PATH = STATE_DB_PATH
+DATA_PATH = Path("data/hashtags.csv")
 
-def _save_state(state: dict):
-    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    STATE_PATH.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
 
-def _rotate_pick(arr: List[str], start: int, count: int) -> Tuple[List[str], int]:
-    if not arr:
-        return [], start
-    out: List[str] = []
-    i = start % len(arr)
-    taken = 0
-    used = set()
-    while taken < min(count, len(arr)):
-        if arr[i] not in used:
-            out.append(arr[i]); used.add(arr[i]); taken += 1
-        i = (i + 1) % len(arr)
-    return out, i
+def _load_hashtags(data_path: Path = DATA_PATH) -> Dict[str, List[str]]:
+    return get_catalog(data_path).tier_lists()
 
 import random
 
@@ -180,49 +160,62 @@ def _generate_dynamic_hashtags(keywords: List[str]) -> List[str]:
     
     return dynamic_tags[:15]  # Return top 15 dynamic hashtags
 
-def _pick_for_keywords(tier_tags: List[str], want_n: int, keywords: List[str]) -> Tuple[List[str], int]:
-    if not keywords or not tier_tags:
+def _pick_for_keywords(catalog_hits: List[str], extra_tags: List[str], want_n: int,
+                       matcher: TermMatcher) -> Tuple[List[str], int]:
+    """Keyword matches from the catalog index, then from tags generated this run (not indexed)"""
+    if not matcher:
         return [], want_n
-    kw_re = re.compile("|".join(map(re.escape, keywords)), flags=re.IGNORECASE)
-    matched = [t for t in tier_tags if kw_re.search(t)]
-    seen = set(); matched_dedup = []
-    for t in matched:
-        if t not in seen:
-            matched_dedup.append(t); seen.add(t)
-    return matched_dedup[:want_n], max(0, want_n - len(matched_dedup))
+    matched = list(dict.fromkeys(catalog_hits + [t for t in extra_tags if matcher.search(t)]))
+    return matched[:want_n], max(0, want_n - len(matched))
 
-def get_hashtag_set(broad_n=7, mid_n=7, niche_n=6, local_n=5, keywords: List[str] | None=None, hooks: List[str] | None=None) -> Dict[str, List[str]]:
-    tiers = _load_hashtags()
-    state = _load_state()
+def get_hashtag_set(broad_n=7, mid_n=7, niche_n=6, local_n=5, keywords: List[str] | None=None, hooks: List[str] | None=None,
+                    data_path: Path = DATA_PATH, state_path: Path = STATE_PATH,
+                    ctx: "RunContext | None" = None, namespace: str = DEFAULT_NAMESPACE) -> Dict[str, List[str]]:
+    data_path = Path(data_path)
+    tiers = ctx.hashtag_tiers(data_path) if ctx else _load_hashtags(data_path)
+    state_path, legacy_path = Path(state_path), None
+    if state_path.suffix == ".json":
+        # Pre-store per-file rotation state: import it into the shared database next to it
+        state_path, legacy_path = state_path.with_name(STATE_DB_PATH.name), state_path
+    store = get_state_store(state_path)
+    store.migrate_json(namespace, legacy_path)
     keywords = keywords or []
     hooks = hooks or []
     picked = {"broad": [], "mid": [], "niche": [], "local": []}
     
-    # Check if we should update hashtags from Instagram trends
-    try:
-        from instagram_hashtag_updater import InstagramHashtagUpdater
-        updater = InstagramHashtagUpdater()
-        
-        # Check if we need daily update (if state file is old)
-        import datetime
-        if STATE_PATH.exists():
-            last_modified = datetime.datetime.fromtimestamp(STATE_PATH.stat().st_mtime)
-            if (datetime.datetime.now() - last_modified).days >= 1:
-                print("🔄 Running daily hashtag trend update...")
-                updater.run_daily_update()
-                # Reload hashtags after update
-                tiers = _load_hashtags()
-    except ImportError:
-        print("📱 Instagram updater not available")
+    # With BINGSOONI_AUTO_REFRESH=1 a due Instagram trend update runs in the background; this request
+    # keeps the catalog it loaded (the updater only maintains the default catalog)
+    if AUTO_REFRESH and data_path == DATA_PATH and is_due(store):
+        refresh_in_background(data_path, store)
     
     # Try to use AI generator for hashtags if available
     ai_hashtags = []
-    try:
-        from ai_generator import AIGenerator
-        ai_gen = AIGenerator()
-        ai_hashtags = ai_gen.generate_ai_hashtags(keywords, hooks, target_n=15)
+    ai_tiers = ctx.ai_content["tiers"] if ctx and ctx.ai_content else None
+    if ai_tiers:
+        # The combined hook generation already returned tiered hashtags
+        ai_gen = None
+        print(f"🤖 Using {sum(map(len, ai_tiers.values()))} AI hashtags from combined generation")
+    elif ctx:
+        ai_gen = ctx.ai
+    else:
+        try:
+            from ..generators.ai_generator import AIGenerator
+            ai_gen = AIGenerator()
+        except ImportError:
+            ai_gen = None
+    if ai_gen is not None:
+        if ctx and ctx.ai_budget is not None:
+            # Creative and dynamic hashtags below are the local side; the LLM only gets the budget
+            ai_hashtags, outcome = run_hedged(
+                lambda: ai_gen.generate_ai_hashtags(keywords, hooks, target_n=15, fallback=False,
+                                                    timeout=ctx.ai_budget),
+                list, 15, ctx.ai_budget, stage="hashtags")
+            ctx.ai_outcomes.append(outcome)
+            record_outcome(outcome)
+        else:
+            ai_hashtags = ai_gen.generate_ai_hashtags(keywords, hooks, target_n=15)
         print(f"🤖 Generated {len(ai_hashtags)} AI hashtags")
-    except ImportError:
+    elif not ai_tiers:
         print("💡 AI generator not available, using creative generation")
     
     # Generate truly creative hashtags based on keywords and hooks
@@ -235,19 +228,26 @@ def get_hashtag_set(broad_n=7, mid_n=7, niche_n=6, local_n=5, keywords: List[str
     all_generated = ai_hashtags + creative_hashtags + dynamic_hashtags
     
     # Add generated hashtags to appropriate tiers
-    tiers["broad"].extend(all_generated[:8])    # Add top 8 to broad
-    tiers["mid"].extend(all_generated[8:16])    # Add next 8 to mid  
-    tiers["niche"].extend(all_generated[16:24]) # Add next 8 to niche
-    tiers["local"].extend(all_generated[24:])   # Add remaining to local
-    
+    generated = {
+        "broad": all_generated[:8],    # Add top 8 to broad
+        "mid": all_generated[8:16],    # Add next 8 to mid
+        "niche": all_generated[16:24], # Add next 8 to niche
+        "local": all_generated[24:],   # Add remaining to local
+    }
+    if ai_tiers:
+        # Model-assigned tiers come first; locally generated tags fill in behind them
+        generated = {name: list(dict.fromkeys(ai_tiers.get(name, []) + tags)) for name, tags in generated.items()}
+    for name, tags in generated.items():
+        tiers[name].extend(tags)
+    
+    # Keyword matches come from the catalog's substring index (most relevant first in scored catalogs)
+    catalog_hits = get_catalog(data_path).keyword_hits(keywords)
+    matcher = TermMatcher(keywords, ignore_case=True)
     plan = [("broad", broad_n), ("mid", mid_n), ("niche", niche_n), ("local", local_n)]
     for name, need in plan:
-        kw_hits, remaining = _pick_for_keywords(tiers[name], need, keywords)
+        kw_hits, remaining = _pick_for_keywords(catalog_hits[name], generated[name], need, matcher)
         picked[name].extend(kw_hits)
-        remaining_pool = [t for t in tiers[name] if t not in picked[name]]
-        fill, state[name] = _rotate_pick(remaining_pool, state.get(name, 0), remaining)
-        picked[name].extend(fill)
-    _save_state(state)
+        picked[name].extend(store.rotate(namespace, name, tiers[name], remaining, exclude=set(kw_hits)))
     return picked
 
 def flatten_hashtags(picked: Dict[str, List[str]]) -> List[str]:
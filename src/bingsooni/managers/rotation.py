@@ -0,0 +1,87 @@
+"""
+Per-tier hashtag rotation: a deduplicated ring with a persistent cursor
+"""
+from __future__ import annotations
+
+from typing import Collection, Dict, Iterable, List, Optional
+
+
+class TierRotation:
+    """Cycles through a tier's tags so every tag is served once before any repeats.
+
+    take() walks the ring from the cursor and stops after at most one full turn, so it always
+    terminates even when the tier has fewer tags than requested. Tags added mid-cycle are placed
+    just behind the cursor: the tags still waiting in the current cycle keep their turn and the
+    newcomers are served at the end of it.
+    """
+
+    def __init__(self, tags: Iterable[str] = (), cursor: int = 0):
+        self._ring: List[str] = list(dict.fromkeys(tags))
+        self._members = set(self._ring)
+        self.cursor = cursor % len(self._ring) if self._ring else 0
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self._members
+
+    @property
+    def order(self) -> List[str]:
+        return list(self._ring)
+
+    def add(self, tags: Iterable[str]) -> int:
+        """Insert unseen tags behind the cursor (last in the current cycle); returns how many were new"""
+        new = [t for t in dict.fromkeys(tags) if t not in self._members]
+        if new:
+            self._ring[self.cursor:self.cursor] = new
+            self._members.update(new)
+            self.cursor = (self.cursor + len(new)) % len(self._ring)
+        return len(new)
+
+    def sync(self, tags: Iterable[str]) -> "TierRotation":
+        """Make the ring hold exactly tags: drop vanished ones, add new ones via add()"""
+        current = list(dict.fromkeys(tags))
+        keep = set(current)
+        if len(keep) != len(self._members) or not keep >= self._members:
+            ring, cursor = [], 0
+            for i, tag in enumerate(self._ring):
+                if tag in keep:
+                    ring.append(tag)
+                    if i < self.cursor:
+                        cursor += 1
+            self._ring, self._members = ring, set(ring)
+            self.cursor = cursor % len(ring) if ring else 0
+        self.add(current)
+        return self
+
+    def take(self, count: int, exclude: Collection[str] = ()) -> List[str]:
+        """Next `count` distinct tags from the cursor, skipping exclude; advances the cursor"""
+        ring = self._ring
+        n = len(ring)
+        out: List[str] = []
+        if not n or count <= 0:
+            return out
+        i = self.cursor
+        for _ in range(n):
+            tag = ring[i]
+            i = (i + 1) % n
+            if tag not in exclude:
+                out.append(tag)
+                if len(out) >= count:
+                    break
+        self.cursor = i
+        return out
+
+    def to_state(self) -> Dict:
+        return {"ring": list(self._ring), "cursor": self.cursor}
+
+    @classmethod
+    def from_state(cls, state, tags: Optional[Iterable[str]] = None) -> "TierRotation":
+        """Restore a saved rotation (or a legacy integer cursor) and sync it with the tier's tags"""
+        if isinstance(state, dict):
+            rotation = cls(state.get("ring", []), int(state.get("cursor", 0)))
+        else:
+            # Legacy rotation.json stored only an index into the tier list
+            rotation = cls(tags or (), int(state or 0))
+        return rotation.sync(tags) if tags is not None else rotation
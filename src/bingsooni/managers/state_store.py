@@ -0,0 +1,161 @@
+"""
+Transactional rotation state: per-campaign namespaces in SQLite (WAL) with compare-and-swap cursor updates
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+
+from .rotation import TierRotation
+
+STATE_DB_PATH = Path("state/rotation.sqlite3")
+DEFAULT_NAMESPACE = "default"
+
+# A CAS update that keeps losing to other writers gives up after this many attempts
+MAX_CAS_RETRIES = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rotation (
+    namespace TEXT NOT NULL,
+    tier      TEXT NOT NULL,
+    state     TEXT NOT NULL,
+    version   INTEGER NOT NULL,
+    PRIMARY KEY (namespace, tier)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key        TEXT PRIMARY KEY,
+    value      TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def legacy_state_path(namespace: str, state_dir: Path = STATE_DB_PATH.parent) -> Path:
+    """JSON file the namespace used before the store existed (rotation.json / rotation_<name>.json)"""
+    return state_dir / ("rotation.json" if namespace == DEFAULT_NAMESPACE else f"rotation_{namespace}.json")
+
+
+class CASConflict(RuntimeError):
+    """Raised when a rotation could not be committed within MAX_CAS_RETRIES attempts"""
+
+
+class RotationStateStore:
+    """Rotation rings and cursors keyed by (namespace, tier), plus small shared metadata.
+
+    Every row carries a version; writers read a row, compute the next state and commit it only if
+    the version is unchanged, retrying otherwise. Concurrent workers (threads or processes) sharing
+    a namespace therefore never lose each other's cursor updates.
+    """
+
+    def __init__(self, path: Path = STATE_DB_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    # -- rotation rows -------------------------------------------------------------------------
+
+    def load(self, namespace: str, tier: str) -> Tuple[Optional[object], int]:
+        """(saved rotation state or None, version; 0 when the row does not exist)"""
+        row = self._conn().execute("SELECT state, version FROM rotation WHERE namespace = ? AND tier = ?",
+                                   (namespace, tier)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else (None, 0)
+
+    def compare_and_swap(self, namespace: str, tier: str, expected_version: int, state: object) -> bool:
+        """Store state if the row is still at expected_version; False when another writer got there first"""
+        payload = json.dumps(state, ensure_ascii=False)
+        conn = self._conn()
+        if expected_version == 0:
+            cur = conn.execute("INSERT OR IGNORE INTO rotation (namespace, tier, state, version) VALUES (?, ?, ?, 1)",
+                               (namespace, tier, payload))
+        else:
+            cur = conn.execute("UPDATE rotation SET state = ?, version = version + 1 "
+                               "WHERE namespace = ? AND tier = ? AND version = ?",
+                               (payload, namespace, tier, expected_version))
+        return cur.rowcount == 1
+
+    def rotate(self, namespace: str, tier: str, tags: Iterable[str], count: int,
+               exclude: Collection[str] = ()) -> List[str]:
+        """Take the next `count` tags of a tier's rotation and commit the advanced cursor atomically"""
+        tags = list(tags)
+        for _ in range(MAX_CAS_RETRIES):
+            state, version = self.load(namespace, tier)
+            rotation = TierRotation.from_state(state, tags)
+            out = rotation.take(count, exclude)
+            if self.compare_and_swap(namespace, tier, version, rotation.to_state()):
+                return out
+        raise CASConflict(f"rotation {namespace}/{tier} kept changing under us")
+
+    def namespaces(self) -> List[str]:
+        return [r[0] for r in self._conn().execute("SELECT DISTINCT namespace FROM rotation ORDER BY namespace")]
+
+    def migrate_json(self, namespace: str, json_path: Optional[Path] = None) -> bool:
+        """Import a legacy rotation JSON file into an empty namespace; True if anything was imported"""
+        json_path = Path(json_path) if json_path else legacy_state_path(namespace, self.path.parent)
+        if not json_path.exists():
+            return False
+        if self._conn().execute("SELECT 1 FROM rotation WHERE namespace = ? LIMIT 1", (namespace,)).fetchone():
+            return False
+        try:
+            legacy = json.loads(json_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        for tier, state in legacy.items():
+            # Integer cursors from the oldest format are kept as-is; TierRotation.from_state reads both
+            self.compare_and_swap(namespace, tier, 0, state)
+        return True
+
+    # -- metadata ------------------------------------------------------------------------------
+
+    def get_meta(self, key: str) -> Optional[Tuple[str, float]]:
+        """(value, updated_at) or None"""
+        row = self._conn().execute("SELECT value, updated_at FROM meta WHERE key = ?", (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set_meta(self, key: str, value: str):
+        self._conn().execute("INSERT INTO meta (key, value, updated_at) VALUES (?, ?, ?) "
+                             "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                             (key, value, time.time()))
+
+    def claim_meta(self, key: str, expected: Optional[str], value: str) -> bool:
+        """Set key to value only if it still holds expected (None: key absent); one caller wins a race"""
+        conn = self._conn()
+        if expected is None:
+            cur = conn.execute("INSERT OR IGNORE INTO meta (key, value, updated_at) VALUES (?, ?, ?)",
+                               (key, value, time.time()))
+        else:
+            cur = conn.execute("UPDATE meta SET value = ?, updated_at = ? WHERE key = ? AND value = ?",
+                               (value, time.time(), key, expected))
+        return cur.rowcount == 1
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_STORES: Dict[Path, RotationStateStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_state_store(path: Path = STATE_DB_PATH) -> RotationStateStore:
+    """Process-wide store for a database path"""
+    path = Path(path)
+    with _STORES_LOCK:
+        if path not in _STORES:
+            _STORES[path] = RotationStateStore(path)
+        return _STORES[path]
@@ -0,0 +1,155 @@
+"""
+Compiled multi-pattern substring matching (Aho-Corasick) and a bigram substring index
+"""
+from __future__ import annotations
+
+from array import array
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+
+class TermMatcher:
+    """Aho-Corasick automaton that finds any of a fixed set of terms in one pass over the text"""
+
+    def __init__(self, terms: Iterable[str], ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self.terms: List[str] = []
+        self._lens: List[int] = []
+        # Node i: outgoing edges, failure link, index of terms ending here (incl. via failure links)
+        self._goto: List[dict] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        seen = set()
+        for term in terms:
+            key = self._norm(term.strip()) if term else ""
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            self._insert(key, len(self.terms))
+            self.terms.append(term.strip())
+            self._lens.append(len(key))
+        self._build()
+
+    @classmethod
+    def from_file(cls, path: str | Path, ignore_case: bool = False) -> "TermMatcher":
+        """Build a matcher from a one-term-per-line text file (missing file → empty matcher)"""
+        p = Path(path)
+        if not p.exists():
+            return cls([], ignore_case=ignore_case)
+        return cls(p.read_text(encoding="utf-8").splitlines(), ignore_case=ignore_case)
+
+    def _norm(self, text: str) -> str:
+        return text.casefold() if self.ignore_case else text
+
+    def _insert(self, key: str, term_idx: int):
+        node = 0
+        for ch in key:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        self._out[node] = self._out[node] + (term_idx,)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __bool__(self) -> bool:
+        return bool(self.terms)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, term) for every occurrence of every term, in order of end position"""
+        if not self.terms or not text:
+            return
+        goto, fail, out, terms, lens = self._goto, self._fail, self._out, self.terms, self._lens
+        node = 0
+        for pos, ch in enumerate(self._norm(text)):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for idx in out[node]:
+                yield pos + 1 - lens[idx], pos + 1, terms[idx]
+
+    def search(self, text: str) -> Optional[str]:
+        """Return the first term found in text (earliest end position), or None"""
+        for _, _, term in self.iter_matches(text):
+            return term
+        return None
+
+    def found(self, text: str) -> set:
+        """Return the set of distinct terms present in text"""
+        return {term for _, _, term in self.iter_matches(text)}
+
+    def filter(self, texts: Iterable[str]) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """Split texts into (clean, rejected) where rejected holds (text, matched_term) pairs"""
+        clean: List[str] = []
+        rejected: List[Tuple[str, str]] = []
+        for text in texts:
+            term = self.search(text)
+            if term is None:
+                clean.append(text)
+            else:
+                rejected.append((text, term))
+        return clean, rejected
+
+
+class SubstringIndex:
+    """Character-bigram postings over a fixed list of strings, for "which strings contain this term".
+
+    A lookup verifies only the strings in the rarest posting list of the term's bigrams, so its
+    cost tracks the number of candidates rather than the number of indexed strings.
+    """
+
+    def __init__(self, texts: Iterable[str], ignore_case: bool = True):
+        self.ignore_case = ignore_case
+        self._texts: List[str] = [self._norm(t) for t in texts]
+        postings: dict = defaultdict(lambda: array("I"))
+        for i, text in enumerate(self._texts):
+            for gram in {text[j:j + 2] for j in range(len(text) - 1)}:
+                postings[gram].append(i)
+        self._postings = dict(postings)
+
+    def _norm(self, text: str) -> str:
+        return text.casefold() if self.ignore_case else text
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def search(self, term: str) -> List[int]:
+        """Ascending indexes of the strings containing term"""
+        key = self._norm(term.strip())
+        if not key:
+            return []
+        texts = self._texts
+        if len(key) == 1:
+            return [i for i, text in enumerate(texts) if key in text]
+        grams = {key[j:j + 2] for j in range(len(key) - 1)}
+        rarest = min((self._postings.get(g, ()) for g in grams), key=len)
+        if len(key) == 2:
+            return list(rarest)
+        return [i for i in rarest if key in texts[i]]
+
+    def search_any(self, terms: Iterable[str]) -> List[int]:
+        """Ascending indexes of the strings containing at least one of terms"""
+        hits = set()
+        for term in terms:
+            hits.update(self.search(term))
+        return sorted(hits)
@@ -0,0 +1,191 @@
+"""
+Streaming output stage: each hook's record is computed once and fanned out to every format sink
+"""
+from __future__ import annotations
+
+import abc
+import csv
+import json
+import os
+import tempfile
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+from .managers.hashtag_relevance import get_relevance_engine
+
+
+class OutputSink(abc.ABC):
+    """Writes records to a temp file next to its target; close() finishes it and publish() renames it into place"""
+
+    suffix = ""
+
+    def __init__(self, out_dir: Path, date_str: str):
+        self.path = Path(out_dir) / f"{date_str}_hooks.{self.suffix}"
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        os.close(fd)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600 files
+        self.tmp_path = Path(tmp)
+        try:
+            self.open()
+        except BaseException:
+            self.tmp_path.unlink(missing_ok=True)
+            raise
+
+    def open(self):
+        self.f = self.tmp_path.open("w", newline="", encoding="utf-8")
+
+    @abc.abstractmethod
+    def write(self, record: Dict):
+        ...
+
+    def close(self):
+        self.f.close()
+
+    def publish(self):
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        try:
+            self.close()
+        finally:
+            self.tmp_path.unlink(missing_ok=True)
+
+
+class CsvSink(OutputSink):
+    suffix = "csv"
+
+    def open(self):
+        super().open()
+        self.w = csv.writer(self.f)
+        self.w.writerow(["hook", "hashtags_joined", "optimized_hashtags"])
+
+    def write(self, record: Dict):
+        self.w.writerow([record["hook"], record["hashtags_joined"], " ".join(record["optimized_hashtags"])])
+
+
+class MarkdownSink(OutputSink):
+    suffix = "md"
+
+    def open(self):
+        super().open()
+        self.f.write("| # | Hook | Optimized Hashtags (top 10) |\n|---|---|---|\n")
+
+    def write(self, record: Dict):
+        self.f.write(f"| {record['index']} | {record['hook']} | {' '.join(record['optimized_hashtags'][:10])} |\n")
+
+
+class JsonlSink(OutputSink):
+    suffix = "jsonl"
+
+    def write(self, record: Dict):
+        row = {"index": record["index"], "hook": record["hook"], "optimized_hashtags": record["optimized_hashtags"]}
+        self.f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+class ParquetSink(OutputSink):
+    """Columnar output (requires pyarrow); rows are flushed as one row group per batch"""
+
+    suffix = "parquet"
+    batch_size = 1024
+
+    def open(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self.schema = pa.schema([
+            ("index", pa.int32()),
+            ("hook", pa.string()),
+            ("optimized_hashtags", pa.list_(pa.string())),
+        ])
+        self.writer = pq.ParquetWriter(str(self.tmp_path), self.schema)
+        self.rows: List[Dict] = []
+
+    def write(self, record: Dict):
+        self.rows.append({k: record[k] for k in ("index", "hook", "optimized_hashtags")})
+        if len(self.rows) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self.rows:
+            self.writer.write_table(self._pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        if self.writer is not None:
+            self._flush()
+            self.writer.close()
+            self.writer = None
+
+
+SINKS = {"csv": CsvSink, "md": MarkdownSink, "jsonl": JsonlSink, "parquet": ParquetSink}
+DEFAULT_FORMATS = ("csv", "md")
+
+
+def _chunks(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_records(hooks: Iterable[str], hashtags: Sequence[str], batch_size: int = 256,
+                 hook_tags: Optional[Mapping[str, Sequence[str]]] = None) -> Iterator[Dict]:
+    """Compute each hook's output record once, ranking hashtags a batch of hooks at a time.
+
+    Hooks with precomputed tags in hook_tags (e.g. from combined AI generation) skip the ranking pass.
+    """
+    engine = get_relevance_engine(hashtags)
+    hashtags_joined = " ".join(hashtags)
+    hook_tags = hook_tags or {}
+    index = 0
+    for chunk in _chunks(hooks, batch_size):
+        ranked = iter(engine.rank([h for h in chunk if not hook_tags.get(h)]))
+        for hook in chunk:
+            tags = hook_tags.get(hook)
+            optimized = engine.with_core(tags) if tags else next(ranked)
+            index += 1
+            yield {"index": index, "hook": hook, "hashtags_joined": hashtags_joined,
+                   "optimized_hashtags": optimized}
+
+
+def write_outputs(hooks: Iterable[str], hashtags: Sequence[str], date_str: str, out_dir: str = "outputs",
+                  formats: Sequence[str] = DEFAULT_FORMATS, batch_size: int = 256,
+                  hook_tags: Optional[Mapping[str, Sequence[str]]] = None) -> List[Path]:
+    """Stream hooks (any iterable, e.g. a generator) into every requested format.
+
+    Every file is finished before any is renamed into place, so a failure while writing leaves all
+    existing outputs untouched. Each rename is atomic, but the set is not: if one fails, formats
+    renamed before it are new and the rest keep their previous files.
+    """
+    unknown = [f for f in formats if f not in SINKS]
+    if unknown:
+        raise ValueError(f"unknown output format(s) {unknown}; expected some of {sorted(SINKS)}")
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+    sinks: List[OutputSink] = []
+    try:
+        for fmt in formats:
+            try:
+                sinks.append(SINKS[fmt](Path(out_dir), date_str))
+            except ImportError as e:
+                print(f"⚠️  Skipping {fmt} output ({e})")
+        for record in iter_records(hooks, hashtags, batch_size, hook_tags):
+            for sink in sinks:
+                sink.write(record)
+        for sink in sinks:
+            sink.close()
+    except BaseException:
+        for sink in sinks:
+            sink.abort()
+        raise
+    for i, sink in enumerate(sinks):
+        try:
+            sink.publish()
+        except BaseException:
+            for rest in sinks[i:]:
+                rest.abort()
+            raise
+    return [sink.path for sink in sinks]
@@ -0,0 +1,126 @@
+"""
+Near-duplicate detection for hooks using character n-gram MinHash with LSH banding
+"""
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_NON_WORD_RE = re.compile(r"[\s\W_]+")
+
+DEFAULT_THRESHOLD = 0.75
+
+
+def _shingles(text: str, n: int) -> Set[str]:
+    """Character n-grams over the text with spacing and punctuation removed (Hangul syllables stay whole)"""
+    compact = _NON_WORD_RE.sub("", text.lower())
+    if len(compact) <= n:
+        return {compact} if compact else set()
+    return {compact[i:i + n] for i in range(len(compact) - n + 1)}
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+class HookSimilarityIndex:
+    """Answers "is this hook too similar to anything accepted so far" without scanning every accepted hook.
+
+    Each hook is reduced to a MinHash signature over character n-grams. Signatures are split into
+    bands and hashed into buckets, so a query only compares against hooks sharing at least one band
+    (LSH candidates). Candidates are then verified with the exact Jaccard similarity; a candidate that
+    fully contains (or is contained in) the hook counts as an exact duplicate.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, ngram: int = 2,
+                 num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._hooks: List[str] = []
+        self._shingle_sets: List[Set[str]] = []
+        self._exact: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._hooks)
+
+    def __contains__(self, hook: str) -> bool:
+        return hook in self._exact
+
+    def _signature(self, shingles: Set[str]) -> List[int]:
+        hashes = [_shingle_hash(s) for s in shingles] or [0]
+        return [min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in self._perms]
+
+    def _band_keys(self, signature: List[int]):
+        r = self.rows
+        for band in range(self.bands):
+            yield band, tuple(signature[band * r:(band + 1) * r])
+
+    def _query(self, hook: str, shingles: Set[str], signature: List[int]) -> Tuple[Optional[str], float]:
+        candidates: Set[int] = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+        best, best_sim = None, 0.0
+        for idx in candidates:
+            other = self._hooks[idx]
+            if other in hook or hook in other:
+                return other, 1.0
+            other_sh = self._shingle_sets[idx]
+            union = len(shingles | other_sh)
+            sim = len(shingles & other_sh) / union if union else 1.0
+            if sim > best_sim:
+                best, best_sim = other, sim
+        return best, best_sim
+
+    def _insert(self, hook: str, shingles: Set[str], signature: List[int]):
+        idx = len(self._hooks)
+        self._hooks.append(hook)
+        self._shingle_sets.append(shingles)
+        self._exact.add(hook)
+        for band, key in self._band_keys(signature):
+            self._buckets[band][key].append(idx)
+
+    def most_similar(self, hook: str) -> Tuple[Optional[str], float]:
+        """Return the most similar accepted hook among LSH candidates and its similarity"""
+        if hook in self._exact:
+            return hook, 1.0
+        shingles = _shingles(hook, self.ngram)
+        return self._query(hook, shingles, self._signature(shingles))
+
+    def is_duplicate(self, hook: str) -> bool:
+        """True if hook is at or above the similarity threshold to any accepted hook"""
+        _, sim = self.most_similar(hook)
+        return sim >= self.threshold
+
+    def add(self, hook: str):
+        """Record hook as accepted"""
+        if hook in self._exact:
+            return
+        shingles = _shingles(hook, self.ngram)
+        self._insert(hook, shingles, self._signature(shingles))
+
+    def add_if_new(self, hook: str) -> bool:
+        """Accept hook unless it is a near-duplicate; returns whether it was accepted"""
+        if hook in self._exact:
+            return False
+        shingles = _shingles(hook, self.ngram)
+        signature = self._signature(shingles)
+        _, sim = self._query(hook, shingles, signature)
+        if sim >= self.threshold:
+            return False
+        self._insert(hook, shingles, signature)
+        return True
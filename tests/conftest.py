@@ -0,0 +1,156 @@
+"""Shared test setup: import the package from src/, keep run history out of the working tree, stand-in servers"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+# Module-level stores read these at import time
+for var in ("BINGSOONI_NO_HISTORY", "BINGSOONI_NO_LLM_CACHE", "BINGSOONI_NO_CACHE"):
+    os.environ.setdefault(var, "1")
+
+# data/ paths (stopwords, trend terms, catalogs) are relative to the repo root
+os.chdir(ROOT)
+
+
+class NaverStandIn:
+    """Local stand-in for the Naver blog search API: newest-first pages over a mutable post list"""
+
+    def __init__(self):
+        self.posts = []           # newest first
+        self.fail_starts = set()  # start offsets answered with a 500
+        self.requests = []        # (query, start, display)
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                q = parse_qs(urlparse(self.path).query)
+                query, start, display = q["query"][0], int(q["start"][0]), int(q["display"][0])
+                with stand_in._lock:
+                    stand_in.requests.append((query, start, display))
+                    posts = [p for p in stand_in.posts if p.get("query", query) == query]
+                if start in stand_in.fail_starts:
+                    self.send_response(500)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = json.dumps({"total": len(posts), "start": start, "display": display,
+                                   "items": posts[start - 1:start - 1 + display]}, ensure_ascii=False).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/search/blog.json"
+
+    def add_posts(self, titles, query=None, day="20260101"):
+        """Prepend posts (the last title ends up newest), optionally only returned for one query"""
+        with self._lock:
+            for title in titles:
+                n = len(self.posts)
+                post = {"title": title, "description": "", "link": f"https://blog.example/{n}",
+                        "postdate": day}
+                if query is not None:
+                    post["query"] = query
+                self.posts.insert(0, post)
+
+
+class LLMStandIn:
+    """Local OpenAI-compatible chat completions server: numbered hooks or hashtags after a fixed delay"""
+
+    def __init__(self):
+        self.delay = 0.0
+        self.rate_limited = 0     # the next N requests get a 429 with retry-after
+        self.retry_after = "0"
+        self.fail_marker = None   # prompts containing this text get a 400
+        self.requests = []        # prompt texts, in arrival order
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][-1]["content"]
+                with stand_in._lock:
+                    stand_in.requests.append(prompt)
+                    limited = stand_in.rate_limited > 0
+                    stand_in.rate_limited -= limited
+                    stand_in.in_flight += 1
+                    stand_in.max_in_flight = max(stand_in.max_in_flight, stand_in.in_flight)
+                try:
+                    time.sleep(stand_in.delay)
+                finally:
+                    with stand_in._lock:
+                        stand_in.in_flight -= 1
+                if limited:
+                    return self._reply(429, {"error": {"message": "rate limited"}},
+                                       {"retry-after": stand_in.retry_after})
+                if stand_in.fail_marker and stand_in.fail_marker in prompt:
+                    return self._reply(400, {"error": {"message": "bad request"}})
+                n = len(stand_in.requests)
+                if "hashtags starting with #" in prompt:
+                    text = "\n".join(f"#태그{n}_{i}" for i in range(25))
+                else:
+                    text = "\n".join(f"스탠드인 훅 {n}번 {i}번째 이야기" for i in range(20))
+                self._reply(200, {"id": f"cmpl-{n}", "object": "chat.completion", "created": 0,
+                                  "model": body["model"],
+                                  "choices": [{"index": 0, "finish_reason": "stop",
+                                               "message": {"role": "assistant", "content": text}}]})
+
+            def _reply(self, status, payload, headers=None):
+                data = json.dumps(payload, ensure_ascii=False).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+
+def _serve(stand_in):
+    thread = threading.Thread(target=stand_in.server.serve_forever, daemon=True)
+    thread.start()
+    return stand_in
+
+
+@pytest.fixture
+def llm_server():
+    stand_in = _serve(LLMStandIn())
+    yield stand_in
+    stand_in.server.shutdown()
+    stand_in.server.server_close()
+
+
+@pytest.fixture
+def naver_server(monkeypatch):
+    stand_in = _serve(NaverStandIn())
+    monkeypatch.setenv("NAVER_CLIENT_ID", "test-id")
+    monkeypatch.setenv("NAVER_CLIENT_SECRET", "test-secret")
+    yield stand_in
+    stand_in.server.shutdown()
+    stand_in.server.server_close()
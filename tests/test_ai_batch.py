@@ -0,0 +1,71 @@
+import asyncio
+
+from bingsooni.generators.ai_batch import AsyncBatchGenerator, BatchJob, generate_batch
+from bingsooni.generators.ai_generator import AIGenerator
+
+
+def make_batch(server, **options):
+    options = {"rpm": 60_000, "tpm": 10_000_000, "use_cache": False, **options}
+    return AsyncBatchGenerator(AIGenerator(api_key="test"), base_url=server.url, **options)
+
+
+def jobs(n, marker="캠페인"):
+    return [BatchJob(["성수동", "빙수", f"{marker}{i}"]) for i in range(n)]
+
+
+def run(batch, batch_jobs):
+    return asyncio.run(batch.run(batch_jobs))
+
+
+def test_requests_in_flight_are_capped_by_the_concurrency(llm_server):
+    llm_server.delay = 0.05
+    batch = make_batch(llm_server, concurrency=3)
+    results = run(batch, jobs(12))
+    assert llm_server.max_in_flight == 3
+    assert len(llm_server.requests) == 24  # hooks + hashtags per job
+    assert all(not r.errors for r in results)
+    assert all(r.hooks[0].startswith("스탠드인 훅") and r.hashtags[0].startswith("#태그") for r in results)
+    assert [r.keywords[-1] for r in results] == [f"캠페인{i}" for i in range(12)]  # job order
+
+
+def test_rate_limited_calls_are_retried(llm_server):
+    llm_server.rate_limited, llm_server.retry_after = 3, "0.05"
+    batch = make_batch(llm_server, concurrency=2)
+    results = run(batch, jobs(4))
+    assert all(not r.errors for r in results)
+    assert batch.stats["retries"] == 3 and batch.stats["failed_calls"] == 0
+    assert len(llm_server.requests) == 8 + 3
+
+
+def test_rate_limit_that_never_clears_falls_back_locally(llm_server):
+    llm_server.rate_limited, llm_server.retry_after = 100, "0"
+    batch = make_batch(llm_server, concurrency=1, max_attempts=2)
+    (result,) = run(batch, jobs(1))
+    assert len(result.errors) == 2
+    assert result.hooks and not result.hooks[0].startswith("스탠드인")
+    assert result.hashtags and not result.hashtags[0].startswith("#태그")
+    assert batch.stats["failed_calls"] == 2
+
+
+def test_a_failing_campaign_does_not_affect_the_others(llm_server):
+    llm_server.fail_marker = "실패"
+    batch_jobs = jobs(3) + [BatchJob(["실패캠페인"])] + jobs(2, marker="다음")
+    results = run(make_batch(llm_server, concurrency=4), batch_jobs)
+    failed = results[3]
+    assert [e.split(":")[0] for e in failed.errors] == ["hooks", "hashtags"]
+    assert failed.hooks and failed.hashtags  # local generation filled in
+    assert all(not r.errors and r.hooks[0].startswith("스탠드인") for i, r in enumerate(results) if i != 3)
+
+
+def test_given_hooks_only_request_hashtags(llm_server):
+    results = generate_batch([(["빙수"], ["내 훅 그대로"])], AIGenerator(api_key="test"),
+                             base_url=llm_server.url, use_cache=False)
+    assert results[0].hooks == ["내 훅 그대로"]
+    assert len(llm_server.requests) == 1 and "hashtags starting with #" in llm_server.requests[0]
+
+
+def test_without_an_api_key_nothing_is_requested(llm_server, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    results = generate_batch(jobs(2), AIGenerator(), base_url=llm_server.url)
+    assert all(r.hooks and r.hashtags and not r.errors for r in results)
+    assert llm_server.requests == []
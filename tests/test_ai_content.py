@@ -0,0 +1,89 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from bingsooni.context import RunContext
+from bingsooni.generators.ai_generator import AIGenerator
+from bingsooni.hook_generator import generate_hooks
+from bingsooni.managers.hashtag_catalog import TIERS
+
+KEYWORDS = ["성수동 빙수", "연남동 카페"]
+
+
+class FakeCompletions:
+    """chat.completions stand-in answering every request with one fixed text"""
+
+    def __init__(self, text):
+        self.text = text
+        self.requests = []
+
+    def create(self, **request):
+        self.requests.append(request)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.text))])
+
+
+def make_generator(text):
+    gen = AIGenerator(api_key="test")
+    gen.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(text)))
+    return gen
+
+
+def test_valid_response_uses_the_json_schema():
+    text = json.dumps({
+        "hooks": [{"hook": "성수동 빙수 진짜 미쳤다", "hashtags": ["#성수빙수", "#빙수맛집"]}],
+        "tiers": {tier: [f"#{tier}태그"] for tier in TIERS},
+    }, ensure_ascii=False)
+    gen = make_generator(text)
+    content = gen.generate_ai_content(KEYWORDS, target_n=1, fallback=False)
+    assert content["hooks"] == ["성수동 빙수 진짜 미쳤다"]
+    assert content["hook_hashtags"] == {"성수동 빙수 진짜 미쳤다": ["#성수빙수", "#빙수맛집"]}
+    assert content["tiers"] == {tier: [f"#{tier}태그"] for tier in TIERS}
+    assert gen.client.chat.completions.requests[0]["response_format"]["type"] == "json_schema"
+
+
+@pytest.mark.parametrize("text", ["", "not json", "[1, 2]", '{"hooks": "nope", "tiers": []}'])
+def test_malformed_response_falls_back_to_local_content(text):
+    gen = make_generator(text)
+    assert gen.generate_ai_content(KEYWORDS, target_n=5, fallback=False) == \
+        {"hooks": [], "hook_hashtags": {}, "tiers": {}}
+    content = gen.generate_ai_content(KEYWORDS, target_n=5, tier_n=4)
+    assert len(content["hooks"]) == 5
+    assert set(content["tiers"]) == set(TIERS) and all(content["tiers"].values())
+
+
+def test_schema_violations_keep_only_the_valid_fields():
+    text = json.dumps({
+        "hooks": [
+            {"hook": "연남동 카페 이런 곳이 있다니", "hashtags": ["#연남카페", "no hash", 3, "#연남카페", "# 띄어 쓰기"]},
+            {"hook": 42, "hashtags": ["#숫자"]},
+            "just a string",
+            {"hook": "   "},
+            {"hook": "성수동 빙수 줄 서는 이유", "hashtags": "#not-a-list"},
+        ],
+        "tiers": {"broad": ["#맛집", "맛집"], "mid": "#카페", "local": [None]},
+    }, ensure_ascii=False)
+    content = make_generator(text).generate_ai_content(KEYWORDS, target_n=10, tags_per_hook=5,
+                                                       fallback=False)
+    assert content["hooks"] == ["연남동 카페 이런 곳이 있다니", "성수동 빙수 줄 서는 이유"]
+    # Hooks without valid tags are left for the output stage to rank against the catalog
+    assert content["hook_hashtags"] == {"연남동 카페 이런 곳이 있다니": ["#연남카페", "#띄어쓰기"]}
+    assert content["tiers"] == {"broad": ["#맛집"]}
+
+
+def test_short_combined_response_keeps_its_hooks_and_tops_up():
+    text = json.dumps({
+        "hooks": [{"hook": "성수동 빙수 진짜 미쳤다", "hashtags": ["#성수빙수"]},
+                  {"hook": "연남동 카페 이런 곳이 있다니", "hashtags": ["#연남카페"]}],
+        "tiers": {tier: [f"#{tier}태그"] for tier in TIERS},
+    }, ensure_ascii=False)
+    ctx = RunContext(keywords=KEYWORDS, externals=[], ai_combined=True, ai_stream=False)
+    ctx.ai_budget = None
+    ctx.ai = make_generator(text)
+    hooks = generate_hooks(KEYWORDS, target_n=10, use_ai=True, web_trends=[], ctx=ctx)
+    assert len(hooks) == 10
+    assert hooks[:2] == ["성수동 빙수 진짜 미쳤다", "연남동 카페 이런 곳이 있다니"]
+    # The kept hooks and the tiers come from the same response
+    assert ctx.ai_content["hooks"] == hooks[:2]
+    assert ctx.ai_content["hook_hashtags"]["성수동 빙수 진짜 미쳤다"] == ["#성수빙수"]
+    assert ctx.ai_content["tiers"]["broad"] == ["#broad태그"]
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+from bingsooni import hook_generator
+from bingsooni.context import RunContext
+from bingsooni.generators.ai_generator import AIGenerator
+
+KEYWORDS = ["성수동 빙수", "연남동 카페"]
+LINES = [f"성수동 빙수 {i}번째 숨은 이야기" for i in range(10)]
+
+
+def chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class FakeStream:
+    """Streamed completion: yields chunks, optionally raising after `fail_after` of them"""
+
+    def __init__(self, pieces, fail_after=None):
+        self.pieces = pieces
+        self.fail_after = fail_after
+        self.sent = 0
+        self.closed = False
+
+    def __iter__(self):
+        for piece in self.pieces:
+            if self.sent == self.fail_after:
+                raise ConnectionError("stream reset")
+            self.sent += 1
+            yield chunk(piece)
+
+    def close(self):
+        self.closed = True
+
+
+def make_generator(stream):
+    gen = AIGenerator(api_key="test")
+    gen.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        create=lambda **request: stream if request.get("stream") else None)))
+    return gen
+
+
+def one_line_per_chunk(lines):
+    return [line + "\n" for line in lines]
+
+
+def test_stream_is_closed_once_target_hooks_pass():
+    stream = FakeStream(one_line_per_chunk(LINES))
+    hooks = list(hook_generator.stream_ai_hooks(make_generator(stream), KEYWORDS, target_n=3))
+    assert hooks == LINES[:3]
+    assert stream.closed
+    assert stream.sent == 3  # nothing read past the third hook
+
+
+def test_lines_split_across_chunks_are_rebuilt():
+    text = "\n".join(LINES[:4])
+    pieces = [text[i:i + 7] for i in range(0, len(text), 7)]  # last line has no trailing newline
+    stream = FakeStream(pieces)
+    assert list(make_generator(stream).stream_ai_hooks(KEYWORDS, target_n=10)) == LINES[:4]
+    assert stream.closed
+
+
+def test_error_before_any_hook_falls_back_to_local_hooks():
+    stream = FakeStream(one_line_per_chunk(LINES), fail_after=0)
+    hooks = list(make_generator(stream).stream_ai_hooks(KEYWORDS, target_n=5))
+    assert len(hooks) == 5 and not set(hooks) & set(LINES)
+    assert stream.closed
+    assert list(make_generator(FakeStream([], fail_after=0)).stream_ai_hooks(KEYWORDS, fallback=False)) == []
+
+
+def test_mid_stream_error_keeps_streamed_hooks_and_tops_up_locally():
+    stream = FakeStream(one_line_per_chunk(LINES), fail_after=2)
+    ctx = RunContext(keywords=KEYWORDS, externals=[], ai_combined=False, ai_stream=True)
+    ctx.ai_budget = None
+    ctx.ai = make_generator(stream)
+    hooks = hook_generator.generate_hooks(KEYWORDS, target_n=8, use_ai=True, web_trends=[], ctx=ctx)
+    assert hooks[:2] == LINES[:2]
+    assert len(hooks) == 8 and not set(hooks[2:]) & set(LINES)
+    assert stream.closed
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import pytest
+
+from bingsooni.managers import catalog_refresh, state_store
+from bingsooni.managers.catalog_refresh import DAILY_UPDATE_KEY, RUNNING_KEY, refresh_catalog
+from bingsooni.managers.state_store import RotationStateStore
+
+DAY = 86400.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Shared controllable time.time() for the refresh schedule and the state store"""
+    now = SimpleNamespace(t=1_800_000_000.0)
+    fake = SimpleNamespace(time=lambda: now.t)
+    monkeypatch.setattr(catalog_refresh, "time", fake)
+    monkeypatch.setattr(state_store, "time", fake)
+    return now
+
+
+@pytest.fixture
+def updates(monkeypatch):
+    """Counts update runs; set .fail to make the next ones raise"""
+    runs = SimpleNamespace(count=0, fail=False)
+
+    def run_update(data_path):
+        runs.count += 1
+        if runs.fail:
+            raise RuntimeError("instagram down")
+        return True
+
+    monkeypatch.setattr(catalog_refresh, "_run_update", run_update)
+    return runs
+
+
+def test_daily_schedule_refreshes_every_run(tmp_path, clock, updates):
+    store = RotationStateStore(tmp_path / "rotation.sqlite3")
+    results = []
+    # A 09:00 cron that fires a few seconds early or late
+    for jitter in (0, -5, 3, -2, 0, -7):
+        clock.t += jitter
+        results.append(refresh_catalog(tmp_path / "hashtags.csv", store))
+        clock.t += DAY - jitter
+    assert results == [True] * 6
+    assert updates.count == 6
+
+
+def test_second_run_on_the_same_day_is_skipped(tmp_path, clock, updates):
+    store = RotationStateStore(tmp_path / "rotation.sqlite3")
+    assert refresh_catalog(tmp_path / "hashtags.csv", store)
+    clock.t += 6 * 3600
+    assert not refresh_catalog(tmp_path / "hashtags.csv", store)
+    assert refresh_catalog(tmp_path / "hashtags.csv", store, force=True)
+    assert updates.count == 2
+
+
+def test_failed_update_is_retried_on_the_next_run(tmp_path, clock, updates):
+    store = RotationStateStore(tmp_path / "rotation.sqlite3")
+    updates.fail = True
+    assert not refresh_catalog(tmp_path / "hashtags.csv", store)
+    assert store.get_meta(DAILY_UPDATE_KEY) is None
+    updates.fail = False
+    clock.t += 60
+    assert refresh_catalog(tmp_path / "hashtags.csv", store)
+    assert updates.count == 2
+
+
+def test_live_claim_blocks_and_abandoned_claim_expires(tmp_path, clock, updates):
+    store = RotationStateStore(tmp_path / "rotation.sqlite3")
+    # Another worker is mid-update
+    assert store.claim_meta(RUNNING_KEY, None, "other-worker")
+    assert not refresh_catalog(tmp_path / "hashtags.csv", store)
+    assert updates.count == 0
+    # ...and was killed without releasing its claim
+    clock.t += 2 * 3600
+    assert refresh_catalog(tmp_path / "hashtags.csv", store)
+    assert store.get_meta(RUNNING_KEY)[0] == catalog_refresh.RUNNING_IDLE
+
+
+def test_background_refresh_thread_keeps_the_process_alive(tmp_path, clock, updates):
+    store = RotationStateStore(tmp_path / "rotation.sqlite3")
+    thread = catalog_refresh.refresh_in_background(tmp_path / "hashtags.csv", store)
+    assert thread is not None and not thread.daemon
+    thread.join(5)
+    assert updates.count == 1
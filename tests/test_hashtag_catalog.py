@@ -0,0 +1,71 @@
+import pytest
+
+from bingsooni.managers import hashtag_catalog
+from bingsooni.managers.hashtag_catalog import HashtagCatalog, get_catalog, invalidate_catalog
+
+
+def write_catalog(path, rows, header="tag,tier,category,relevance_score"):
+    path.write_text(header + "\n" + "\n".join(rows) + "\n", encoding="utf-8")
+    return HashtagCatalog.read(path)
+
+
+def test_keyword_hits_by_tier_in_relevance_order(tmp_path):
+    catalog = write_catalog(tmp_path / "tags.csv", [
+        "#카페추천,broad,cafe,0.5",
+        "#성수카페,local,cafe,0.7",
+        "#성수동맛집,local,food,0.9",
+        "#빙수,mid,dessert,0.8",
+        "#SeongsuCafe,niche,cafe,0.6",
+    ])
+    hits = catalog.keyword_hits(["성수", "seongsu"])
+    assert hits == {"broad": [], "mid": [], "niche": ["#SeongsuCafe"], "local": ["#성수동맛집", "#성수카페"]}
+
+
+def test_keyword_hits_keep_file_order_without_metadata(tmp_path):
+    catalog = write_catalog(tmp_path / "tags.csv", ["#카페추천,broad", "#연남카페,local", "#카페투어,broad"],
+                            header="tag,tier")
+    assert catalog.keyword_hits(["카페"])["broad"] == ["#카페추천", "#카페투어"]
+    assert catalog.keyword_hits([])["local"] == []
+
+
+def test_invalid_rows_are_skipped(tmp_path):
+    catalog = write_catalog(tmp_path / "tags.csv", ["#ok,broad,,", "no-hash,broad,,", "#bad,huge,,",
+                                                    "#ok,mid,,", "#score,mid,x,abc"])
+    assert [e.tag for e in catalog.entries] == ["#ok", "#score"]
+    assert catalog.relevance("#score", 0.3) == 0.3
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(hashtag_catalog, "SNAPSHOT_DIR", tmp_path / "catalog_cache")
+    yield tmp_path / "catalog_cache"
+    invalidate_catalog()
+
+
+def test_snapshot_round_trip(tmp_path, snapshot_dir):
+    path = tmp_path / "tags.csv"
+    original = write_catalog(path, ["#성수카페,local,cafe,0.7", "#빙수,mid,,"])
+    get_catalog(path, snapshot=True)
+    (snapshot,) = snapshot_dir.iterdir()
+    assert snapshot.suffix == ".json"
+    invalidate_catalog()
+    loaded = hashtag_catalog._load_snapshot(path)
+    assert loaded is not None
+    assert loaded.entries == original.entries and loaded.version == original.version
+    assert loaded.keyword_hits(["성수"])["local"] == ["#성수카페"]
+
+
+def test_stale_or_corrupt_snapshot_is_rebuilt(tmp_path, snapshot_dir):
+    path = tmp_path / "tags.csv"
+    write_catalog(path, ["#성수카페,local,cafe,0.7"])
+    get_catalog(path, snapshot=True)
+    (snapshot,) = snapshot_dir.iterdir()
+
+    write_catalog(path, ["#성수카페,local,cafe,0.7", "#연남카페,local,cafe,0.6"])
+    assert hashtag_catalog._load_snapshot(path) is None  # the file changed since the snapshot
+
+    for garbage in ["not json", "[]", '{"entries": [["#a", "huge", null, null]]}', '{"entries": 3}']:
+        snapshot.write_text(garbage, encoding="utf-8")
+        invalidate_catalog()
+        assert len(get_catalog(path, snapshot=True)) == 2
+    assert len(hashtag_catalog._load_snapshot(path)) == 2  # rewritten from the csv
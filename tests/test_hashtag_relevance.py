@@ -0,0 +1,41 @@
+from bingsooni.managers.hashtag_relevance import HashtagRelevanceEngine, get_relevance_engine
+
+TAGS = ["#카페추천", "#foodie", "#성수카페", "#seongsu", "#연남동맛집", "#빙수맛집", "#서울여행",
+        "#hiddengem", "#budgeteats", "#디저트", "#travel", "#성수카페"]
+
+
+def test_core_tags_come_first_and_tags_are_unique():
+    engine = HashtagRelevanceEngine(TAGS)
+    [ranked] = engine.rank(["성수 카페 솔직 후기"], top_k=8)
+    assert ranked[:3] == ["#카페추천", "#travel", "#foodie"]
+    assert len(ranked) == len(set(ranked)) == 8
+
+
+def test_concept_matches_outrank_unrelated_tags():
+    engine = HashtagRelevanceEngine(TAGS, core_tags=())
+    seongsu, yeonnam, hidden = engine.rank(["성수 카페 가볼만한 곳", "연남 빙수 맛집", "숨은 가성비 맛집"], top_k=3)
+    assert seongsu[0] == "#성수카페"  # matches both the 성수 and the 카페 concept
+    assert "#seongsu" in seongsu
+    assert set(yeonnam[:2]) == {"#연남동맛집", "#빙수맛집"}
+    assert set(hidden[:2]) == {"#hiddengem", "#budgeteats"}
+
+
+def test_unmatched_hooks_fall_back_to_catalog_order():
+    engine = HashtagRelevanceEngine(TAGS, core_tags=())
+    assert engine.rank(["zzz"], top_k=3) == [["#카페추천", "#foodie", "#성수카페"]]
+
+
+def test_scores_are_shared_by_identical_feature_sets():
+    engine = HashtagRelevanceEngine(TAGS)
+    a, b = engine.score(["성수 카페", "성수 카페"])
+    assert a == b and a
+
+
+def test_with_core_prepends_core_tags():
+    engine = HashtagRelevanceEngine(TAGS)
+    assert engine.with_core(["#빙수맛집", "#foodie"], top_k=4) == ["#카페추천", "#travel", "#foodie", "#빙수맛집"]
+
+
+def test_engine_is_reused_per_catalog():
+    assert get_relevance_engine(TAGS) is get_relevance_engine(list(TAGS))
+    assert get_relevance_engine(TAGS) is not get_relevance_engine(TAGS[:-1])
@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from bingsooni.generators.hedge import OutcomeLog, _parse_budget, record_outcome, run_hedged
+
+LOCAL = ["local 1", "local 2", "local 3", "local 4"]
+
+
+@pytest.fixture
+def stall():
+    """Released at teardown so stalled producer threads can finish"""
+    release = threading.Event()
+    yield release
+    release.set()
+
+
+def test_fast_llm_fills_the_request():
+    items, outcome = run_hedged(lambda: ["llm 1", "llm 2", "llm 3"], lambda: LOCAL, 3, budget=5)
+    assert items == ["llm 1", "llm 2", "llm 3"]
+    assert outcome["source"] == "llm"
+    assert (outcome["llm_items"], outcome["local_items"]) == (3, 0)
+    assert outcome["llm_latency"] is not None and outcome["latency"] < 5
+
+
+def test_partial_stream_is_kept_and_local_items_fill_the_rest(stall):
+    def produce():
+        yield "llm 1"
+        yield "llm 2"
+        stall.wait(10)
+        yield "too late"
+
+    items, outcome = run_hedged(produce, lambda: LOCAL, 4, budget=0.2)
+    assert items == ["llm 1", "llm 2", "local 1", "local 2"]
+    assert outcome["source"] == "mixed"
+    assert (outcome["llm_items"], outcome["local_items"]) == (2, 2)
+    assert outcome["llm_latency"] is None  # still running at the deadline
+    assert outcome["latency"] < 2
+
+
+def test_stalled_or_failing_llm_falls_back_to_local(stall):
+    items, outcome = run_hedged(lambda: stall.wait(10) or [], lambda: LOCAL, 3, budget=0.1)
+    assert items == LOCAL[:3]
+    assert outcome["source"] == "local" and outcome["llm_latency"] is None
+
+    def broken():
+        raise RuntimeError("boom")
+
+    items, outcome = run_hedged(broken, lambda: LOCAL, 2, budget=5)
+    assert items == LOCAL[:2]
+    assert outcome["source"] == "local" and outcome["llm_latency"] is not None
+
+
+def test_accept_screens_both_sides_and_duplicates_are_merged_once():
+    seen = set()
+
+    def accept(item):
+        if item.startswith("bad") or item in seen:
+            return False
+        seen.add(item)
+        return True
+
+    items, outcome = run_hedged(lambda: ["llm 1", "bad 1", "local 1"], lambda: ["local 1", "bad 2", "local 2"],
+                                5, budget=5, accept=accept)
+    assert items == ["llm 1", "local 1", "local 2"]
+    assert (outcome["llm_items"], outcome["local_items"]) == (2, 1)
+
+
+def test_parse_budget():
+    assert _parse_budget("") is None
+    assert _parse_budget("2.5") == 2.5
+    assert _parse_budget("2s") is None
+
+
+def test_outcomes_are_summarized_per_stage_and_source(tmp_path):
+    log = OutcomeLog(tmp_path / "outcomes.sqlite3")
+    for source, latency in [("llm", 1.0), ("llm", 3.0), ("local", 2.0)]:
+        record_outcome({"stage": "hooks", "source": source, "latency": latency, "llm_latency": None,
+                        "llm_items": 0, "local_items": 0, "budget": 2.0}, log)
+    log.record({"stage": "hooks", "source": "llm", "latency": 9.0, "llm_latency": 9.0,
+                "llm_items": 1, "local_items": 0, "budget": 2.0}, ts=0)  # outside the window
+    assert log.summary(days=7) == [("hooks", "llm", 2, 2.0, 3.0), ("hooks", "local", 1, 2.0, 2.0)]
@@ -0,0 +1,51 @@
+import pytest
+
+from bingsooni.context import RunContext
+from bingsooni.hook_generator import generate_hooks
+from bingsooni.similarity import HookSimilarityIndex
+
+KEYWORDS = ["성수동 빙수", "연남동 카페", "망원 디저트"]
+
+
+class FakeAI:
+    """AIGenerator stand-in returning a fixed hook list"""
+
+    def __init__(self, hooks):
+        self.hooks = hooks
+
+    def generate_ai_hooks(self, keywords, target_n=20):
+        return list(self.hooks)
+
+
+def _ctx(ai):
+    ctx = RunContext(keywords=KEYWORDS, externals=[], ai_combined=False, ai_stream=False)
+    ctx.ai_budget = None
+    ctx.ai = ai
+    return ctx
+
+
+def _assert_distinct(hooks):
+    index = HookSimilarityIndex()
+    assert all(index.add_if_new(h) for h in hooks)
+
+
+@pytest.mark.parametrize("target_n", [10, 40])
+def test_short_ai_output_is_topped_up_to_target(target_n):
+    ai_hooks = ["성수동 빙수 진짜 미쳤다", "연남동 카페 이런 곳이 있다니", "망원 디저트 아직도 모름?"]
+    hooks = generate_hooks(KEYWORDS, target_n=target_n, use_ai=True, web_trends=[], ctx=_ctx(FakeAI(ai_hooks)))
+    assert len(hooks) == target_n
+    assert hooks[:3] == ai_hooks
+    _assert_distinct(hooks)
+
+
+def test_near_duplicate_ai_hooks_are_dropped_before_the_top_up():
+    ai_hooks = ["성수동 빙수 진짜 미쳤다"] * 8 + ["성수동 빙수 진짜 미쳤다!"]
+    hooks = generate_hooks(KEYWORDS, target_n=10, use_ai=True, web_trends=[], ctx=_ctx(FakeAI(ai_hooks)))
+    assert len(hooks) == 10 and hooks[0] == "성수동 빙수 진짜 미쳤다"
+    _assert_distinct(hooks)
+
+
+def test_without_an_ai_generator_local_hooks_fill_the_target():
+    hooks = generate_hooks(KEYWORDS, target_n=15, use_ai=True, web_trends=[], ctx=_ctx(None))
+    assert len(hooks) == 15
+    _assert_distinct(hooks)
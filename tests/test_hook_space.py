@@ -0,0 +1,80 @@
+import itertools
+import random
+
+import pytest
+
+from bingsooni.hook_space import HookSpace, HookTemplate
+from bingsooni.matching import TermMatcher
+
+
+def brute_force(templates, min_words, max_words, matcher=None):
+    """Every fill that a rejection sampler could accept, rendered the same way HookSpace renders it"""
+    out = []
+    for tpl in templates:
+        for values in itertools.product(*(tpl.slots[f] for f in tpl.fields)):
+            fill = dict(zip(tpl.fields, values))
+            for suffix in ("", tpl.fallback_suffix):
+                if suffix is None:
+                    continue
+                text = tpl.render(fill, suffix)
+                if min_words <= len(text.split()) <= max_words:
+                    if matcher is None or matcher.search(text) is None:
+                        out.append(text)
+                    break
+    return out
+
+
+SLOTS = {"kw": ["빙수", "성수 카페", "연남동 디저트 맛집"], "adj": ["미친", "찐", "광고 아닌"]}
+TEMPLATES = [
+    HookTemplate("{kw} {adj} 후기", SLOTS),
+    HookTemplate("요즘 {adj} {kw} 모음", SLOTS, fallback_suffix=" | 저장 필수"),
+    HookTemplate("{kw}에서 {kw} 먹기", SLOTS),
+]
+
+
+def test_size_matches_brute_force_and_items_are_unique():
+    space = HookSpace(TEMPLATES, 4, 7)
+    expected = brute_force(TEMPLATES, 4, 7)
+    items = [space[i] for i in range(len(space))]
+    assert len(space) == len(expected)
+    assert len(set(items)) == len(items)
+    assert sorted(items) == sorted(expected)
+
+
+def test_shuffled_iteration_yields_every_hook_once():
+    space = HookSpace(TEMPLATES, 4, 7)
+    drawn = list(space.iter_shuffled(random.Random(3)))
+    assert sorted(drawn) == sorted(space[i] for i in range(len(space)))
+    assert drawn != [space[i] for i in range(len(space))]
+    assert list(space.iter_shuffled(random.Random(3))) == drawn
+
+
+def test_stopword_options_and_templates_are_compiled_out():
+    matcher = TermMatcher(["광고"])
+    templates = TEMPLATES + [HookTemplate("광고 {kw} 후기", SLOTS)]
+    space = HookSpace(templates, 4, 7, matcher)
+    items = [space[i] for i in range(len(space))]
+    assert items and not any("광고" in h for h in items)
+    assert len(space) == len(brute_force(TEMPLATES, 4, 7, matcher))
+
+
+def test_word_count_range_and_fallback_suffix():
+    space = HookSpace(TEMPLATES, 5, 8)
+    items = {space[i] for i in range(len(space))}
+    assert all(5 <= len(h.split()) <= 8 for h in items)
+    assert "요즘 찐 빙수 모음 | 저장 필수" in items
+    assert "요즘 광고 아닌 빙수 모음" in items  # long enough without the suffix
+    assert items == set(brute_force(TEMPLATES, 5, 8))
+
+
+def test_empty_space_and_bounds():
+    space = HookSpace(TEMPLATES, 20, 30)
+    assert len(space) == 0
+    assert list(space.iter_shuffled()) == []
+    with pytest.raises(IndexError):
+        HookSpace(TEMPLATES, 4, 7)[10_000]
+
+
+def test_missing_slot_options():
+    with pytest.raises(KeyError):
+        HookTemplate("{kw} {nope}", SLOTS)
@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bingsooni.generators import llm_cache
+from bingsooni.generators.llm_cache import LLMResponseCache, request_key
+
+
+def _request(prompt):
+    return {"model": "gpt-test", "messages": [{"role": "user", "content": prompt}], "temperature": 0.9}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache module"""
+    now = SimpleNamespace(t=1_000_000.0)
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: now.t))
+    return now
+
+
+def test_request_key_ignores_dict_order_but_not_parameters():
+    a = {"model": "m", "temperature": 0.5, "messages": []}
+    b = {"messages": [], "temperature": 0.5, "model": "m"}
+    assert request_key(a) == request_key(b)
+    assert request_key(a) != request_key({**a, "temperature": 0.6})
+
+
+def test_samples_are_collected_then_rotated(tmp_path, clock):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", samples=3)
+    calls = iter(["one", "two", "three", "four"])
+    got = []
+    for _ in range(7):
+        clock.t += 1
+        got.append(cache.get_or_create(_request("hooks"), lambda: next(calls)))
+    # Three misses fill the samples, then lookups cycle through them without calling the model
+    assert got == ["one", "two", "three", "one", "two", "three", "one"]
+    assert cache.stats()["samples"] == 3
+
+
+def test_expired_samples_are_dropped(tmp_path, clock):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", ttl=60, samples=1)
+    cache.remember(_request("hooks"), "old")
+    clock.t += 30
+    assert cache.cached(_request("hooks")) == "old"
+    clock.t += 31
+    assert cache.cached(_request("hooks")) is None
+    assert cache.get_or_create(_request("hooks"), lambda: "fresh") == "fresh"
+    assert cache.cached(_request("hooks")) == "fresh"
+
+
+def test_least_recently_used_keys_are_evicted(tmp_path, clock):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", max_keys=2, samples=1)
+    for prompt in ("a", "b"):
+        clock.t += 1
+        cache.remember(_request(prompt), prompt)
+    clock.t += 1
+    assert cache.cached(_request("a")) == "a"  # "b" is now the least recently used key
+    clock.t += 1
+    cache.remember(_request("c"), "c")
+    assert cache.stats()["keys"] == 2
+    assert cache.cached(_request("b")) is None
+    assert cache.cached(_request("a")) == "a"
+    assert cache.cached(_request("c")) == "c"
+
+
+def test_disabled_cache_always_calls_the_model(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", samples=1, enabled=False)
+    calls = []
+    for _ in range(2):
+        cache.get_or_create(_request("hooks"), lambda: calls.append(1) or "text")
+    assert len(calls) == 2
+
+
+def test_async_producer_is_cached(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", samples=1)
+    calls = []
+
+    async def create():
+        calls.append(1)
+        return "async text"
+
+    async def twice():
+        return [await cache.get_or_create_async(_request("hooks"), create) for _ in range(2)]
+
+    assert asyncio.run(twice()) == ["async text", "async text"]
+    assert len(calls) == 1
+
+
+def test_default_cache_answers_the_second_identical_request(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3")
+    calls = []
+    got = [cache.get_or_create(_request("hooks"), lambda: calls.append(1) or f"text {len(calls)}")
+           for _ in range(3)]
+    assert got == ["text 1"] * 3 and len(calls) == 1
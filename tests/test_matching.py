@@ -0,0 +1,81 @@
+from bingsooni.matching import SubstringIndex, TermMatcher
+
+
+def test_finds_every_occurrence_with_positions():
+    matcher = TermMatcher(["he", "she", "his", "hers"])
+    assert list(matcher.iter_matches("ushers")) == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_overlapping_korean_terms():
+    matcher = TermMatcher(["기적", "일어난 기적", "맛집"])
+    assert matcher.found("카페에서 일어난 기적") == {"기적", "일어난 기적"}
+    assert matcher.search("성수 맛집 추천") == "맛집"
+    assert matcher.search("성수 카페 추천") is None
+
+
+def test_search_returns_earliest_ending_term():
+    matcher = TermMatcher(["bcd", "ab"])
+    assert matcher.search("abcd") == "ab"
+
+
+def test_ignore_case_keeps_original_spelling():
+    matcher = TermMatcher(["MZ", "Seoul"], ignore_case=True)
+    assert matcher.found("mz세대의 SEOUL 여행") == {"MZ", "Seoul"}
+    assert TermMatcher(["MZ"]).search("mz세대") is None
+
+
+def test_blank_and_duplicate_terms_are_dropped():
+    matcher = TermMatcher(["  맛집 ", "", "맛집", "   "])
+    assert matcher.terms == ["맛집"]
+    assert len(matcher) == 1 and matcher
+    assert not TermMatcher([])
+    assert list(TermMatcher([]).iter_matches("아무거나")) == []
+
+
+def test_filter_splits_clean_and_rejected():
+    matcher = TermMatcher(["광고", "협찬"])
+    clean, rejected = matcher.filter(["빙수 맛집", "협찬 받은 카페", "진짜 광고 아님"])
+    assert clean == ["빙수 맛집"]
+    assert rejected == [("협찬 받은 카페", "협찬"), ("진짜 광고 아님", "광고")]
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "stopwords.txt"
+    path.write_text("광고\n\n협찬\n", encoding="utf-8")
+    assert TermMatcher.from_file(path).terms == ["광고", "협찬"]
+    assert len(TermMatcher.from_file(tmp_path / "missing.txt")) == 0
+
+
+def test_agrees_with_naive_substring_search():
+    import random
+    rng = random.Random(7)
+    alphabet = "가나다ab"
+    terms = {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(40)}
+    matcher = TermMatcher(terms)
+    for _ in range(200):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        expected = sorted((i, i + len(t), t) for t in terms for i in range(len(text)) if text.startswith(t, i))
+        assert sorted(matcher.iter_matches(text)) == expected
+
+
+def test_substring_index_agrees_with_a_scan():
+    import random
+    rng = random.Random(3)
+    alphabet = "카페빙수Ab"
+    texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))) for _ in range(300)]
+    index = SubstringIndex(texts)
+    for _ in range(300):
+        term = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5)))
+        assert index.search(term) == [i for i, t in enumerate(texts) if term.casefold() in t.casefold()]
+
+
+def test_substring_index_cases():
+    index = SubstringIndex(["#SeoulCafe", "#성수카페", "#카페", "#빙수"])
+    assert index.search("seoul") == [0]
+    assert index.search("카페") == [1, 2]
+    assert index.search("페") == [1, 2]
+    assert index.search("  ") == []
+    assert index.search("없는말") == []
+    assert index.search_any(["빙수", "성수", "빙수"]) == [1, 3]
+    assert SubstringIndex(["#SeoulCafe"], ignore_case=False).search("seoul") == []
+    assert len(index) == 4
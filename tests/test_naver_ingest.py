@@ -0,0 +1,89 @@
+from bingsooni.fetchers.naver_ingest import NaverIngestor
+from bingsooni.fetchers.web_trends_scraper import TrendsScraper
+
+
+def make_ingestor(server, state_dir, max_pages=10):
+    scraper = TrendsScraper(search_terms=["카페추천"], display=10, rate_per_sec=1000, base_url=server.url)
+    return NaverIngestor(scraper, state_dir=state_dir, max_pages=max_pages)
+
+
+def test_first_run_starts_the_cursor_at_the_newest_post(naver_server, tmp_path):
+    naver_server.add_posts([f"성수 카페 {i}" for i in range(25)])
+    ingestor = make_ingestor(naver_server, tmp_path)
+    assert ingestor.run() == {"카페추천": 10}  # first run reads a single page
+    assert ingestor.cursors["카페추천"]["link"] == naver_server.posts[0]["link"]
+    assert ingestor.counts["성수맛집"] == 10
+
+
+def test_later_runs_fetch_only_new_posts(naver_server, tmp_path):
+    naver_server.add_posts([f"성수 카페 {i}" for i in range(25)])
+    make_ingestor(naver_server, tmp_path).run()
+    naver_server.add_posts([f"연남 빙수 {i}" for i in range(12)], day="20260102")
+    naver_server.requests.clear()
+
+    ingestor = make_ingestor(naver_server, tmp_path)
+    assert ingestor.run() == {"카페추천": 12}
+    assert [start for _, start, _ in naver_server.requests] == [1, 11]  # stops at the cursor's page
+    assert ingestor.counts["연남맛집"] == 12 and ingestor.counts["성수맛집"] == 10
+    assert make_ingestor(naver_server, tmp_path).run() == {"카페추천": 0}
+
+
+def test_backlog_beyond_the_page_budget_is_skipped(naver_server, tmp_path):
+    naver_server.add_posts(["성수 카페"] * 5)
+    make_ingestor(naver_server, tmp_path).run()
+    naver_server.add_posts([f"연남 빙수 {i}" for i in range(25)], day="20260102")
+
+    ingestor = make_ingestor(naver_server, tmp_path, max_pages=1)
+    assert ingestor.run() == {"카페추천": 10}
+    assert ingestor.cursors["카페추천"]["link"] == naver_server.posts[0]["link"]
+    assert make_ingestor(naver_server, tmp_path).run() == {"카페추천": 0}
+
+
+def test_cursor_moves_past_a_backlog_deeper_than_the_api_serves(naver_server, tmp_path):
+    naver_server.add_posts(["성수 카페"] * 5)
+    scraper = TrendsScraper(search_terms=["카페추천"], display=100, rate_per_sec=1000, base_url=naver_server.url)
+    NaverIngestor(scraper, state_dir=tmp_path).run()
+    naver_server.add_posts([f"연남 빙수 {i}" for i in range(1100)], day="20260102")
+    naver_server.requests.clear()
+
+    ingestor = NaverIngestor(scraper, state_dir=tmp_path)
+    assert ingestor.run() == {"카페추천": 1000}
+    assert [start for _, start, _ in naver_server.requests] == list(range(1, 1000, 100))
+    assert ingestor.cursors["카페추천"]["link"] == naver_server.posts[0]["link"]
+
+    naver_server.add_posts(["망원 디저트"], day="20260103")
+    naver_server.requests.clear()
+    assert NaverIngestor(scraper, state_dir=tmp_path).run() == {"카페추천": 1}
+    assert len(naver_server.requests) == 1
+
+
+def test_failed_page_keeps_the_cursor(naver_server, tmp_path):
+    naver_server.add_posts(["성수 카페"] * 5)
+    make_ingestor(naver_server, tmp_path).run()
+    cursor = dict(make_ingestor(naver_server, tmp_path).cursors["카페추천"])
+    naver_server.add_posts([f"연남 빙수 {i}" for i in range(15)], day="20260102")
+    naver_server.fail_starts.add(11)
+
+    ingestor = make_ingestor(naver_server, tmp_path)
+    assert ingestor.run() == {"카페추천": 10}
+    assert ingestor.cursors["카페추천"] == cursor
+
+    naver_server.fail_starts.clear()
+    assert make_ingestor(naver_server, tmp_path).run() == {"카페추천": 5}
+
+
+def test_state_survives_a_restart_and_reset(naver_server, tmp_path):
+    naver_server.add_posts([f"성수 카페 {i}" for i in range(8)])
+    first = make_ingestor(naver_server, tmp_path)
+    first.run()
+    again = make_ingestor(naver_server, tmp_path)
+    assert again.counts == first.counts and again.cursors == first.cursors
+    assert again.detector.windows_closed == 1
+    again.reset()
+    assert not make_ingestor(naver_server, tmp_path).counts
+
+
+def test_without_credentials_nothing_is_fetched(naver_server, tmp_path, monkeypatch):
+    monkeypatch.delenv("NAVER_CLIENT_SECRET")
+    assert make_ingestor(naver_server, tmp_path).run() is None
+    assert naver_server.requests == []
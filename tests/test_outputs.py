@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from bingsooni import outputs
+from bingsooni.outputs import JsonlSink, write_outputs
+
+HOOKS = [f"성수동 빙수 {i}번째 이야기" for i in range(300)]
+HASHTAGS = ["#빙수", "#성수동", "#카페추천", "#디저트", "#서울맛집"]
+
+
+class FailingSink(JsonlSink):
+    """jsonl sink that raises after writing a few records"""
+
+    suffix = "boom"
+    fail_after = 5
+
+    def write(self, record):
+        if record["index"] > self.fail_after:
+            raise RuntimeError("disk full")
+        super().write(record)
+
+
+def _files(out_dir):
+    return {p.name: p.read_bytes() for p in out_dir.iterdir()}
+
+
+def test_failing_sink_leaves_previous_outputs_untouched(tmp_path, monkeypatch):
+    monkeypatch.setitem(outputs.SINKS, "boom", FailingSink)
+    write_outputs(HOOKS[:3], HASHTAGS, "20260101", out_dir=str(tmp_path), formats=["csv", "md", "jsonl"])
+    before = _files(tmp_path)
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        write_outputs(HOOKS, HASHTAGS, "20260101", out_dir=str(tmp_path),
+                      formats=["csv", "md", "jsonl", "boom"], batch_size=4)
+    # No new or half-written files, and no temp files left behind
+    assert _files(tmp_path) == before
+
+
+def test_failed_rename_cleans_up_the_remaining_temp_files(tmp_path, monkeypatch):
+    real_publish = outputs.OutputSink.publish
+
+    def publish(sink):
+        if sink.suffix == "md":
+            raise OSError("read-only")
+        real_publish(sink)
+
+    monkeypatch.setattr(outputs.OutputSink, "publish", publish)
+    with pytest.raises(OSError):
+        write_outputs(HOOKS[:3], HASHTAGS, "20260101", out_dir=str(tmp_path), formats=["csv", "md", "jsonl"])
+    assert sorted(_files(tmp_path)) == ["20260101_hooks.csv"]
+
+
+def test_generator_input_writes_the_same_files_as_a_list(tmp_path):
+    formats = ["csv", "md", "jsonl"]
+    listed = write_outputs(HOOKS, HASHTAGS, "20260101", out_dir=str(tmp_path / "list"),
+                           formats=formats, batch_size=64)
+    streamed = write_outputs((h for h in HOOKS), HASHTAGS, "20260101", out_dir=str(tmp_path / "gen"),
+                             formats=formats, batch_size=64)
+    assert [p.name for p in listed] == [p.name for p in streamed]
+    for a, b in zip(listed, streamed):
+        assert a.read_bytes() == b.read_bytes()
+        assert os.stat(b).st_mode & 0o777 == 0o644
+    assert len((tmp_path / "gen" / "20260101_hooks.jsonl").read_text(encoding="utf-8").splitlines()) == 300
+
+
+def test_precomputed_hook_tags_skip_ranking(tmp_path):
+    (path,) = write_outputs(HOOKS[:2], HASHTAGS, "20260101", out_dir=str(tmp_path), formats=["jsonl"],
+                            hook_tags={HOOKS[0]: ["#성수빙수"]})
+    first = path.read_text(encoding="utf-8").splitlines()[0]
+    assert "#성수빙수" in first
+
+
+def test_unknown_format_is_rejected_before_writing(tmp_path):
+    with pytest.raises(ValueError, match="unknown output format"):
+        write_outputs(HOOKS, HASHTAGS, "20260101", out_dir=str(tmp_path), formats=["csv", "xlsx"])
+    assert not any(tmp_path.iterdir())
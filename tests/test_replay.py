@@ -0,0 +1,73 @@
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from bingsooni.fetchers import replay
+from bingsooni.fetchers.keyword_extraction import KeywordExtractor
+
+TITLES = ["성수 카페 탐방", "연남 빙수 맛집", "강남 디저트 추천", "홍대 카페 빙수", "오늘의 일기"]
+
+
+@pytest.fixture
+def dump(tmp_path):
+    rng = random.Random(11)
+    pages = [{"items": [{"title": rng.choice(TITLES), "description": rng.choice(TITLES)}
+                        for _ in range(rng.randint(1, 20))]} for _ in range(400)]
+    lines = [json.dumps(p, ensure_ascii=False) for p in pages]
+    lines.insert(100, "{not json")
+    lines.insert(200, json.dumps({"data": [{"caption": "성수 빙수 최고"}]}, ensure_ascii=False))
+    path = tmp_path / "naver.jsonl"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path, pages
+
+
+def live_scores(pages):
+    """What the live scrape would sum up for the same pages"""
+    extractor, scores = KeywordExtractor(), Counter()
+    for page in pages:
+        for keyword, score in extractor.score_items(page["items"]):
+            scores[keyword] += score
+    return scores
+
+
+def test_shards_are_newline_aligned_and_cover_the_file(dump, monkeypatch):
+    path, _ = dump
+    monkeypatch.setattr(replay, "MIN_SHARD_BYTES", 1024)
+    ranges = replay.shard_ranges(path, 8)
+    data = path.read_bytes()
+    assert len(ranges) == 8
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start and data[end - 1:end] == b"\n"
+
+
+def test_replay_matches_live_scoring(dump, monkeypatch):
+    path, pages = dump
+    monkeypatch.setattr(replay, "MIN_SHARD_BYTES", 1024)
+    scores, stats = replay.replay([path], workers=3)
+
+    expected = live_scores(pages)
+    expected.update(dict(KeywordExtractor().score_items([{"title": "", "description": "성수 빙수 최고"}])))
+    assert scores.keys() == expected.keys()
+    assert all(scores[k] == pytest.approx(expected[k]) for k in expected)
+    assert stats["lines"] == 402 and stats["bad_lines"] == 1
+    assert stats["posts"] == sum(len(p["items"]) for p in pages) + 1
+    assert stats["shards"] > 1
+
+
+def test_sharding_does_not_change_the_result(dump, monkeypatch):
+    path, _ = dump
+    single, _ = replay.score_range(str(path), 0, path.stat().st_size)
+    monkeypatch.setattr(replay, "MIN_SHARD_BYTES", 512)
+    sharded, _ = replay.replay([path, path], workers=4)
+    assert all(sharded[k] == pytest.approx(2 * v) for k, v in single.items())
+
+
+def test_empty_dump(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_bytes(b"")
+    assert replay.shard_ranges(path, 4) == []
+    scores, stats = replay.replay([path], workers=2)
+    assert not scores and stats["shards"] == 0
@@ -0,0 +1,49 @@
+from bingsooni.managers.rotation import TierRotation
+
+
+def test_every_tag_served_once_per_cycle():
+    rotation = TierRotation(["#a", "#b", "#c", "#d", "#e"])
+    served = rotation.take(2) + rotation.take(2) + rotation.take(1)
+    assert sorted(served) == ["#a", "#b", "#c", "#d", "#e"]
+    assert rotation.take(2) == ["#a", "#b"]
+
+
+def test_take_terminates_when_asking_for_more_than_the_tier_has():
+    rotation = TierRotation(["#a", "#b", "#a", "#c"])
+    assert len(rotation) == 3
+    assert rotation.take(10) == ["#a", "#b", "#c"]
+    assert rotation.take(10, exclude={"#a", "#b", "#c"}) == []
+    assert TierRotation().take(5) == []
+    assert TierRotation(["#a"]).take(0) == []
+
+
+def test_excluded_tags_are_skipped_without_losing_their_turn_order():
+    rotation = TierRotation(["#a", "#b", "#c", "#d"])
+    assert rotation.take(2, exclude={"#a"}) == ["#b", "#c"]
+    assert rotation.take(2) == ["#d", "#a"]
+
+
+def test_new_tags_are_served_after_every_waiting_tag():
+    rotation = TierRotation(["#a", "#b", "#c", "#d"])
+    rotation.take(2)
+    assert rotation.add(["#new", "#c"]) == 1
+    assert rotation.take(5) == ["#c", "#d", "#a", "#b", "#new"]
+    assert rotation.take(1) == ["#c"]
+
+
+def test_sync_drops_vanished_tags_and_keeps_the_position():
+    rotation = TierRotation(["#a", "#b", "#c", "#d"])
+    rotation.take(2)
+    rotation.sync(["#a", "#c", "#d", "#e"])
+    assert "#b" not in rotation
+    assert rotation.take(4) == ["#c", "#d", "#a", "#e"]
+    assert rotation.sync([]).take(3) == []
+
+
+def test_state_round_trip_and_legacy_cursor():
+    rotation = TierRotation(["#a", "#b", "#c"])
+    rotation.take(1)
+    restored = TierRotation.from_state(rotation.to_state(), ["#a", "#b", "#c"])
+    assert restored.take(2) == ["#b", "#c"]
+    legacy = TierRotation.from_state(2, ["#a", "#b", "#c"])
+    assert legacy.take(1) == ["#c"]
@@ -0,0 +1,61 @@
+import pytest
+
+from bingsooni.similarity import HookSimilarityIndex, _shingles
+
+
+def jaccard(a: str, b: str) -> float:
+    sa, sb = _shingles(a, 2), _shingles(b, 2)
+    return len(sa & sb) / len(sa | sb)
+
+
+def test_exact_and_spacing_duplicates_are_rejected():
+    index = HookSimilarityIndex(0.75)
+    assert index.add_if_new("성수 빙수 진짜 미쳤다")
+    assert not index.add_if_new("성수 빙수 진짜 미쳤다")
+    assert not index.add_if_new("성수빙수 진짜  미쳤다!")
+    assert len(index) == 1
+
+
+def test_threshold_boundary():
+    a, b = "연남동 카페 숨은 보석 발견", "연남동 카페 숨은 보물 발견"
+    sim = jaccard(a, b)
+    assert 0.5 < sim < 1.0
+    strict = HookSimilarityIndex(min(1.0, sim + 0.01))
+    strict.add(a)
+    assert not strict.is_duplicate(b)
+    loose = HookSimilarityIndex(sim - 0.01)
+    loose.add(a)
+    assert loose.is_duplicate(b)
+    assert loose.most_similar(b) == (a, pytest.approx(sim))
+
+
+def test_containment_counts_as_duplicate():
+    index = HookSimilarityIndex(0.99)
+    index.add("숨은 맛집 리스트 공개")
+    assert index.is_duplicate("서울 숨은 맛집 리스트 공개 완료")
+
+
+def test_unrelated_hooks_are_kept():
+    index = HookSimilarityIndex()
+    hooks = ["성수 빙수 진짜 미쳤다", "퇴근길 힐링 카페", "와인 한 잔에 인생샷", "빵지순례 필수 코스"]
+    assert all(index.add_if_new(h) for h in hooks)
+    assert len(index) == len(hooks)
+    assert "퇴근길 힐링 카페" in index
+
+
+def test_lsh_finds_near_duplicates_in_a_large_index():
+    index = HookSimilarityIndex(0.75)
+    for i in range(2000):
+        index.add(f"{i}번째 숨은 맛집 리스트 {i * 7919 % 1000}")
+    target = "1234번째 숨은 맛집 리스트 234"
+    index.add(target)
+    near = target + "!"
+    assert index.most_similar(near)[0] == target
+    assert not index.add_if_new(near)
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        HookSimilarityIndex(0)
+    with pytest.raises(ValueError):
+        HookSimilarityIndex(0.8, num_perm=64, bands=10)
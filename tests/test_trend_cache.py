@@ -0,0 +1,93 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from bingsooni.fetchers import trend_cache, trends_fetchers
+from bingsooni.fetchers.trend_cache import TrendCache
+
+PARAMS = {"keywords": ["빙수"]}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(t=1_800_000_000.0)
+    monkeypatch.setattr(trend_cache, "time", SimpleNamespace(time=lambda: now.t, monotonic=time.monotonic))
+    return now
+
+
+class CountingFetcher:
+    """Returns ("빙수", call number); optionally blocks until released"""
+
+    def __init__(self, block=False):
+        self.calls = 0
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self):
+        self.calls += 1
+        n = self.calls
+        self.release.wait(5)
+        return [["빙수", n]]
+
+
+def make_cache(tmp_path):
+    return TrendCache(tmp_path / "trend_cache", ttls={"pytrends": 60}, max_stale=3600)
+
+
+def test_missing_entry_is_fetched_then_served_fresh(tmp_path, clock):
+    cache, fetch = make_cache(tmp_path), CountingFetcher()
+    assert cache.get_or_fetch("pytrends", PARAMS, fetch) == [["빙수", 1]]
+    clock.t += 59
+    assert cache.get_or_fetch("pytrends", PARAMS, fetch) == [["빙수", 1]]
+    assert fetch.calls == 1
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.put("pytrends", PARAMS, [["빙수", 0]])
+    clock.t += 120
+    fetch = CountingFetcher(block=True)
+    # Both lookups return the stale value at once; only one refresh is started
+    assert cache.get_or_fetch("pytrends", PARAMS, fetch) == [["빙수", 0]]
+    assert cache.get_or_fetch("pytrends", PARAMS, fetch) == [["빙수", 0]]
+    fetch.release.set()
+    cache.wait_for_refreshes(5)
+    assert fetch.calls == 1
+    assert cache.peek("pytrends", PARAMS)[0] == [["빙수", 1]]
+
+
+def test_expired_entry_blocks_on_a_fresh_fetch(tmp_path, clock):
+    cache, fetch = make_cache(tmp_path), CountingFetcher()
+    cache.put("pytrends", PARAMS, [["빙수", 0]])
+    clock.t += 3600
+    assert cache.get_or_fetch("pytrends", PARAMS, fetch) == [["빙수", 1]]
+    assert fetch.calls == 1 and not cache._refreshing
+
+
+def test_unavailable_source_is_never_cached(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    assert cache.get_or_fetch("pytrends", PARAMS, lambda: None) is None
+    assert cache.peek("pytrends", PARAMS) is None
+    # An expired value beats nothing when the source is down
+    cache.put("pytrends", PARAMS, [["빙수", 0]])
+    clock.t += 7200
+    assert cache.get_or_fetch("pytrends", PARAMS, lambda: None) == [["빙수", 0]]
+
+
+def test_naver_fallback_is_not_cached(tmp_path, monkeypatch):
+    cache = TrendCache(tmp_path / "trend_cache")
+    monkeypatch.setattr(trends_fetchers, "TREND_CACHE", cache)
+    monkeypatch.setenv("NAVER_CLIENT_ID", "test-id")
+    monkeypatch.setenv("NAVER_CLIENT_SECRET", "test-secret")
+    monkeypatch.setattr(trends_fetchers, "_naver_ingestor",
+                        lambda: SimpleNamespace(rising_keywords=lambda: []))
+    assert trends_fetchers.fetch_naver_blog_keywords() == trends_fetchers._fallback_naver_keywords()
+    assert cache.peek("naver", trends_fetchers.NAVER_PARAMS) is None
+
+    monkeypatch.setattr(trends_fetchers, "_naver_ingestor",
+                        lambda: SimpleNamespace(rising_keywords=lambda: [("성수맛집", 0.8)]))
+    assert trends_fetchers.fetch_naver_blog_keywords() == [("성수맛집", 0.8)]
+    assert cache.peek("naver", trends_fetchers.NAVER_PARAMS)[0] == [["성수맛집", 0.8]]
@@ -0,0 +1,78 @@
+import random
+from collections import Counter
+
+import pytest
+
+from bingsooni.fetchers.trend_detector import CountMinSketch, SpaceSaving, TrendDetector, tokenize
+
+
+def zipf_stream(n, vocab, seed=5):
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(vocab)]
+    return rng.choices([f"term{i}" for i in range(vocab)], weights, k=n)
+
+
+def test_space_saving_keeps_every_heavy_hitter():
+    stream = zipf_stream(20_000, 2_000)
+    k = 50
+    sketch = SpaceSaving(k)
+    for term in stream:
+        sketch.add(term)
+    exact = Counter(stream)
+    assert len(sketch.counts) == k
+    for term, count in exact.items():
+        if count > len(stream) / k:
+            assert term in sketch.counts
+            assert sketch.counts[term] >= count  # counts only overestimate
+    assert [t for t, _ in sketch.top(3)] == [t for t, _ in exact.most_common(3)]
+
+
+def test_count_min_never_undercounts():
+    stream = zipf_stream(10_000, 3_000)
+    cms = CountMinSketch(width=256, depth=4)
+    for term in stream:
+        cms.add(term)
+    exact = Counter(stream)
+    assert all(cms.estimate(term) >= count for term, count in exact.items())
+    assert cms.estimate("never-seen") <= max(exact.values())
+
+
+def test_bursting_term_is_reported_after_the_first_window():
+    detector = TrendDetector(width=512, depth=4, k=64)
+    background = ["카페 디저트", "빙수 맛집", "서울 카페"] * 20
+    detector.observe(t for text in background for t in tokenize(text))
+    assert detector.close_window() == []  # the first window only seeds the baseline
+
+    detector.observe(t for text in background + ["말차 빙수"] * 15 for t in tokenize(text))
+    rising = dict(detector.close_window())
+    assert max(rising, key=rising.get) == "말차"
+    assert "카페" not in rising
+    assert detector.trending(1)[0][0] == "말차"
+
+
+def test_terms_below_min_support_are_ignored():
+    detector = TrendDetector(width=256, k=16, min_support=3)
+    detector.observe(["카페"] * 10)
+    detector.close_window()
+    detector.observe(["카페"] * 10 + ["말차"] * 2)
+    assert "말차" not in dict(detector.close_window())
+
+
+def test_state_round_trip():
+    detector = TrendDetector(width=128, depth=3, k=8)
+    for window in (["카페"] * 5, ["카페"] * 5 + ["말차"] * 9):
+        detector.observe(window)
+        detector.close_window()
+    detector.observe(["빙수"] * 4)
+    meta, tables = detector.state()
+    restored = TrendDetector.from_state(meta, tables)
+    assert restored.scores == detector.scores and restored.windows_closed == 2
+    assert restored.heavy.counts == {"빙수": 4}
+    assert restored.window.estimate("빙수") == 4
+    assert restored.baseline.table == detector.baseline.table
+
+
+def test_truncated_tables_are_rejected():
+    meta, tables = TrendDetector(width=64, depth=2).state()
+    with pytest.raises(ValueError):
+        TrendDetector.from_state(meta, tables[:-8])
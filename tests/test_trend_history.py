@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from bingsooni import context
+from bingsooni.context import RunContext
+from bingsooni.fetchers import trends_fetchers
+from bingsooni.fetchers.trend_store import DAY, TrendStore
+from bingsooni.fetchers.trends_fetchers import SourceStatus
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = TrendStore(tmp_path / "trends.sqlite3")
+    monkeypatch.setattr(trends_fetchers, "TREND_STORE", store)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def internal_csv(tmp_path):
+    path = tmp_path / "internal_keywords.csv"
+    path.write_text("keyword,score\n연남동 빙수,0.9\n", encoding="utf-8")
+    return str(path)
+
+
+def _live_fetch(store):
+    """Stand-in for the external fetch: records this run's snapshot like a cache miss does"""
+    def fetch():
+        store.record("pytrends", [("빙수", 0.6)])
+        return [("빙수", 0.6)], {"pytrends": SourceStatus("ok")}
+    return fetch
+
+
+def test_current_run_snapshot_is_not_counted_as_history(store, internal_csv, monkeypatch):
+    monkeypatch.setattr(context, "fetch_external_keywords_with_status", _live_fetch(store))
+    ctx = RunContext(internal_path=internal_csv)
+    assert ctx.keywords[:2] == ["연남동 빙수", "빙수"]
+    assert ctx.keyword_history == []
+
+
+def test_earlier_runs_still_count_as_history(store, internal_csv, monkeypatch):
+    store.record("pytrends", [("빙수", 0.6)], ts=time.time() - DAY)
+    monkeypatch.setattr(context, "fetch_external_keywords_with_status", _live_fetch(store))
+    ctx = RunContext(internal_path=internal_csv)
+    assert [k for k, _ in ctx.keyword_history] == ["빙수"]
+    assert ctx.keywords[0] == "빙수"  # 0.6 * 1.3 + 0.6 * 1.0 > 0.9 * 1.5
+
+
+def test_get_final_keywords_reads_history_from_before_the_fetch(store, internal_csv, monkeypatch):
+    monkeypatch.setattr(trends_fetchers, "fetch_external_keywords_with_status", _live_fetch(store))
+    keywords, status = trends_fetchers.get_final_keywords_with_status(internal_csv)
+    assert keywords[:2] == ["연남동 빙수", "빙수"] and status == {"pytrends": SourceStatus("ok")}
+
+
+def test_decayed_scores_before_cutoff(store):
+    now = time.time()
+    store.record("naver", [("성수맛집", 0.8)], ts=now - 2 * DAY)
+    store.record("naver", [("연남맛집", 0.9)], ts=now)
+    assert [k for k, _ in store.decayed_scores(now=now)] == ["연남맛집", "성수맛집"]
+    assert store.decayed_scores(now=now, before=now) == [("성수맛집", 0.8)]
@@ -0,0 +1,66 @@
+import threading
+import time
+
+from bingsooni.fetchers import trends_fetchers
+from bingsooni.fetchers.trends_fetchers import SourceStatus, fetch_sources_concurrently, merge_keywords
+
+
+def test_slow_source_times_out_and_fast_sources_still_merge(capsys):
+    release = threading.Event()
+
+    def slow():
+        trends_fetchers._warn("⚠️  slow source is retrying")
+        release.wait(5)
+        return [("늦은키워드", 0.9)]
+
+    def noisy():
+        trends_fetchers._warn("⚠️  pytrends not installed")
+        return [("빙수", 0.6)]
+
+    def broken():
+        raise RuntimeError("boom")
+
+    sources = {
+        "fast": (lambda: [("성수동", 0.8)], list),
+        "noisy": (noisy, list),
+        "slow": (slow, lambda: [("캐시키워드", 0.3)]),
+        "broken": (broken, lambda: [("대체키워드", 0.2)]),
+    }
+    started = time.monotonic()
+    try:
+        results, status = fetch_sources_concurrently(sources, deadlines={"slow": 0.2}, total_budget=2)
+    finally:
+        release.set()
+    assert time.monotonic() - started < 1.5
+
+    assert results == {"fast": [("성수동", 0.8)], "noisy": [("빙수", 0.6)],
+                       "slow": [("캐시키워드", 0.3)], "broken": [("대체키워드", 0.2)]}
+    assert status["fast"] == SourceStatus("ok")
+    assert status["noisy"] == SourceStatus("ok", ("⚠️  pytrends not installed",))
+    assert status["slow"].state == "timeout"
+    assert status["slow"].messages[0] == "⚠️  slow source is retrying"
+    assert "within 0.2s" in status["slow"].messages[-1]
+    assert status["broken"] == SourceStatus("error", ("⚠️  broken fetch failed: boom",))
+    # Worker messages are returned, not printed from the worker threads
+    assert capsys.readouterr().out == ""
+
+    merged = merge_keywords([], [kw for name in sources for kw in results[name]])
+    assert merged == ["성수동", "빙수", "캐시키워드", "대체키워드"]
+
+
+def test_total_budget_caps_every_source():
+    release = threading.Event()
+    sources = {name: (lambda: release.wait(5) or [], lambda: [("fallback", 0.1)]) for name in ("a", "b")}
+    started = time.monotonic()
+    try:
+        results, status = fetch_sources_concurrently(sources, deadlines={"a": 5, "b": 5}, total_budget=0.2)
+    finally:
+        release.set()
+    assert time.monotonic() - started < 1
+    assert {s.state for s in status.values()} == {"timeout"}
+    assert results["a"] == [("fallback", 0.1)]
+
+
+def test_warnings_outside_a_fetch_worker_are_printed(capsys):
+    trends_fetchers._warn("⚠️  direct call")
+    assert capsys.readouterr().out == "⚠️  direct call\n"
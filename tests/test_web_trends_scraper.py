@@ -0,0 +1,44 @@
+from bingsooni.fetchers.keyword_extraction import KeywordExtractor
+from bingsooni.fetchers.web_trends_scraper import TrendsScraper
+
+
+def make_scraper(server, **options):
+    options = {"search_terms": ["카페추천", "빙수추천"], "display": 10, "rate_per_sec": 1000, **options}
+    return TrendsScraper(base_url=server.url, **options)
+
+
+def test_fetches_only_pages_that_exist(naver_server):
+    naver_server.add_posts([f"성수 카페 {i}" for i in range(25)], query="카페추천")
+    naver_server.add_posts([f"연남 빙수 {i}" for i in range(5)], query="빙수추천")
+    scraper = make_scraper(naver_server, max_pages=5)
+    pages = scraper.fetch_naver_blog_posts(scraper.naver_headers())
+    assert [len(p) for p in pages["카페추천"]] == [10, 10, 5]
+    assert [len(p) for p in pages["빙수추천"]] == [5]
+    assert sorted(naver_server.requests) == sorted([("카페추천", 1, 10), ("카페추천", 11, 10), ("카페추천", 21, 10),
+                                                    ("빙수추천", 1, 10)])
+    assert pages["카페추천"][0][0]["title"] == "성수 카페 24"  # newest first
+
+
+def test_failed_page_keeps_the_other_pages(naver_server):
+    naver_server.add_posts([f"성수 카페 {i}" for i in range(30)])
+    naver_server.fail_starts.add(11)
+    scraper = make_scraper(naver_server, search_terms=["카페추천"], max_pages=3)
+    pages = scraper.fetch_naver_blog_posts(scraper.naver_headers())
+    assert [len(p) for p in pages["카페추천"]] == [10, 10]
+    assert pages["카페추천"][1][0]["title"] == "성수 카페 9"
+
+
+def test_live_scrape_scores_pages_by_position(naver_server):
+    naver_server.add_posts(["성수 카페 탐방", "연남 빙수 맛집"], query="카페추천")
+    scraper = make_scraper(naver_server, search_terms=["카페추천"])
+    pairs = scraper._scrape_naver_blog_live()
+    expected = KeywordExtractor().score_items(naver_server.posts)
+    assert pairs == expected and pairs
+
+
+def test_missing_credentials(naver_server, monkeypatch):
+    monkeypatch.delenv("NAVER_CLIENT_ID")
+    scraper = make_scraper(naver_server)
+    assert scraper.naver_headers() is None
+    assert scraper._scrape_naver_blog_live() is None
+    assert naver_server.requests == []